@@ -3,12 +3,19 @@ import hashlib
 import inspect
 import json
 import logging
+import os
+from dataclasses import asdict, dataclass, fields, is_dataclass
 from datetime import date, datetime, timezone
 from functools import wraps
 from typing import Any, Callable
 
 import strawberry
 from config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL_SECONDS,
+    AUDIT_QUEUE_MAXSIZE,
+    AUDIT_SPILL_MAX_BYTES,
+    AUDIT_SPILL_PATH,
     INFLUXDB_BUCKET,
     INFLUXDB_ORG,
     INFLUXDB_TOKEN,
@@ -21,6 +28,16 @@ from influxdb_client.client.write_api import SYNCHRONOUS
 logger = logging.getLogger(LOGGER)
 
 
+@dataclass
+class AuditRecord:
+    case_id: str
+    activity_name: str
+    user_id: str | None
+    context: dict[str, Any] | None
+    timestamp: datetime
+    payload: dict[str, Any] | None = None
+
+
 class AuditLogger:
     _client: InfluxDBClient | None = None
     _write_api = None
@@ -58,40 +75,62 @@ class AuditLogger:
         activity_name: str,
         user_id: str | None = None,
         context: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
     ) -> None:
-        client = cls._get_client()
-        if not client or not cls._write_api:
-            logger.debug(
-                f"Skipping InfluxDB log for activity {activity_name} (case_id: {case_id}) - client not available"
-            )
-            return
-
+        """Record an activity without blocking the caller.
+
+        Inside the event loop the record is handed to the audit pipeline,
+        which writes it in a background batch; outside of it the record is
+        written directly. ``payload`` holds raw mutation arguments and is
+        serialized into ``context["payload"]`` by the writer.
+        """
+        record = AuditRecord(
+            case_id=case_id,
+            activity_name=activity_name,
+            user_id=user_id,
+            context=context,
+            timestamp=datetime.now(timezone.utc),
+            payload=payload,
+        )
         try:
-            now = datetime.now(timezone.utc)
-            point = (
-                Point("activity")
-                .tag("case_id", case_id)
-                .tag("activity", activity_name)
-                .field("count", 1)
-                .time(now)
-            )
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                cls.write_lines([cls.to_line_protocol(record)])
+            except Exception as e:
+                logger.error(
+                    f"Failed to write to InfluxDB: activity={activity_name}, case_id={case_id}, error={e}"
+                )
+            return
+        audit_pipeline.submit(record)
 
-            if user_id:
-                point = point.tag("user_id", user_id)
-            if context:
-                point = point.field("context", json.dumps(context))
+    @classmethod
+    def to_line_protocol(cls, record: AuditRecord) -> str:
+        point = (
+            Point("activity")
+            .tag("case_id", record.case_id)
+            .tag("activity", record.activity_name)
+            .field("count", 1)
+            .time(record.timestamp)
+        )
+        if record.user_id:
+            point = point.tag("user_id", record.user_id)
+        context = record.context
+        if record.payload is not None:
+            context = {**(context or {}), "payload": _serialize_arguments(record.payload)}
+        if context:
+            point = point.field("context", json.dumps(context, default=str))
+        return point.to_line_protocol()
 
-            logger.info(
-                f"Writing to InfluxDB: activity={activity_name}, case_id={case_id}, user_id={user_id}, bucket={INFLUXDB_BUCKET}"
-            )
-            cls._write_api.write(bucket=INFLUXDB_BUCKET, record=point)
+    @classmethod
+    def write_lines(cls, lines: list[str]) -> None:
+        client = cls._get_client()
+        if not client or not cls._write_api:
             logger.debug(
-                f"Successfully wrote to InfluxDB: activity={activity_name}, case_id={case_id}"
-            )
-        except Exception as e:
-            logger.error(
-                f"Failed to write to InfluxDB: activity={activity_name}, case_id={case_id}, error={e}"
+                f"Skipping InfluxDB write of {len(lines)} audit records - client not available"
             )
+            return
+        cls._write_api.write(bucket=INFLUXDB_BUCKET, record=lines)
 
     @classmethod
     def calculate_checksum(cls, data: dict[str, Any] | Any) -> str:
@@ -102,227 +141,307 @@ class AuditLogger:
         return hashlib.sha256(sorted_data.encode()).hexdigest()
 
 
-_pending_audit_tasks: set[asyncio.Task] = set()
+@dataclass
+class AuditPipelineMetrics:
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    failed_batches: int = 0
+    max_queue_depth: int = 0
+
+
+class AuditPipeline:
+    """Bounded queue plus a background writer for audit records.
+
+    Records are flushed in batches once ``batch_size`` records are waiting or
+    ``flush_interval`` seconds have passed, with one InfluxDB call per batch
+    made off the event loop. When the queue is full new records are dropped
+    and counted; when InfluxDB is unreachable the batch is appended to a local
+    spill file that is replayed before the next successful write.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[list[str]], None],
+        serializer: Callable[[AuditRecord], str],
+        maxsize: int = AUDIT_QUEUE_MAXSIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        spill_path: str | None = AUDIT_SPILL_PATH,
+        spill_max_bytes: int = AUDIT_SPILL_MAX_BYTES,
+    ):
+        self._writer = writer
+        self._serializer = serializer
+        self._maxsize = maxsize
+        self._batch_size = max(batch_size, 1)
+        self._flush_interval = flush_interval
+        self._spill_path = spill_path
+        self._spill_max_bytes = spill_max_bytes
+        self.metrics = AuditPipelineMetrics()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[AuditRecord] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def metrics_snapshot(self) -> dict[str, int]:
+        return {**asdict(self.metrics), "queue_depth": self.queue_depth}
+
+    def _ensure_started(self) -> asyncio.Queue[AuditRecord]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._queue is None:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self._maxsize)
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    def submit(self, record: AuditRecord) -> bool:
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.metrics.dropped += 1
+            if self.metrics.dropped & (self.metrics.dropped - 1) == 0:
+                logger.warning(
+                    f"Audit queue full ({self._maxsize}), dropped {self.metrics.dropped} records so far"
+                )
+            return False
+        self.metrics.enqueued += 1
+        self.metrics.max_queue_depth = max(
+            self.metrics.max_queue_depth, queue.qsize()
+        )
+        return True
 
+    async def flush(self) -> None:
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
 
-def _schedule_audit_log(
-    case_id: str,
-    activity_name: str,
-    user_id: str | None,
-    context: dict[str, Any] | None,
-) -> None:
-    try:
+    async def stop(self) -> None:
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        queue = self._queue
         loop = asyncio.get_running_loop()
-    except RuntimeError:
-        AuditLogger.log_activity(case_id, activity_name, user_id, context)
-        return
-    task = loop.create_task(
-        asyncio.to_thread(
-            AuditLogger.log_activity,
-            case_id,
-            activity_name,
-            user_id,
-            context,
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"Audit batch of {len(batch)} records failed: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _write_batch(self, batch: list[AuditRecord]) -> None:
+        lines = [self._serializer(record) for record in batch]
+        try:
+            self._replay_spill()
+            self._writer(lines)
+        except Exception as e:
+            self.metrics.failed_batches += 1
+            logger.error(
+                f"Failed to write {len(lines)} audit records to InfluxDB, spilling to disk: {e}"
+            )
+            self._spill(lines)
+            return
+        self.metrics.written += len(lines)
+
+    def _spill(self, lines: list[str]) -> None:
+        if not self._spill_path:
+            self.metrics.dropped += len(lines)
+            return
+        try:
+            size = os.path.getsize(self._spill_path)
+        except OSError:
+            size = 0
+        if size >= self._spill_max_bytes:
+            self.metrics.dropped += len(lines)
+            logger.warning(
+                f"Audit spill file {self._spill_path} is full, dropped {len(lines)} records"
+            )
+            return
+        with open(self._spill_path, "a", encoding="utf-8") as spill:
+            spill.write("\n".join(lines) + "\n")
+        self.metrics.spilled += len(lines)
+
+    def _replay_spill(self) -> None:
+        if not self._spill_path or not os.path.exists(self._spill_path):
+            return
+        with open(self._spill_path, encoding="utf-8") as spill:
+            lines = [line for line in spill.read().splitlines() if line]
+        for start in range(0, len(lines), self._batch_size):
+            try:
+                self._writer(lines[start : start + self._batch_size])
+            except Exception:
+                with open(self._spill_path, "w", encoding="utf-8") as spill:
+                    spill.write("\n".join(lines[start:]) + "\n")
+                self.metrics.replayed += start
+                raise
+        os.remove(self._spill_path)
+        self.metrics.replayed += len(lines)
+        if lines:
+            logger.info(f"Replayed {len(lines)} spilled audit records")
+
+
+audit_pipeline = AuditPipeline(
+    writer=AuditLogger.write_lines,
+    serializer=AuditLogger.to_line_protocol,
+)
+
+
+_field_plans: dict[type, tuple[str, ...]] = {}
+
+
+def _serialize_arguments(arguments: dict[str, Any]) -> dict[str, Any]:
+    payload = {}
+    for key, value in arguments.items():
+        try:
+            payload[key] = serialize_payload(value)
+        except Exception:
+            payload[key] = str(value)
+    return payload
+
+
+def _field_plan(obj_type: type) -> tuple[str, ...]:
+    plan = _field_plans.get(obj_type)
+    if plan is None:
+        if is_dataclass(obj_type):
+            names = [field.name for field in fields(obj_type)]
+        else:
+            names = list(getattr(obj_type, "__annotations__", {}))
+        plan = tuple(name for name in names if not name.startswith("_"))
+        _field_plans[obj_type] = plan
+    return plan
+
+
+def serialize_payload(obj: Any) -> Any:
+    if obj is None or obj is strawberry.UNSET:
+        return None
+    if isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {k: serialize_payload(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [serialize_payload(item) for item in obj]
+    if hasattr(obj, "value"):
+        return obj.value
+    plan = _field_plan(type(obj))
+    if plan:
+        result = {}
+        for name in plan:
+            value = getattr(obj, name, None)
+            if value is strawberry.UNSET or value is None:
+                continue
+            try:
+                serialized = serialize_payload(value)
+            except Exception:
+                serialized = str(value)
+            if serialized is not None:
+                result[name] = serialized
+        return result
+    if hasattr(obj, "__dict__"):
+        return serialize_payload(
+            {k: v for k, v in vars(obj).items() if not k.startswith("_")}
         )
-    )
-    _pending_audit_tasks.add(task)
-    task.add_done_callback(_pending_audit_tasks.discard)
+    try:
+        return str(obj)
+    except Exception:
+        return repr(obj)
 
 
 def audit_log(activity_name: str | None = None):
+    """Record the decorated mutation in the audit log.
+
+    Argument positions are resolved once at decoration time; the call only
+    captures the raw arguments, which are serialized by the audit pipeline's
+    background writer.
+    """
+
     def decorator(func: Callable) -> Callable:
-        sig = inspect.signature(func)
-        param_names = list(sig.parameters.keys())
-        info_param_index = None
-        if "info" in param_names:
-            info_param_index = param_names.index("info")
+        param_names = list(inspect.signature(func).parameters)
+        info_index = param_names.index("info") if "info" in param_names else None
+        id_index = param_names.index("id") if "id" in param_names else None
+        payload_params = [
+            (index, name)
+            for index, name in enumerate(param_names)
+            if name not in ("self", "info")
+        ]
+        activity = activity_name or func.__name__
 
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            logger.debug(
-                f"Audit decorator called for function: {func.__name__}, args count: {len(args)}, kwargs: {list(kwargs.keys())}, param_names: {param_names}"
-            )
-
-            info = None
-
-            if "info" in kwargs:
-                info = kwargs["info"]
-                logger.debug(
-                    f"Found Info object in kwargs for {func.__name__}"
-                )
-            elif info_param_index is not None and len(args) > info_param_index:
-                info = args[info_param_index]
-                logger.debug(
-                    f"Found Info object in args[{info_param_index}] for {func.__name__}"
-                )
-            else:
-                for i, arg in enumerate(args):
-                    if arg is None:
-                        continue
-                    try:
-                        if hasattr(arg, "context"):
-                            info = arg
-                            logger.debug(
-                                f"Found Info object in args[{i}] for {func.__name__} by context attribute"
-                            )
-                            break
-                        elif hasattr(arg, "__class__"):
-                            type_name = type(arg).__name__
-                            if "Info" in type_name:
-                                info = arg
-                                logger.debug(
-                                    f"Found Info object in args[{i}] for {func.__name__} by type name: {type_name}"
-                                )
-                                break
-                    except Exception as e:
-                        logger.debug(f"Error checking arg[{i}]: {e}")
-                        continue
-
-            if not info:
+            info = kwargs.get("info")
+            if info is None and info_index is not None and len(args) > info_index:
+                info = args[info_index]
+            context = getattr(info, "context", None)
+            if context is None:
                 logger.warning(
-                    f"Audit decorator: No Info object found for {func.__name__}, skipping audit log. Args: {[type(a).__name__ if a is not None else 'None' for a in args]}, Kwargs keys: {list(kwargs.keys())}, info_param_index: {info_param_index}"
+                    "Audit decorator: no Info context for %s, skipping audit log",
+                    func.__name__,
                 )
                 return await func(*args, **kwargs)
 
-            if not hasattr(info, "context"):
-                logger.warning(
-                    f"Audit decorator: Info object found but no context attribute for {func.__name__}, skipping audit log"
-                )
-                return await func(*args, **kwargs)
-
-            context = info.context
             user = context.user
             user_id = user.id if user else None
 
-            case_id = None
-            entity_id = None
-
-            if "id" in kwargs:
-                entity_id = str(kwargs["id"])
-                logger.debug(
-                    f"Found id in kwargs: {entity_id} for {func.__name__}"
-                )
-            elif len(args) > 1:
-                logger.debug(
-                    f"Checking args[1] for {func.__name__}: {type(args[1])}, value: {args[1]}"
-                )
-                if isinstance(args[1], str):
-                    entity_id = args[1]
-                elif hasattr(args[1], "__str__"):
-                    entity_id = str(args[1])
-
-            if entity_id:
-                case_id = entity_id
-                logger.debug(
-                    f"Set case_id from entity_id: {case_id} for {func.__name__}"
-                )
-
-            activity = activity_name or func.__name__
-
-            def serialize_payload(obj: Any) -> Any:
-                if obj is None or obj is strawberry.UNSET:
-                    return None
-                elif isinstance(obj, (str, int, float, bool)):
-                    return obj
-                elif isinstance(obj, (date, datetime)):
-                    return obj.isoformat()
-                elif isinstance(obj, dict):
-                    return {k: serialize_payload(v) for k, v in obj.items()}
-                elif isinstance(obj, (list, tuple)):
-                    return [serialize_payload(item) for item in obj]
-                elif hasattr(obj, "value"):
-                    return obj.value
-                elif hasattr(obj, "__dict__"):
-                    result = {}
-                    for k, v in obj.__dict__.items():
-                        if not k.startswith("_") and v is not strawberry.UNSET:
-                            try:
-                                serialized = serialize_payload(v)
-                                if serialized is not None:
-                                    result[k] = serialized
-                            except Exception as e:
-                                logger.debug(
-                                    f"Error serializing field {k}: {e}"
-                                )
-                                result[k] = str(v)
-                    return result
-                elif hasattr(obj, "__annotations__"):
-                    result = {}
-                    annotations = obj.__annotations__
-                    for attr_name in annotations.keys():
-                        if not attr_name.startswith("_"):
-                            try:
-                                attr_value = getattr(obj, attr_name, None)
-                                if (
-                                    attr_value is not strawberry.UNSET
-                                    and attr_value is not None
-                                ):
-                                    serialized = serialize_payload(attr_value)
-                                    if serialized is not None:
-                                        result[attr_name] = serialized
-                            except Exception as e:
-                                logger.debug(
-                                    f"Error serializing annotation {attr_name}: {e}"
-                                )
-                                try:
-                                    attr_value = getattr(obj, attr_name, None)
-                                    if (
-                                        attr_value is not strawberry.UNSET
-                                        and attr_value is not None
-                                    ):
-                                        result[attr_name] = str(attr_value)
-                                except Exception:
-                                    pass
-                    return result
-                else:
-                    try:
-                        return str(obj)
-                    except Exception:
-                        return repr(obj)
-
-            audit_context = {}
             payload = {}
+            for index, name in payload_params:
+                if name in kwargs:
+                    payload[name] = kwargs[name]
+                elif index < len(args):
+                    payload[name] = args[index]
 
-            for key, value in kwargs.items():
-                if key != "info":
-                    try:
-                        payload[key] = serialize_payload(value)
-                    except Exception as e:
-                        logger.debug(f"Error serializing {key}: {e}")
-                        payload[key] = str(value)
-
-            audit_context["payload"] = payload
-
-            payload_json = json.dumps(payload, default=str)
-            logger.debug(
-                f"Calling function {func.__name__} with activity={activity}, case_id={case_id}, payload keys: {list(payload.keys())}, payload size: {len(payload_json)} bytes"
-            )
             result = await func(*args, **kwargs)
 
             if hasattr(result, "id"):
                 case_id = str(result.id)
-                logger.debug(
-                    f"Set case_id from result.id: {case_id} for {func.__name__}"
-                )
             elif isinstance(result, dict) and "id" in result:
                 case_id = str(result["id"])
-                logger.debug(
-                    f"Set case_id from result dict: {case_id} for {func.__name__}"
-                )
+            elif "id" in kwargs:
+                case_id = str(kwargs["id"])
+            elif id_index is not None and len(args) > id_index:
+                case_id = str(args[id_index])
+            else:
+                case_id = None
 
             if case_id:
-                logger.info(
-                    f"Audit decorator: Logging activity {activity} for case_id {case_id} (user: {user_id}), payload included: {len(payload) > 0}"
-                )
-                _schedule_audit_log(
+                AuditLogger.log_activity(
                     case_id=case_id,
                     activity_name=activity,
                     user_id=user_id,
-                    context=audit_context,
+                    payload=payload,
                 )
             else:
                 logger.warning(
-                    f"Audit decorator: No case_id found for {func.__name__}, skipping audit log. Result type: {type(result)}, has id attr: {hasattr(result, 'id') if result else 'N/A'}"
+                    "Audit decorator: no case_id found for %s, skipping audit log",
+                    func.__name__,
                 )
 
             return result
@@ -1,34 +1,81 @@
 import asyncio
+import hashlib
+import json
 import logging
-from datetime import datetime, timezone
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import wraps
 from typing import Any
 
 import strawberry
+from api.loaders import DataLoaders
 from auth import get_token_from_connection_params, get_user_payload, verify_token
+from config import (
+    READ_SESSION_POOL_SIZE,
+    USER_CONTEXT_CACHE_TTL_SECONDS,
+    USER_LAST_ONLINE_INTERVAL_SECONDS,
+)
 from database.models.location import LocationNode, location_organizations
 from database.models.user import User, user_root_locations
-from database.session import get_db_session
+from database.session import engine, get_db_session, read_engine, read_session
 from fastapi import Depends
 from graphql import GraphQLError
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from starlette.requests import HTTPConnection
 from strawberry.fastapi import BaseContext
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _ReadSession:
+    owner: "LockedAsyncSession"
+    session: AsyncSession
+    lock: asyncio.Lock
+    shared: bool = False
+    closed: bool = False
+
+
+_active_read_session: ContextVar[_ReadSession | None] = ContextVar(
+    "active_read_session", default=None
+)
+
+
 class LockedAsyncSession:
     def __init__(self, session: AsyncSession, lock: asyncio.Lock):
         self._session = session
         self._lock = lock
 
+    def _routed_read_session(self) -> _ReadSession | None:
+        read = _active_read_session.get()
+        if read is not None and read.owner is self and not read.closed:
+            return read
+        return None
+
     async def execute(self, *args, **kwargs):
+        read = self._routed_read_session()
+        if read is not None:
+            async with read.lock:
+                return await read.session.execute(*args, **kwargs)
         async with self._lock:
             return await self._session.execute(*args, **kwargs)
 
+    async def stream_scalars(self, *args, **kwargs):
+        read = self._routed_read_session()
+        if read is not None:
+            async with read.lock:
+                return await read.session.stream_scalars(*args, **kwargs)
+        async with self._lock:
+            return await self._session.stream_scalars(*args, **kwargs)
+
     async def commit(self, *args, **kwargs):
         async with self._lock:
             return await self._session.commit(*args, **kwargs)
@@ -53,7 +100,14 @@ class LockedAsyncSession:
 
 
 class Context(BaseContext):
-    def __init__(self, db: AsyncSession, user: "User | None" = None, organizations: str | None = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        user: "User | None" = None,
+        organizations: str | None = None,
+        read_session_factory: async_sessionmaker[AsyncSession] | None = None,
+        read_replica: bool = False,
+    ):
         super().__init__()
         self._db = db
         self.user = user
@@ -62,6 +116,87 @@ class Context(BaseContext):
         self._accessible_location_ids_lock = asyncio.Lock()
         self._db_lock = asyncio.Lock()
         self.db = LockedAsyncSession(db, self._db_lock)
+        self.loaders = DataLoaders(self.db)
+        self._read_session_factory = read_session_factory
+        self._read_replica = read_replica
+        self._read_slots = asyncio.Semaphore(max(READ_SESSION_POOL_SIZE, 1))
+
+    @asynccontextmanager
+    async def read_session(
+        self, *, shared: bool = False
+    ) -> AsyncIterator[AsyncSession | LockedAsyncSession]:
+        """Route ``self.db`` reads made inside the block to a session of their
+        own from ``read_session_factory``, so sibling read-only fields do not
+        queue on the request session's lock.
+
+        ``shared`` sessions span a whole query operation and are only opened
+        when ``read_session_factory`` points at a read replica; against the
+        primary they would just hold a second connection. Every read session
+        of a request counts against ``READ_SESSION_POOL_SIZE``. Below a shared
+        session a resolver only gets a session of its own while a slot is
+        free; otherwise it reads from the shared one. Reads stay on the
+        request session when it has pending changes, since those would not be
+        visible elsewhere. Yields the session the block reads from.
+        """
+        current = _active_read_session.get()
+        if current is not None and current.owner is not self.db:
+            current = None
+        fallback = current.session if current is not None else self.db
+        if (
+            self._read_session_factory is None
+            or self._db.new
+            or self._db.dirty
+            or self._db.deleted
+            or (shared and (current is not None or not self._read_replica))
+            or (not shared and READ_SESSION_POOL_SIZE <= 0)
+            or (current is not None and not current.shared)
+            or (current is not None and self._read_slots.locked())
+        ):
+            yield fallback
+            return
+        async with self._read_slots:
+            await self._release_request_connection()
+            async with (
+                self._read_session_factory() as session,
+                self._routed(session, shared=shared),
+            ):
+                yield session
+
+    async def _release_request_connection(self) -> None:
+        # Reads are about to move to a read session; ending the request
+        # session's read-only transaction returns its connection to the pool
+        # instead of holding it idle for the rest of the operation. Skipped
+        # while another resolver is using the request session.
+        if self._db.in_transaction() and not self._db_lock.locked():
+            await self.db.commit()
+
+    @asynccontextmanager
+    async def _routed(self, session: AsyncSession, *, shared: bool) -> AsyncIterator[None]:
+        read = _ReadSession(self.db, session, asyncio.Lock(), shared=shared)
+        token = _active_read_session.set(read)
+        try:
+            yield
+        finally:
+            read.closed = True
+            _active_read_session.reset(token)
+
+
+def read_only_resolver(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Run a root query resolver on its own read session (see
+    ``Context.read_session``). Only for resolvers that never write."""
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        info = kwargs.get("info")
+        if info is None:
+            info = next((arg for arg in args if hasattr(arg, "context")), None)
+        read_session = getattr(getattr(info, "context", None), "read_session", None)
+        if read_session is None:
+            return await func(*args, **kwargs)
+        async with read_session():
+            return await func(*args, **kwargs)
+
+    return wrapper
 
 
 Info = strawberry.Info[Context, Any]
@@ -77,6 +212,94 @@ def _organizations_from_payload(user_payload: dict) -> str | None:
     return str(organizations_raw)
 
 
+@dataclass
+class _ResolvedUser:
+    claims_hash: str
+    synced_at: float
+    last_online_at: float
+
+
+class ResolvedUserCache:
+    """Remembers which users were recently synced from their token claims.
+
+    While an entry is fresh and the claims hash matches, profile and
+    organization sync are skipped and ``last_online`` is only written once per
+    ``last_online_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = USER_CONTEXT_CACHE_TTL_SECONDS,
+        last_online_interval: float = USER_LAST_ONLINE_INTERVAL_SECONDS,
+        max_entries: int = 10000,
+    ):
+        self.ttl = ttl
+        self.last_online_interval = last_online_interval
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _ResolvedUser] = OrderedDict()
+
+    def is_synced(self, user_id: str, claims_hash: str) -> bool:
+        entry = self._entries.get(user_id)
+        if entry is None or entry.claims_hash != claims_hash:
+            return False
+        if time.monotonic() - entry.synced_at >= self.ttl:
+            return False
+        self._entries.move_to_end(user_id)
+        return True
+
+    def last_online_due(self, user_id: str) -> bool:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return True
+        return time.monotonic() - entry.last_online_at >= self.last_online_interval
+
+    def mark_synced(self, user_id: str, claims_hash: str) -> None:
+        now = time.monotonic()
+        self._entries[user_id] = _ResolvedUser(claims_hash, now, now)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def mark_online(self, user_id: str) -> None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            entry.last_online_at = time.monotonic()
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+resolved_user_cache = ResolvedUserCache()
+
+
+def _claims_hash(*claims: str | None) -> str:
+    return hashlib.sha256(
+        json.dumps(claims, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+async def _load_synced_user(
+    session: AsyncSession | LockedAsyncSession,
+    user_id: str,
+) -> "User | None":
+    result = await session.execute(select(User).where(User.id == user_id))
+    db_user = result.scalars().first()
+    if db_user is None:
+        resolved_user_cache.invalidate(user_id)
+        return None
+    if resolved_user_cache.last_online_due(user_id):
+        now = datetime.now(UTC)
+        await session.execute(
+            update(User).where(User.id == user_id).values(last_online=now)
+        )
+        await session.commit()
+        resolved_user_cache.mark_online(user_id)
+    return db_user
+
+
 async def _resolve_user_from_payload(
     session: AsyncSession | LockedAsyncSession,
     user_payload: dict,
@@ -90,6 +313,14 @@ async def _resolve_user_from_payload(
     email = user_payload.get("email")
     picture = user_payload.get("picture")
     organizations = _organizations_from_payload(user_payload)
+    claims_hash = _claims_hash(
+        username, firstname, lastname, email, picture, organizations
+    )
+
+    if resolved_user_cache.is_synced(user_id, claims_hash):
+        db_user = await _load_synced_user(session, user_id)
+        if db_user is not None:
+            return db_user
 
     result = await session.execute(select(User).where(User.id == user_id))
     db_user = result.scalars().first()
@@ -104,7 +335,7 @@ async def _resolve_user_from_payload(
                 lastname=lastname,
                 title="User",
                 avatar_url=picture,
-                last_online=datetime.now(timezone.utc),
+                last_online=datetime.now(UTC),
             )
             session.add(new_user)
             await session.commit()
@@ -141,7 +372,7 @@ async def _resolve_user_from_payload(
         await session.refresh(db_user)
 
     if db_user:
-        db_user.last_online = datetime.now(timezone.utc)
+        db_user.last_online = datetime.now(UTC)
         session.add(db_user)
         try:
             await _update_user_root_locations(
@@ -154,6 +385,7 @@ async def _resolve_user_from_payload(
                 "Failed to update user root locations. Please contact an administrator if you believe this is an error.",
                 extensions={"code": "INTERNAL_SERVER_ERROR"},
             ) from e
+        resolved_user_cache.mark_synced(user_id, claims_hash)
 
     return db_user
 
@@ -166,7 +398,7 @@ async def get_user_from_connection_params(
     if not token:
         return None
     try:
-        user_payload = verify_token(token)
+        user_payload = await verify_token(token)
     except Exception as e:
         logger.warning("WebSocket auth failed for token: %s", e)
         return None
@@ -177,7 +409,7 @@ async def get_context(
     connection: HTTPConnection,
     session=Depends(get_db_session),
 ) -> Context:
-    user_payload = get_user_payload(connection)
+    user_payload = await get_user_payload(connection)
     db_user = None
     organizations = None
 
@@ -185,7 +417,13 @@ async def get_context(
         organizations = _organizations_from_payload(user_payload)
         db_user = await _resolve_user_from_payload(session, user_payload)
 
-    return Context(db=session, user=db_user, organizations=organizations)
+    return Context(
+        db=session,
+        user=db_user,
+        organizations=organizations,
+        read_session_factory=read_session,
+        read_replica=read_engine is not engine,
+    )
 
 
 async def _update_user_root_locations(
@@ -5,6 +5,7 @@ from typing import Any
 from zoneinfo import ZoneInfo
 
 from api.inputs import FieldType, PatientState
+from api.services.property_definitions import PropertyDefinitionSnapshot
 from database import models
 
 # Date-only due dates are stored as an UTC 23:59:59.999 sentinel; the wall
@@ -12,15 +13,17 @@ from database import models
 # timezone (see web/utils/dueDate.ts).
 _DATE_ONLY_SENTINEL_MICROSECOND = 999000
 
-CLINIC_KINDS = ("CLINIC", "PRACTICE")
+CLINIC_KINDS = models.LINEAGE_LEVELS["clinic"]
 
 LOCATION_KIND_COLUMNS: dict[str, tuple[str, ...]] = {
     "location-CLINIC": CLINIC_KINDS,
-    "location-WARD": ("WARD",),
-    "location-ROOM": ("ROOM",),
-    "location-BED": ("BED",),
+    "location-WARD": models.LINEAGE_LEVELS["ward"],
+    "location-ROOM": models.LINEAGE_LEVELS["room"],
+    "location-BED": models.LINEAGE_LEVELS["bed"],
 }
 
+_LINEAGE_LEVEL_BY_KINDS = {kinds: level for level, kinds in models.LINEAGE_LEVELS.items()}
+
 
 @dataclass
 class ExportCell:
@@ -33,6 +36,8 @@ class LocationInfo:
     title: str
     kind: str | None
     parent_id: str | None
+    # Titles per lineage level (see models.location_lineage), when loaded.
+    lineage: dict[str, str | None] | None = None
 
 
 @dataclass
@@ -44,7 +49,7 @@ class ExportContext:
     exported_by: str | None = None
     locations: dict[str, LocationInfo] = field(default_factory=dict)
     users: dict[str, models.User] = field(default_factory=dict)
-    property_definitions: dict[str, models.PropertyDefinition] = field(
+    property_definitions: dict[str, PropertyDefinitionSnapshot] = field(
         default_factory=dict,
     )
     properties_by_entity: dict[str, dict[str, models.PropertyValue]] = field(
@@ -97,6 +102,10 @@ def location_title_by_kind(
     kinds: tuple[str, ...],
     locations: dict[str, LocationInfo],
 ) -> str | None:
+    location = locations.get(location_id) if location_id else None
+    level = _LINEAGE_LEVEL_BY_KINDS.get(kinds)
+    if location is not None and location.lineage is not None and level:
+        return location.lineage.get(level)
     for _, node in location_path_nodes(location_id, locations):
         if node.kind and node.kind.upper() in kinds:
             return node.title
@@ -125,7 +134,7 @@ _SELECT_OPTION_KEY = re.compile(r"-opt-(\d+)$")
 
 def select_option_label(
     raw_value: str,
-    definition: models.PropertyDefinition,
+    definition: PropertyDefinitionSnapshot,
 ) -> str:
     match = _SELECT_OPTION_KEY.search(raw_value)
     if match and definition.options:
@@ -232,10 +241,7 @@ def _patient_age_years(birthdate: date, today: date) -> int:
 
 
 def _patient_update_date(patient: models.Patient) -> datetime | None:
-    task_dates = [
-        task.update_date for task in patient.tasks if task.update_date
-    ]
-    task_max = max(task_dates) if task_dates else None
+    task_max = patient.last_activity_at
     if task_max is not None and patient.updated_at is not None:
         return max(task_max, patient.updated_at)
     return task_max or patient.updated_at
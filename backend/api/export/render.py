@@ -2,12 +2,15 @@ import codecs
 import csv
 import io
 from datetime import date, datetime
+from typing import Any
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.page import PageMargins
 from openpyxl.worksheet.properties import PageSetupProperties
+from openpyxl.worksheet.worksheet import Worksheet
 
 from api.export.cells import ExportCell, ExportContext
 
@@ -69,17 +72,32 @@ def format_cell_text(cell: ExportCell, ctx: ExportContext) -> str:
     return neutralize_formula(str(value))
 
 
+def _csv_writer(buffer: io.StringIO):
+    return csv.writer(buffer, delimiter=";", lineterminator="\r\n")
+
+
+def render_csv_header(headers: list[str]) -> bytes:
+    buffer = io.StringIO()
+    _csv_writer(buffer).writerow(
+        [neutralize_formula(header) for header in headers]
+    )
+    return codecs.BOM_UTF8 + buffer.getvalue().encode("utf-8")
+
+
+def render_csv_rows(rows: list[list[ExportCell]], ctx: ExportContext) -> bytes:
+    buffer = io.StringIO()
+    writer = _csv_writer(buffer)
+    for row in rows:
+        writer.writerow([format_cell_text(cell, ctx) for cell in row])
+    return buffer.getvalue().encode("utf-8")
+
+
 def render_csv(
     headers: list[str],
     rows: list[list[ExportCell]],
     ctx: ExportContext,
 ) -> bytes:
-    buffer = io.StringIO()
-    writer = csv.writer(buffer, delimiter=";", lineterminator="\r\n")
-    writer.writerow([neutralize_formula(header) for header in headers])
-    for row in rows:
-        writer.writerow([format_cell_text(cell, ctx) for cell in row])
-    return codecs.BOM_UTF8 + buffer.getvalue().encode("utf-8")
+    return render_csv_header(headers) + render_csv_rows(rows, ctx)
 
 
 def _sheet_title(title: str) -> str:
@@ -87,23 +105,26 @@ def _sheet_title(title: str) -> str:
     return cleaned.strip()[:31] or "Export"
 
 
-def _write_cell(worksheet, row: int, column: int, cell: ExportCell, ctx: ExportContext):
-    target = worksheet.cell(row=row, column=column)
+def _xlsx_value(cell: ExportCell, ctx: ExportContext) -> tuple[Any, str | None]:
     value = cell.value
     if value is None:
-        target.value = None
-    elif cell.kind == "datetime" and isinstance(value, datetime):
-        target.value = value
-        target.number_format = ctx.formats["xlsx_datetime"]
-    elif cell.kind == "date" and isinstance(value, (date, datetime)):
-        target.value = value
-        target.number_format = ctx.formats["xlsx_date"]
-    elif cell.kind == "number" and isinstance(value, (int, float)):
-        target.value = value
-    elif cell.kind == "bool":
-        target.value = ctx.labels["yes"] if value else ctx.labels["no"]
-    else:
-        target.value = neutralize_formula(str(value))
+        return None, None
+    if cell.kind == "datetime" and isinstance(value, datetime):
+        return value, ctx.formats["xlsx_datetime"]
+    if cell.kind == "date" and isinstance(value, (date, datetime)):
+        return value, ctx.formats["xlsx_date"]
+    if cell.kind == "number" and isinstance(value, (int, float)):
+        return value, None
+    if cell.kind == "bool":
+        return (ctx.labels["yes"] if value else ctx.labels["no"]), None
+    return neutralize_formula(str(value)), None
+
+
+def _write_cell(worksheet, row: int, column: int, cell: ExportCell, ctx: ExportContext):
+    target = worksheet.cell(row=row, column=column)
+    target.value, number_format = _xlsx_value(cell, ctx)
+    if number_format:
+        target.number_format = number_format
     return target
 
 
@@ -123,6 +144,48 @@ def _estimate_row_height(texts: list[str], widths: list[float]) -> float:
     return max(_BASE_ROW_HEIGHT, max_lines * _LINE_HEIGHT + 9.0)
 
 
+def _subtitle(ctx: ExportContext, row_count: int | None) -> str:
+    generated_at = ctx.now.strftime(ctx.formats["datetime"])
+    generated_by = (
+        f" {ctx.labels['generated_by']} {ctx.exported_by}"
+        if ctx.exported_by
+        else ""
+    )
+    subtitle = f"{ctx.labels['generated_at']} {generated_at} ({ctx.tz.key}){generated_by}"
+    if row_count is None:
+        return subtitle
+    return f"{subtitle} — {row_count} {ctx.labels['entries']}"
+
+
+def _apply_print_setup(
+    worksheet,
+    title: str,
+    subtitle: str,
+    header_row: int,
+    last_row: int,
+    column_count: int,
+    ctx: ExportContext,
+) -> None:
+    worksheet.print_title_rows = f"{header_row}:{header_row}"
+    worksheet.print_area = (
+        f"A1:{get_column_letter(column_count)}{max(last_row, header_row)}"
+    )
+    worksheet.page_setup.orientation = "landscape"
+    worksheet.page_setup.paperSize = Worksheet.PAPERSIZE_A4
+    worksheet.page_setup.fitToWidth = 1
+    worksheet.page_setup.fitToHeight = 0
+    worksheet.sheet_properties.pageSetUpPr = PageSetupProperties(fitToPage=True)
+    worksheet.page_margins = PageMargins(
+        left=0.4, right=0.4, top=0.6, bottom=0.6, header=0.3, footer=0.3,
+    )
+    worksheet.oddFooter.left.text = f"{title} — {subtitle}"
+    worksheet.oddFooter.left.size = 8
+    worksheet.oddFooter.right.text = (
+        f"{ctx.labels['page']} &P {ctx.labels['page_of']} &N"
+    )
+    worksheet.oddFooter.right.size = 8
+
+
 def render_xlsx(
     headers: list[str],
     rows: list[list[ExportCell]],
@@ -134,16 +197,7 @@ def render_xlsx(
     worksheet.title = _sheet_title(title)
 
     column_count = max(len(headers), 1)
-    generated_at = ctx.now.strftime(ctx.formats["datetime"])
-    generated_by = (
-        f" {ctx.labels['generated_by']} {ctx.exported_by}"
-        if ctx.exported_by
-        else ""
-    )
-    subtitle = (
-        f"{ctx.labels['generated_at']} {generated_at} ({ctx.tz.key})"
-        f"{generated_by} — {len(rows)} {ctx.labels['entries']}"
-    )
+    subtitle = _subtitle(ctx, len(rows))
 
     title_cell = worksheet.cell(row=1, column=1, value=title)
     title_cell.font = Font(size=14, bold=True)
@@ -206,25 +260,109 @@ def render_xlsx(
             f"A{header_row}:{get_column_letter(column_count)}{last_row}"
         )
 
-    worksheet.print_title_rows = f"{header_row}:{header_row}"
-    worksheet.print_area = (
-        f"A1:{get_column_letter(column_count)}{max(last_row, header_row)}"
-    )
-    worksheet.page_setup.orientation = "landscape"
-    worksheet.page_setup.paperSize = worksheet.PAPERSIZE_A4
-    worksheet.page_setup.fitToWidth = 1
-    worksheet.page_setup.fitToHeight = 0
-    worksheet.sheet_properties.pageSetUpPr = PageSetupProperties(fitToPage=True)
-    worksheet.page_margins = PageMargins(
-        left=0.4, right=0.4, top=0.6, bottom=0.6, header=0.3, footer=0.3,
+    _apply_print_setup(
+        worksheet, title, subtitle, header_row, last_row, column_count, ctx,
     )
-    worksheet.oddFooter.left.text = f"{title} — {subtitle}"
-    worksheet.oddFooter.left.size = 8
-    worksheet.oddFooter.right.text = (
-        f"{ctx.labels['page']} &P {ctx.labels['page_of']} &N"
-    )
-    worksheet.oddFooter.right.size = 8
 
     output = io.BytesIO()
     workbook.save(output)
     return output.getvalue()
+
+
+class StreamingXlsxWriter:
+    """Write-only XLSX renderer that keeps a constant memory footprint.
+
+    Rows are appended in batches and flushed to a temporary file by openpyxl;
+    column widths are estimated from the first batch and the entry count is
+    only known for the page footer, so the subtitle row omits it.
+    """
+
+    _HEADER_ROW = 4
+
+    def __init__(
+        self,
+        headers: list[str],
+        first_rows: list[list[ExportCell]],
+        ctx: ExportContext,
+        title: str,
+    ):
+        self._ctx = ctx
+        self._title = title
+        self._column_count = max(len(headers), 1)
+        self._row_count = 0
+        self._workbook = Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet(_sheet_title(title))
+        worksheet = self._worksheet
+
+        text_rows = [[format_cell_text(cell, ctx) for cell in row] for row in first_rows]
+        for column_index in range(self._column_count):
+            width = _estimate_width(
+                [headers[column_index] if column_index < len(headers) else ""]
+                + [
+                    text_row[column_index]
+                    for text_row in text_rows
+                    if column_index < len(text_row)
+                ],
+            )
+            worksheet.column_dimensions[
+                get_column_letter(column_index + 1)
+            ].width = width
+        worksheet.freeze_panes = f"A{self._HEADER_ROW + 1}"
+
+        title_cell = WriteOnlyCell(worksheet, value=title)
+        title_cell.font = Font(size=14, bold=True)
+        worksheet.append([title_cell])
+        subtitle_cell = WriteOnlyCell(worksheet, value=_subtitle(ctx, None))
+        subtitle_cell.font = Font(size=9, color="FF64748B")
+        worksheet.append([subtitle_cell])
+        worksheet.append([])
+        last_column = get_column_letter(self._column_count)
+        worksheet.merged_cells.add(f"A1:{last_column}1")
+        worksheet.merged_cells.add(f"A2:{last_column}2")
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = Font(bold=True, color="FFFFFFFF")
+            cell.fill = _HEADER_FILL
+            cell.border = _THIN_BORDER
+            cell.alignment = Alignment(vertical="center", wrap_text=True)
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+
+        self.append_rows(first_rows)
+
+    def append_rows(self, rows: list[list[ExportCell]]) -> None:
+        worksheet = self._worksheet
+        for row in rows:
+            cells = []
+            for export_cell in row:
+                value, number_format = _xlsx_value(export_cell, self._ctx)
+                cell = WriteOnlyCell(worksheet, value=value)
+                if number_format:
+                    cell.number_format = number_format
+                cell.border = _THIN_BORDER
+                cell.alignment = Alignment(vertical="center", wrap_text=True)
+                if self._row_count % 2 == 1:
+                    cell.fill = _ZEBRA_FILL
+                cells.append(cell)
+            worksheet.append(cells)
+            self._row_count += 1
+
+    def save(self, path: str) -> None:
+        worksheet = self._worksheet
+        last_row = self._HEADER_ROW + self._row_count
+        if self._row_count:
+            worksheet.auto_filter.ref = (
+                f"A{self._HEADER_ROW}:{get_column_letter(self._column_count)}{last_row}"
+            )
+        _apply_print_setup(
+            worksheet,
+            self._title,
+            _subtitle(self._ctx, self._row_count),
+            self._HEADER_ROW,
+            last_row,
+            self._column_count,
+            self._ctx,
+        )
+        self._workbook.save(path)
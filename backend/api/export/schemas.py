@@ -70,6 +70,7 @@ class TableExportRequest(CamelModel):
     patient_id: str | None = None
     location_node_id: str | None = None
     states: list[PatientState] | None = None
+    stream: bool = False
 
     def query_filters(self) -> list[QueryFilterClauseInput] | None:
         if not self.filters:
@@ -1,11 +1,15 @@
+import asyncio
+import os
 import re
+import tempfile
 import unicodedata
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from types import SimpleNamespace
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 
 from api.context import Context
 from api.export.cells import (
@@ -17,10 +21,17 @@ from api.export.cells import (
     user_display_name,
 )
 from api.export.labels import get_formats, get_labels
-from api.export.render import render_csv, render_xlsx
+from api.export.render import (
+    StreamingXlsxWriter,
+    render_csv,
+    render_csv_header,
+    render_csv_rows,
+    render_xlsx,
+)
 from api.export.schemas import TableExportRequest
 from api.inputs import PaginationInput
-from config import EXPORT_MAX_ROWS
+from api.services.property_definitions import property_definition_cache
+from config import EXPORT_MAX_ROWS, EXPORT_STREAM_BATCH_SIZE
 from database import models
 
 _TRANSLITERATIONS = str.maketrans(
@@ -33,6 +44,9 @@ XLSX_MEDIA_TYPE = (
 )
 
 
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
 @dataclass
 class ExportResult:
     content: bytes
@@ -40,6 +54,13 @@ class ExportResult:
     filename: str
 
 
+@dataclass
+class ExportStream:
+    chunks: AsyncIterator[bytes]
+    media_type: str
+    filename: str
+
+
 def _resolve_timezone(name: str) -> ZoneInfo:
     for candidate in (name, "Europe/Berlin", "UTC"):
         try:
@@ -58,19 +79,30 @@ def _slugify_filename(title: str) -> str:
 
 
 async def _load_locations(db) -> dict[str, LocationInfo]:
+    lineage = models.location_lineage
     result = await db.execute(
         select(
             models.LocationNode.id,
             models.LocationNode.title,
             models.LocationNode.kind,
             models.LocationNode.parent_id,
-        ),
+            lineage.c.location_id.label("lineage_id"),
+            *[lineage.c[f"{level}_title"] for level in models.LINEAGE_LEVELS],
+        ).outerjoin(lineage, lineage.c.location_id == models.LocationNode.id),
     )
     return {
         row.id: LocationInfo(
             title=row.title,
             kind=row.kind,
             parent_id=row.parent_id,
+            lineage=(
+                {
+                    level: row._mapping[f"{level}_title"]
+                    for level in models.LINEAGE_LEVELS
+                }
+                if row.lineage_id is not None
+                else None
+            ),
         )
         for row in result.all()
     }
@@ -82,12 +114,20 @@ async def _load_property_data(
     entity_column,
     entity_ids: list[str],
 ) -> None:
-    definitions_result = await db.execute(select(models.PropertyDefinition))
-    ctx.property_definitions = {
-        definition.id: definition
-        for definition in definitions_result.scalars().all()
-    }
+    await _load_property_definitions(ctx)
+    await _load_property_values(db, ctx, entity_column, entity_ids)
+
+
+async def _load_property_definitions(ctx: ExportContext) -> None:
+    ctx.property_definitions = await property_definition_cache.all()
+
 
+async def _load_property_values(
+    db,
+    ctx: ExportContext,
+    entity_column,
+    entity_ids: list[str],
+) -> None:
     if not entity_ids:
         return
 
@@ -105,30 +145,50 @@ async def _load_property_data(
         if value.user_value and not value.user_value.startswith("team:"):
             property_user_ids.add(value.user_value)
 
+    property_user_ids.difference_update(ctx.users)
     if property_user_ids:
         users_result = await db.execute(
             select(models.User).where(models.User.id.in_(property_user_ids)),
         )
-        ctx.users = {user.id: user for user in users_result.scalars().all()}
+        ctx.users.update(
+            (user.id, user) for user in users_result.scalars().all()
+        )
 
 
 def _export_pagination() -> PaginationInput:
     return PaginationInput(page_index=0, page_size=EXPORT_MAX_ROWS)
 
 
+def _task_query_arguments(request: TableExportRequest) -> dict:
+    return {
+        "patient_id": request.patient_id,
+        "assignee_id": request.assignee_id,
+        "assignee_team_id": request.assignee_team_id,
+        "root_location_ids": request.root_location_ids,
+        "filters": request.query_filters(),
+        "sorts": request.query_sorts(),
+        "search": request.query_search(),
+    }
+
+
+def _patient_query_arguments(request: TableExportRequest) -> dict:
+    return {
+        "location_node_id": request.location_node_id,
+        "root_location_ids": request.root_location_ids,
+        "states": request.states,
+        "filters": request.query_filters(),
+        "sorts": request.query_sorts(),
+        "search": request.query_search(),
+    }
+
+
 async def _fetch_tasks(info, request: TableExportRequest) -> list[models.Task]:
     from api.resolvers.task import TaskQuery
 
     return await TaskQuery().tasks(
         info,
-        patient_id=request.patient_id,
-        assignee_id=request.assignee_id,
-        assignee_team_id=request.assignee_team_id,
-        root_location_ids=request.root_location_ids,
-        filters=request.query_filters(),
-        sorts=request.query_sorts(),
         pagination=_export_pagination(),
-        search=request.query_search(),
+        **_task_query_arguments(request),
     )
 
 
@@ -140,31 +200,61 @@ async def _fetch_patients(
 
     return await PatientQuery().patients(
         info,
-        location_node_id=request.location_node_id,
-        root_location_ids=request.root_location_ids,
-        states=request.states,
-        filters=request.query_filters(),
-        sorts=request.query_sorts(),
         pagination=_export_pagination(),
-        search=request.query_search(),
+        **_patient_query_arguments(request),
     )
 
 
-async def run_table_export(
-    context: Context,
-    entity: str,
-    request: TableExportRequest,
-) -> ExportResult:
-    info = SimpleNamespace(context=context)
-    db = context.db
+async def _build_export_statement(info, entity: str, request: TableExportRequest):
+    from api.resolvers.patient import PatientQuery
+    from api.resolvers.task import TaskQuery
+
+    if entity == "tasks":
+        return await TaskQuery.tasks.build_statement(
+            TaskQuery(), info, **_task_query_arguments(request),
+        )
+    return await PatientQuery.patients.build_statement(
+        PatientQuery(), info, **_patient_query_arguments(request),
+    )
+
+
+def _export_context(context: Context, request: TableExportRequest) -> ExportContext:
     tz = _resolve_timezone(request.timezone)
-    ctx = ExportContext(
+    return ExportContext(
         labels=get_labels(request.locale),
         formats=get_formats(request.locale),
         tz=tz,
         now=datetime.now(tz).replace(tzinfo=None),
         exported_by=user_display_name(context.user),
     )
+
+
+def _export_title(request: TableExportRequest, default_title: str) -> str:
+    return (request.title or "").strip() or default_title
+
+
+def _export_filename(title: str, ctx: ExportContext, extension: str) -> str:
+    timestamp = ctx.now.strftime("%Y-%m-%d_%H-%M")
+    return f"{_slugify_filename(title)}_{timestamp}.{extension}"
+
+
+async def run_table_export(
+    context: Context,
+    entity: str,
+    request: TableExportRequest,
+) -> ExportResult:
+    async with context.read_session():
+        return await _run_table_export(context, entity, request)
+
+
+async def _run_table_export(
+    context: Context,
+    entity: str,
+    request: TableExportRequest,
+) -> ExportResult:
+    info = SimpleNamespace(context=context)
+    db = context.db
+    ctx = _export_context(context, request)
     ctx.locations = await _load_locations(db)
 
     if entity == "tasks":
@@ -188,23 +278,122 @@ async def run_table_export(
         resolve_cell = patient_cell
         default_title = ctx.labels["patients_title"]
 
-    title = (request.title or "").strip() or default_title
+    title = _export_title(request, default_title)
     headers = [column.label for column in request.columns]
     rows: list[list[ExportCell]] = [
         [resolve_cell(record, column.key, ctx) for column in request.columns]
         for record in records
     ]
 
-    timestamp = ctx.now.strftime("%Y-%m-%d_%H-%M")
-    base_filename = f"{_slugify_filename(title)}_{timestamp}"
     if request.format == "csv":
         return ExportResult(
             content=render_csv(headers, rows, ctx),
             media_type=CSV_MEDIA_TYPE,
-            filename=f"{base_filename}.csv",
+            filename=_export_filename(title, ctx, "csv"),
         )
     return ExportResult(
         content=render_xlsx(headers, rows, ctx, title),
         media_type=XLSX_MEDIA_TYPE,
-        filename=f"{base_filename}.xlsx",
+        filename=_export_filename(title, ctx, "xlsx"),
+    )
+
+
+async def stream_table_export(
+    context: Context,
+    entity: str,
+    request: TableExportRequest,
+) -> ExportStream:
+    """Prepare a streaming export without a row cap.
+
+    Authorization and query building happen before this returns, so errors
+    surface as a normal response; rows are then read in batches through a
+    server-side cursor and rendered batch by batch.
+    """
+    info = SimpleNamespace(context=context)
+    ctx = _export_context(context, request)
+    async with context.read_session() as db:
+        ctx.locations = await _load_locations(db)
+        await _load_property_definitions(ctx)
+        stmt = await _build_export_statement(info, entity, request)
+
+    if entity == "tasks":
+        entity_column = models.PropertyValue.task_id
+        resolve_cell = task_cell
+        default_title = ctx.labels["tasks_title"]
+    else:
+        entity_column = models.PropertyValue.patient_id
+        resolve_cell = patient_cell
+        default_title = ctx.labels["patients_title"]
+
+    title = _export_title(request, default_title)
+    headers = [column.label for column in request.columns]
+
+    async def row_batches() -> AsyncIterator[list[list[ExportCell]]]:
+        if not isinstance(stmt, Select):
+            return
+        async with context.read_session() as db:
+            result = await db.stream_scalars(
+                stmt.execution_options(yield_per=EXPORT_STREAM_BATCH_SIZE),
+            )
+            async for records in result.partitions():
+                ctx.properties_by_entity.clear()
+                await _load_property_values(
+                    db, ctx, entity_column, [record.id for record in records],
+                )
+                yield [
+                    [resolve_cell(record, column.key, ctx) for column in request.columns]
+                    for record in records
+                ]
+
+    if request.format == "csv":
+        chunks = _stream_csv(headers, row_batches(), ctx)
+        return ExportStream(
+            chunks=chunks,
+            media_type=CSV_MEDIA_TYPE,
+            filename=_export_filename(title, ctx, "csv"),
+        )
+    return ExportStream(
+        chunks=_stream_xlsx(headers, row_batches(), ctx, title),
+        media_type=XLSX_MEDIA_TYPE,
+        filename=_export_filename(title, ctx, "xlsx"),
     )
+
+
+async def _stream_csv(
+    headers: list[str],
+    batches: AsyncIterator[list[list[ExportCell]]],
+    ctx: ExportContext,
+) -> AsyncIterator[bytes]:
+    yield render_csv_header(headers)
+    async for rows in batches:
+        yield render_csv_rows(rows, ctx)
+
+
+async def _stream_xlsx(
+    headers: list[str],
+    batches: AsyncIterator[list[list[ExportCell]]],
+    ctx: ExportContext,
+    title: str,
+) -> AsyncIterator[bytes]:
+    # Rendering and file IO run in worker threads to keep the event loop free.
+    writer: StreamingXlsxWriter | None = None
+    async for rows in batches:
+        if writer is None:
+            writer = await asyncio.to_thread(StreamingXlsxWriter, headers, rows, ctx, title)
+        else:
+            await asyncio.to_thread(writer.append_rows, rows)
+    if writer is None:
+        writer = await asyncio.to_thread(StreamingXlsxWriter, headers, [], ctx, title)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        await asyncio.to_thread(writer.save, path)
+        output = await asyncio.to_thread(open, path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(output.read, _STREAM_CHUNK_BYTES):
+                yield chunk
+        finally:
+            await asyncio.to_thread(output.close)
+    finally:
+        await asyncio.to_thread(os.remove, path)
@@ -1,5 +1,6 @@
 from graphql import FieldNode, GraphQLError
 from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
 
 
 class GlobalAuthExtension(SchemaExtension):
@@ -27,3 +28,17 @@ class GlobalAuthExtension(SchemaExtension):
                             extensions={"code": "UNAUTHENTICATED"},
                         )
         yield
+
+
+class ReadSessionExtension(SchemaExtension):
+    """Run query operations on a shared read session (the read replica when
+    configured); mutations and subscriptions stay on the request session."""
+
+    async def on_execute(self):
+        execution_context = self.execution_context
+        read_session = getattr(execution_context.context, "read_session", None)
+        if read_session is None or execution_context.operation_type != OperationType.QUERY:
+            yield
+            return
+        async with read_session(shared=True):
+            yield
@@ -181,10 +181,17 @@ class SortDirection(Enum):
     DESC = "DESC"
 
 
+@strawberry.enum
+class CountMode(Enum):
+    EXACT = "EXACT"
+    CAPPED = "CAPPED"
+
+
 @strawberry.input
 class PaginationInput:
     page_index: int = 0
     page_size: int | None = None
+    after: str | None = None
 
 
 @strawberry.enum
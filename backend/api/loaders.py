@@ -0,0 +1,163 @@
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from database import models
+from sqlalchemy import select
+from strawberry.dataloader import DataLoader
+
+
+def _order_by_keys(
+    keys: list[str],
+    rows: Iterable[Any],
+    key_fn: Callable[[Any], Hashable],
+) -> list[Any]:
+    by_key = {key_fn(row): row for row in rows}
+    return [by_key.get(key) for key in keys]
+
+
+def _group_by_keys(
+    keys: list[str],
+    rows: Iterable[Any],
+    key_fn: Callable[[Any], Hashable],
+) -> list[list[Any]]:
+    grouped: dict[Hashable, list[Any]] = defaultdict(list)
+    for row in rows:
+        grouped[key_fn(row)].append(row)
+    return [grouped.get(key, []) for key in keys]
+
+
+class DataLoaders:
+    """Request-scoped batch loaders for per-row GraphQL field resolvers.
+
+    Each loader collects the keys requested during one event loop tick and
+    resolves them with a single ``IN (...)`` query, so a list page issues one
+    query per field instead of one per row.
+    """
+
+    def __init__(self, db: Any):
+        self._db = db
+        self.location_by_id = DataLoader(self._load_locations)
+        self.user_by_id = DataLoader(self._load_users)
+        self.patient_by_id = DataLoader(self._load_patients)
+        self.task_assignees = DataLoader(self._load_task_assignees)
+        self.task_properties = DataLoader(self._load_task_properties)
+        self.patient_properties = DataLoader(self._load_patient_properties)
+        self.patient_tasks = DataLoader(self._load_patient_tasks)
+        self.patient_first_assigned_location = DataLoader(
+            self._load_patient_first_assigned_locations
+        )
+        self.location_children = DataLoader(self._load_location_children)
+        self.location_legacy_patients = DataLoader(
+            self._load_location_legacy_patients
+        )
+
+    async def _load_locations(
+        self, ids: list[str]
+    ) -> list[models.LocationNode | None]:
+        result = await self._db.execute(
+            select(models.LocationNode).where(models.LocationNode.id.in_(ids))
+        )
+        return _order_by_keys(ids, result.scalars().all(), lambda loc: loc.id)
+
+    async def _load_users(self, ids: list[str]) -> list[models.User | None]:
+        result = await self._db.execute(
+            select(models.User).where(models.User.id.in_(ids))
+        )
+        return _order_by_keys(ids, result.scalars().all(), lambda user: user.id)
+
+    async def _load_patients(
+        self, ids: list[str]
+    ) -> list[models.Patient | None]:
+        result = await self._db.execute(
+            select(models.Patient).where(models.Patient.id.in_(ids))
+        )
+        return _order_by_keys(
+            ids, result.scalars().all(), lambda patient: patient.id
+        )
+
+    async def _load_task_assignees(
+        self, task_ids: list[str]
+    ) -> list[list[models.User]]:
+        result = await self._db.execute(
+            select(models.task_assignees.c.task_id, models.User)
+            .join(
+                models.task_assignees,
+                models.task_assignees.c.user_id == models.User.id,
+            )
+            .where(models.task_assignees.c.task_id.in_(task_ids))
+        )
+        grouped = _group_by_keys(task_ids, result.all(), lambda row: row[0])
+        return [[row[1] for row in rows] for rows in grouped]
+
+    async def _load_task_properties(
+        self, task_ids: list[str]
+    ) -> list[list[models.PropertyValue]]:
+        result = await self._db.execute(
+            select(models.PropertyValue)
+            .where(models.PropertyValue.task_id.in_(task_ids))
+        )
+        return _group_by_keys(
+            task_ids, result.scalars().all(), lambda value: value.task_id
+        )
+
+    async def _load_patient_properties(
+        self, patient_ids: list[str]
+    ) -> list[list[models.PropertyValue]]:
+        result = await self._db.execute(
+            select(models.PropertyValue)
+            .where(models.PropertyValue.patient_id.in_(patient_ids))
+        )
+        return _group_by_keys(
+            patient_ids, result.scalars().all(), lambda value: value.patient_id
+        )
+
+    async def _load_patient_tasks(
+        self, patient_ids: list[str]
+    ) -> list[list[models.Task]]:
+        result = await self._db.execute(
+            select(models.Task).where(models.Task.patient_id.in_(patient_ids))
+        )
+        return _group_by_keys(
+            patient_ids, result.scalars().all(), lambda task: task.patient_id
+        )
+
+    async def _load_patient_first_assigned_locations(
+        self, patient_ids: list[str]
+    ) -> list[models.LocationNode | None]:
+        result = await self._db.execute(
+            select(models.patient_locations.c.patient_id, models.LocationNode)
+            .join(
+                models.patient_locations,
+                models.patient_locations.c.location_id == models.LocationNode.id,
+            )
+            .where(models.patient_locations.c.patient_id.in_(patient_ids))
+        )
+        grouped = _group_by_keys(patient_ids, result.all(), lambda row: row[0])
+        return [rows[0][1] if rows else None for rows in grouped]
+
+    async def _load_location_children(
+        self, parent_ids: list[str]
+    ) -> list[list[models.LocationNode]]:
+        result = await self._db.execute(
+            select(models.LocationNode).where(
+                models.LocationNode.parent_id.in_(parent_ids)
+            )
+        )
+        return _group_by_keys(
+            parent_ids, result.scalars().all(), lambda loc: loc.parent_id
+        )
+
+    async def _load_location_legacy_patients(
+        self, location_ids: list[str]
+    ) -> list[list[models.Patient]]:
+        result = await self._db.execute(
+            select(models.Patient).where(
+                models.Patient.assigned_location_id.in_(location_ids)
+            )
+        )
+        return _group_by_keys(
+            location_ids,
+            result.scalars().all(),
+            lambda patient: patient.assigned_location_id,
+        )
@@ -20,12 +20,18 @@ from api.query.graphql_types import (
     sort_directions_for,
 )
 from api.query.inputs import QueryFilterClauseInput, QuerySearchInput, QuerySortClauseInput
-from api.query.property_sql import join_property_value
+from api.query.property_sql import apply_property_filter, property_value_column
 from api.query.patient_location_scope import (
     apply_patient_subtree_filter_from_cte,
     build_location_descendants_cte,
+    patient_in_locations_clause,
 )
-from api.query.sql_expr import location_title_expr, patient_display_name_expr
+from api.query.sql_expr import (
+    location_title_expr,
+    patient_display_name_expr,
+    text_similarity,
+)
+from config import QUERY_SEMI_JOINS
 from database import models
 
 
@@ -57,41 +63,10 @@ def _ensure_clinic_join(query: Select[Any], ctx: dict[str, Any]) -> tuple[Select
     return query, ln
 
 
-def _ensure_max_task_update_join(
-    query: Select[Any], ctx: dict[str, Any]
-) -> tuple[Select[Any], Any]:
-    if "max_task_update_date" in ctx:
-        return query, ctx["max_task_update_date"]
-    max_task_update_date = (
-        select(
-            func.max(models.Task.update_date).label("max_update_date"),
-            models.Task.patient_id.label("patient_id"),
-        )
-        .group_by(models.Task.patient_id)
-        .subquery()
-    )
-    ctx["max_task_update_date"] = max_task_update_date
-    query = query.outerjoin(
-        max_task_update_date,
-        models.Patient.id == max_task_update_date.c.patient_id,
-    )
-    return query, max_task_update_date
-
-
-def _patient_update_date_expr(max_task_update_date: Any) -> Any:
-    task_date = max_task_update_date.c.max_update_date
-    patient_date = models.Patient.updated_at
-    return func.coalesce(
-        case(
-            (
-                and_(patient_date.isnot(None), task_date.isnot(None)),
-                func.greatest(patient_date, task_date),
-            ),
-            else_=None,
-        ),
-        patient_date,
-        task_date,
-    )
+def _patient_update_date_expr() -> Any:
+    # GREATEST skips NULLs, so a patient without tasks sorts by updated_at.
+    # Matches the ix_patients_update_date expression index.
+    return func.greatest(models.Patient.updated_at, models.Patient.last_activity_at)
 
 
 def _parse_property_key(field_key: str) -> str | None:
@@ -114,10 +89,10 @@ FIELD_UPDATE_DATE_LABELS: dict[str, str] = {
 }
 
 
-LOCATION_SORT_KEY_KINDS: dict[str, tuple[str, ...]] = {
-    "location-WARD": ("WARD",),
-    "location-ROOM": ("ROOM",),
-    "location-BED": ("BED",),
+LOCATION_SORT_KEY_LEVELS: dict[str, str] = {
+    "location-WARD": "ward",
+    "location-ROOM": "room",
+    "location-BED": "bed",
 }
 
 
@@ -128,30 +103,26 @@ LOCATION_SORT_KEY_LABELS: dict[str, str] = {
 }
 
 
-def _ensure_position_lineage_joins(
+def _ensure_position_lineage_join(
     query: Select[Any], ctx: dict[str, Any]
-) -> tuple[Select[Any], list[Any]]:
-    if "position_lineage_nodes" in ctx:
-        return query, ctx["position_lineage_nodes"]
-    query, position_node = _ensure_position_join(query, ctx)
-    lineage_nodes: list[Any] = [position_node]
-    for depth in range(1, 8):
-        parent_node = aliased(models.LocationNode, name=f"position_parent_{depth}")
-        query = query.outerjoin(parent_node, lineage_nodes[-1].parent_id == parent_node.id)
-        lineage_nodes.append(parent_node)
-    ctx["position_lineage_nodes"] = lineage_nodes
-    return query, lineage_nodes
-
-
-def _location_title_for_kind(lineage_nodes: list[Any], target_kinds: tuple[str, ...]) -> Any:
-    candidates = [
-        case(
-            (node.kind.in_(target_kinds), location_title_expr(node)),
-            else_=None,
-        )
-        for node in lineage_nodes
-    ]
-    return func.coalesce(*candidates)
+) -> tuple[Select[Any], Any]:
+    if "position_lineage" in ctx:
+        return query, ctx["position_lineage"]
+    lineage = models.location_lineage.alias("position_lineage")
+    ctx["position_lineage"] = lineage
+    query = query.outerjoin(lineage, models.Patient.position_id == lineage.c.location_id)
+    return query, lineage
+
+
+def _filter_patient_subtree(
+    query: Select[Any],
+    filter_cte: Any,
+    ctx: dict[str, Any],
+) -> Select[Any]:
+    if QUERY_SEMI_JOINS:
+        return query.where(patient_in_locations_clause(filter_cte))
+    ctx["needs_distinct"] = True
+    return apply_patient_subtree_filter_from_cte(query, filter_cte)
 
 
 def apply_patient_filter_clause(
@@ -168,30 +139,17 @@ def apply_patient_filter_clause(
     prop_id = _parse_property_key(key)
     if prop_id:
         ft = property_field_types.get(prop_id, "FIELD_TYPE_TEXT")
-        query, _pa, col = join_property_value(
-            query, models.Patient, prop_id, ft, "patient"
+        return apply_property_filter(
+            query,
+            models.Patient,
+            prop_id,
+            ft,
+            "patient",
+            op,
+            val,
+            ctx,
+            property_field_types,
         )
-        ctx["needs_distinct"] = True
-        if ft == "FIELD_TYPE_MULTI_SELECT":
-            cond = apply_ops_to_column(col, op, val)
-        elif ft == "FIELD_TYPE_DATE":
-            cond = apply_ops_to_column(col, op, val, as_date=True)
-        elif ft == "FIELD_TYPE_DATE_TIME":
-            cond = apply_ops_to_column(col, op, val, as_datetime=True)
-        elif ft == "FIELD_TYPE_CHECKBOX":
-            if op == QueryOperator.EQ and val and val.bool_value is not None:
-                cond = col == val.bool_value
-            else:
-                cond = apply_ops_to_column(col, op, val)
-        elif ft == "FIELD_TYPE_USER":
-            cond = apply_ops_to_column(col, op, val)
-        elif ft == "FIELD_TYPE_SELECT":
-            cond = apply_ops_to_column(col, op, val)
-        else:
-            cond = apply_ops_to_column(col, op, val)
-        if cond is not None:
-            query = query.where(cond)
-        return query
 
     if key == "firstname":
         c = apply_ops_to_column(models.Patient.firstname, op, val)
@@ -230,8 +188,7 @@ def apply_patient_filter_clause(
             query = query.where(c)
         return query
     if key == "updateDate":
-        query, max_task_update_date = _ensure_max_task_update_join(query, ctx)
-        expr = _patient_update_date_expr(max_task_update_date)
+        expr = _patient_update_date_expr()
         c = apply_ops_to_column(expr, op, val, as_datetime=True)
         if c is not None:
             query = query.where(c)
@@ -243,11 +200,9 @@ def apply_patient_filter_clause(
         if c is not None:
             query = query.where(c)
         return query
-    if key in LOCATION_SORT_KEY_KINDS:
-        query, lineage_nodes = _ensure_position_lineage_joins(query, ctx)
-        expr = _location_title_for_kind(
-            lineage_nodes, LOCATION_SORT_KEY_KINDS[key]
-        )
+    if key in LOCATION_SORT_KEY_LEVELS:
+        query, lineage = _ensure_position_lineage_join(query, ctx)
+        expr = lineage.c[f"{LOCATION_SORT_KEY_LEVELS[key]}_title"]
         c = apply_ops_to_column(expr, op, val)
         if c is not None:
             query = query.where(c)
@@ -272,8 +227,7 @@ def apply_patient_filter_clause(
                     filter_cte = build_location_descendants_cte(
                         [lid], cte_name="filter_loc_subtree"
                     )
-                    ctx["needs_distinct"] = True
-                    return apply_patient_subtree_filter_from_cte(query, filter_cte)
+                    return _filter_patient_subtree(query, filter_cte, ctx)
                 if op == QueryOperator.IN:
                     ids: list[str] = []
                     if val.uuid_values:
@@ -285,8 +239,7 @@ def apply_patient_filter_clause(
                     filter_cte = build_location_descendants_cte(
                         ids, cte_name="filter_loc_subtree_m"
                     )
-                    ctx["needs_distinct"] = True
-                    return apply_patient_subtree_filter_from_cte(query, filter_cte)
+                    return _filter_patient_subtree(query, filter_cte, ctx)
         query, ln = _ensure_position_join(query, ctx)
         expr = location_title_expr(ln)
         if op in (
@@ -324,6 +277,8 @@ def apply_patient_sorts(
     property_field_types: dict[str, str],
 ) -> Select[Any]:
     if not sorts:
+        if "search_rank" in ctx:
+            return query.order_by(ctx["search_rank"].desc(), models.Patient.id.asc())
         return query.order_by(models.Patient.id.asc())
 
     order_parts: list[Any] = []
@@ -334,8 +289,14 @@ def apply_patient_sorts(
         prop_id = _parse_property_key(key)
         if prop_id:
             ft = property_field_types.get(prop_id, "FIELD_TYPE_TEXT")
-            query, _pa, col = join_property_value(
-                query, models.Patient, prop_id, ft, "patient"
+            query, col = property_value_column(
+                query,
+                models.Patient,
+                prop_id,
+                ft,
+                "patient",
+                ctx,
+                property_field_types,
             )
             if desc_order:
                 order_parts.append(col.desc().nulls_last())
@@ -385,8 +346,7 @@ def apply_patient_sorts(
                 else models.Patient.description.asc().nulls_first()
             )
         elif key == "updateDate":
-            query, max_task_update_date = _ensure_max_task_update_join(query, ctx)
-            col = _patient_update_date_expr(max_task_update_date)
+            col = _patient_update_date_expr()
             order_parts.append(
                 col.desc().nulls_last() if desc_order else col.asc().nulls_first()
             )
@@ -407,9 +367,9 @@ def apply_patient_sorts(
             order_parts.append(
                 t.desc().nulls_last() if desc_order else t.asc().nulls_first()
             )
-        elif key in LOCATION_SORT_KEY_KINDS:
-            query, lineage_nodes = _ensure_position_lineage_joins(query, ctx)
-            t = _location_title_for_kind(lineage_nodes, LOCATION_SORT_KEY_KINDS[key])
+        elif key in LOCATION_SORT_KEY_LEVELS:
+            query, lineage = _ensure_position_lineage_join(query, ctx)
+            t = lineage.c[f"{LOCATION_SORT_KEY_LEVELS[key]}_title"]
             order_parts.append(
                 t.desc().nulls_last() if desc_order else t.asc().nulls_first()
             )
@@ -426,15 +386,18 @@ def apply_patient_search(
 ) -> Select[Any]:
     if not search or not search.search_text or not search.search_text.strip():
         return query
-    pattern = f"%{search.search_text.strip()}%"
-    expr = patient_display_name_expr(models.Patient)
-    parts: list[Any] = [
-        models.Patient.firstname.ilike(pattern),
-        models.Patient.lastname.ilike(pattern),
-        expr.ilike(pattern),
-        models.Patient.description.ilike(pattern),
-    ]
-    if search.include_properties:
+    text = search.search_text.strip()
+    pattern = f"%{text}%"
+    parts: list[Any] = [models.Patient.search_text.ilike(pattern)]
+    if search.include_properties and QUERY_SEMI_JOINS:
+        parts.append(
+            models.Patient.id.in_(
+                select(models.PropertyValue.patient_id).where(
+                    models.PropertyValue.text_value.ilike(pattern)
+                )
+            )
+        )
+    elif search.include_properties:
         pv = aliased(models.PropertyValue)
         query = query.outerjoin(
             pv,
@@ -446,6 +409,7 @@ def apply_patient_search(
         parts.append(pv.text_value.ilike(pattern))
         ctx["needs_distinct"] = True
     query = query.where(or_(*parts))
+    ctx["search_rank"] = text_similarity(models.Patient.search_text, text)
     return query
 
 
@@ -23,8 +23,14 @@ from api.query.inputs import (
     QuerySearchInput,
     QuerySortClauseInput,
 )
-from api.query.property_sql import join_property_value
-from api.query.sql_expr import location_title_expr, patient_display_name_expr, user_display_label_expr
+from api.query.property_sql import apply_property_filter, property_value_column
+from api.query.sql_expr import (
+    location_title_expr,
+    patient_display_name_expr,
+    text_similarity,
+    user_display_label_expr,
+)
+from config import QUERY_SEMI_JOINS
 from database import models
 
 
@@ -87,25 +93,17 @@ def _patient_label_exists(op: QueryOperator, val: Any) -> Any:
     )
 
 
-def _patient_label_ilike_exists(pattern: str) -> Any:
-    p = aliased(models.Patient)
-    return exists(
-        select(1).where(
-            p.id == models.Task.patient_id,
-            patient_display_name_expr(p).ilike(pattern),
-        )
+def _patient_search_match(pattern: str) -> Any:
+    return models.Task.patient_id.in_(
+        select(models.Patient.id).where(models.Patient.search_text.ilike(pattern))
     )
 
 
-def _assignee_label_ilike_exists(pattern: str) -> Any:
-    u = aliased(models.User)
-    return exists(
-        select(1)
-        .select_from(models.task_assignees.join(u, models.task_assignees.c.user_id == u.id))
-        .where(
-            models.task_assignees.c.task_id == models.Task.id,
-            user_display_label_expr(u).ilike(pattern),
-        )
+def _assignee_search_match(pattern: str) -> Any:
+    return models.Task.id.in_(
+        select(models.task_assignees.c.task_id)
+        .join(models.User, models.task_assignees.c.user_id == models.User.id)
+        .where(models.User.search_text.ilike(pattern))
     )
 
 
@@ -138,40 +136,17 @@ def apply_task_filter_clause(
     prop_id = _parse_property_key(key)
     if prop_id:
         ft = property_field_types.get(prop_id, "FIELD_TYPE_TEXT")
-        ent = "task"
-        query, _pa, col = join_property_value(
-            query, models.Task, prop_id, ft, ent
+        return apply_property_filter(
+            query,
+            models.Task,
+            prop_id,
+            ft,
+            "task",
+            op,
+            val,
+            ctx,
+            property_field_types,
         )
-        ctx["needs_distinct"] = True
-        ctx.setdefault("property_joins", set()).add(prop_id)
-        if ft == "FIELD_TYPE_MULTI_SELECT":
-            if op in (
-                QueryOperator.IN,
-                QueryOperator.ANY_IN,
-                QueryOperator.ALL_IN,
-                QueryOperator.NONE_IN,
-            ):
-                cond = apply_ops_to_column(col, op, val)
-            else:
-                cond = apply_ops_to_column(col, op, val, as_date=False)
-        elif ft == "FIELD_TYPE_DATE":
-            cond = apply_ops_to_column(col, op, val, as_date=True)
-        elif ft == "FIELD_TYPE_DATE_TIME":
-            cond = apply_ops_to_column(col, op, val, as_datetime=True)
-        elif ft == "FIELD_TYPE_CHECKBOX":
-            if op == QueryOperator.EQ and val and val.bool_value is not None:
-                cond = col == val.bool_value
-            else:
-                cond = apply_ops_to_column(col, op, val)
-        elif ft == "FIELD_TYPE_USER":
-            cond = apply_ops_to_column(col, op, val)
-        elif ft == "FIELD_TYPE_SELECT":
-            cond = apply_ops_to_column(col, op, val)
-        else:
-            cond = apply_ops_to_column(col, op, val)
-        if cond is not None:
-            query = query.where(cond)
-        return query
 
     if key == "title":
         c = apply_ops_to_column(models.Task.title, op, val)
@@ -319,6 +294,8 @@ def apply_task_sorts(
     property_field_types: dict[str, str],
 ) -> Select[Any]:
     if not sorts:
+        if "search_rank" in ctx:
+            return query.order_by(ctx["search_rank"].desc(), models.Task.id.asc())
         return query.order_by(models.Task.id.asc())
 
     order_parts: list[Any] = []
@@ -329,8 +306,14 @@ def apply_task_sorts(
         prop_id = _parse_property_key(key)
         if prop_id:
             ft = property_field_types.get(prop_id, "FIELD_TYPE_TEXT")
-            query, _pa, col = join_property_value(
-                query, models.Task, prop_id, ft, "task"
+            query, col = property_value_column(
+                query,
+                models.Task,
+                prop_id,
+                ft,
+                "task",
+                ctx,
+                property_field_types,
             )
             if desc_order:
                 order_parts.append(col.desc().nulls_last())
@@ -411,14 +394,22 @@ def apply_task_search(
 ) -> Select[Any]:
     if not search or not search.search_text or not search.search_text.strip():
         return query
-    pattern = f"%{search.search_text.strip()}%"
+    text = search.search_text.strip()
+    pattern = f"%{text}%"
     parts: list[Any] = [
-        models.Task.title.ilike(pattern),
-        models.Task.description.ilike(pattern),
-        _patient_label_ilike_exists(pattern),
-        _assignee_label_ilike_exists(pattern),
+        models.Task.search_text.ilike(pattern),
+        _patient_search_match(pattern),
+        _assignee_search_match(pattern),
     ]
-    if search.include_properties:
+    if search.include_properties and QUERY_SEMI_JOINS:
+        parts.append(
+            models.Task.id.in_(
+                select(models.PropertyValue.task_id).where(
+                    models.PropertyValue.text_value.ilike(pattern)
+                )
+            )
+        )
+    elif search.include_properties:
         pv = aliased(models.PropertyValue)
         query = query.outerjoin(
             pv,
@@ -430,6 +421,7 @@ def apply_task_search(
         parts.append(pv.text_value.ilike(pattern))
         ctx["needs_distinct"] = True
     query = query.where(or_(*parts))
+    ctx["search_rank"] = text_similarity(models.Task.search_text, text)
     return query
 
 
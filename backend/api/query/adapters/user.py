@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy import Select, or_
+from sqlalchemy import Select
 
 from api.context import Info
 from api.inputs import SortDirection
@@ -8,7 +8,7 @@ from api.query.enums import QueryOperator, QueryableFieldKind, QueryableValueTyp
 from api.query.field_ops import apply_ops_to_column
 from api.query.graphql_types import QueryableField, sort_directions_for
 from api.query.inputs import QueryFilterClauseInput, QuerySearchInput, QuerySortClauseInput
-from api.query.sql_expr import user_display_label_expr
+from api.query.sql_expr import text_similarity, user_display_label_expr
 from database import models
 
 
@@ -59,6 +59,8 @@ def apply_user_sorts(
     property_field_types: dict[str, str],
 ) -> Select[Any]:
     if not sorts:
+        if "search_rank" in ctx:
+            return query.order_by(ctx["search_rank"].desc(), models.User.id.asc())
         return query.order_by(models.User.id.asc())
 
     order_parts: list[Any] = []
@@ -93,15 +95,9 @@ def apply_user_search(
 ) -> Select[Any]:
     if not search or not search.search_text or not search.search_text.strip():
         return query
-    pattern = f"%{search.search_text.strip()}%"
-    expr = user_display_label_expr(models.User)
-    query = query.where(
-        or_(
-            models.User.username.ilike(pattern),
-            models.User.email.ilike(pattern),
-            expr.ilike(pattern),
-        )
-    )
+    text = search.search_text.strip()
+    query = query.where(models.User.search_text.ilike(f"%{text}%"))
+    ctx["search_rank"] = text_similarity(models.User.search_text, text)
     return query
 
 
@@ -52,7 +52,7 @@ async def apply_unified_query(
         return stmt
 
     prop_ids = _property_ids_from_filters(filters) | _property_ids_from_sorts(sorts)
-    property_field_types = await load_property_field_types(db, prop_ids)
+    property_field_types = await load_property_field_types(prop_ids)
 
     ctx: dict[str, Any] = {"needs_distinct": False}
 
@@ -68,20 +68,29 @@ async def apply_unified_query(
 
     if ctx.get("needs_distinct") or bool(getattr(stmt, "_distinct", False)):
         stmt = dedupe_orm_select_by_root_id(stmt, handler["root_model"])
+        search_rank = ctx.get("search_rank")
         ctx.clear()
         ctx["needs_distinct"] = False
+        if search_rank is not None:
+            ctx["search_rank"] = search_rank
 
     if not for_count:
         stmt = handler["apply_sorts"](stmt, sorts, ctx, property_field_types)
 
-    if (
-        not for_count
-        and pagination is not None
-        and pagination is not strawberry.UNSET
-    ):
-        page_size = pagination.page_size
-        if page_size:
-            offset = pagination.page_index * page_size
-            stmt = stmt.offset(offset).limit(page_size)
+    if not for_count:
+        stmt = apply_pagination(stmt, pagination)
+
+    return stmt
+
 
+def apply_pagination(
+    stmt: Select[Any],
+    pagination: PaginationInput | None,
+) -> Select[Any]:
+    if pagination is None or pagination is strawberry.UNSET:
+        return stmt
+    page_size = pagination.page_size
+    if page_size:
+        offset = pagination.page_index * page_size
+        stmt = stmt.offset(offset).limit(page_size)
     return stmt
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from functools import wraps
 from typing import Any, Callable
 
@@ -5,9 +6,41 @@ import strawberry
 from sqlalchemy import Select, func, select
 
 from api.context import Info
-from api.inputs import PaginationInput
+from api.inputs import CountMode, PaginationInput
 from api.query.engine import apply_unified_query
+from api.query.keyset import apply_keyset_pagination, encode_cursor, sort_fingerprint
 from api.query.inputs import QueryFilterClauseInput, QuerySearchInput, QuerySortClauseInput
+from api.query.registry import get_entity_handler
+from config import LIST_COUNT_CAP
+
+
+@dataclass
+class UnifiedPage:
+    items: list[Any]
+    total_count: int
+    total_is_exact: bool = True
+
+
+def _find_info(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Info | None:
+    info: Info | None = kwargs.get("info")
+    if not info:
+        for a in args:
+            if hasattr(a, "context"):
+                info = a
+                break
+    if not info or not hasattr(info, "context"):
+        return None
+    return info
+
+
+def _effective_sorts(
+    kwargs: dict[str, Any],
+    default_sorts_when_empty: list[QuerySortClauseInput] | None,
+) -> list[QuerySortClauseInput] | None:
+    sorts: list[QuerySortClauseInput] | None = kwargs.get("sorts")
+    if (not sorts) and default_sorts_when_empty:
+        sorts = list(default_sorts_when_empty)
+    return sorts
 
 
 def unified_list_query(
@@ -16,50 +49,134 @@ def unified_list_query(
     default_sorts_when_empty: list[QuerySortClauseInput] | None = None,
 ):
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        async def build_statement(*args: Any, **kwargs: Any) -> Any:
+            """Return the filtered and sorted, but unpaginated, statement.
+
+            Non-``Select`` resolver results (and calls without an ``Info``) are
+            returned unchanged.
+            """
             filters: list[QueryFilterClauseInput] | None = kwargs.get("filters")
-            sorts: list[QuerySortClauseInput] | None = kwargs.get("sorts")
-            if (not sorts) and default_sorts_when_empty:
-                sorts = list(default_sorts_when_empty)
+            sorts = _effective_sorts(kwargs, default_sorts_when_empty)
             search: QuerySearchInput | None = kwargs.get("search")
-            pagination: PaginationInput | None = kwargs.get("pagination")
 
             result = await func(*args, **kwargs)
 
             if not isinstance(result, Select):
                 return result
 
-            info: Info | None = kwargs.get("info")
-            if not info:
-                for a in args:
-                    if hasattr(a, "context"):
-                        info = a
-                        break
-            if not info or not hasattr(info, "context"):
+            info = _find_info(args, kwargs)
+            if info is None:
                 return result
 
-            stmt = await apply_unified_query(
+            return await apply_unified_query(
                 result,
                 entity=entity,
                 db=info.context.db,
                 filters=filters,
                 sorts=sorts,
                 search=search,
-                pagination=pagination,
+                pagination=None,
                 for_count=False,
                 info=info,
             )
 
+        async def run_page(
+            result: Select[Any],
+            info: Info,
+            kwargs: dict[str, Any],
+            count_mode: CountMode | None,
+        ) -> UnifiedPage:
             db = info.context.db
-            query_result = await db.execute(stmt)
-            return query_result.scalars().all()
+            pagination: PaginationInput | None = kwargs.get("pagination")
+            if is_unset(pagination) or not pagination.page_size:
+                query_result = await db.execute(result)
+                items = list(query_result.scalars().all())
+                return UnifiedPage(items, len(items))
+
+            root_id = get_entity_handler(entity)["root_model"].id
+            count_column = _count_column(result, root_id, count_mode, pagination)
+
+            fingerprint = sort_fingerprint(
+                _effective_sorts(kwargs, default_sorts_when_empty)
+            )
+            stmt, key_count = apply_keyset_pagination(
+                result,
+                page_size=pagination.page_size,
+                page_index=pagination.page_index,
+                after=pagination.after,
+                fingerprint=fingerprint,
+            )
+            if count_column is not None:
+                stmt = stmt.add_columns(count_column.label("_total_count"))
+            rows = (await db.execute(stmt)).all()
+            items = []
+            for row in rows:
+                item = row[0]
+                item.page_cursor = encode_cursor(row[1 : key_count + 1], fingerprint)
+                items.append(item)
+
+            if count_mode is None:
+                return UnifiedPage(items, len(items))
+            if rows:
+                total = rows[0][-1]
+            elif pagination.page_index or pagination.after:
+                count_query = select(_count_subquery(result, root_id, count_mode))
+                total = (await db.execute(count_query)).scalar() or 0
+            else:
+                total = 0
+            if count_mode is CountMode.CAPPED and total > LIST_COUNT_CAP:
+                return UnifiedPage(items, LIST_COUNT_CAP, total_is_exact=False)
+            return UnifiedPage(items, total)
+
+        async def fetch_page(
+            *args: Any,
+            count_mode: CountMode | None = None,
+            **kwargs: Any,
+        ) -> UnifiedPage:
+            """Run the list query; with ``count_mode`` the total is read in the same query."""
+            result = await build_statement(*args, **kwargs)
+            if not isinstance(result, Select):
+                items = list(result or [])
+                return UnifiedPage(items, len(items))
+            return await run_page(result, _find_info(args, kwargs), kwargs, count_mode)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await build_statement(*args, **kwargs)
+            info = _find_info(args, kwargs)
+            if not isinstance(result, Select) or info is None:
+                return result
+            page = await run_page(result, info, kwargs, None)
+            return page.items
 
+        wrapper.fetch_page = fetch_page
+        wrapper.build_statement = build_statement
         return wrapper
 
     return decorator
 
 
+def _count_column(
+    stmt: Select[Any],
+    root_id: Any,
+    count_mode: CountMode | None,
+    pagination: PaginationInput,
+) -> Any:
+    if count_mode is None:
+        return None
+    if count_mode is CountMode.EXACT and not pagination.after:
+        return func.count().over()
+    # The window count would only see rows behind the cursor (or be unbounded).
+    return _count_subquery(stmt, root_id, count_mode)
+
+
+def _count_subquery(stmt: Select[Any], root_id: Any, count_mode: CountMode) -> Any:
+    ids = stmt.order_by(None).limit(None).offset(None).with_only_columns(root_id)
+    if count_mode is CountMode.CAPPED:
+        ids = ids.limit(LIST_COUNT_CAP + 1)
+    return select(func.count()).select_from(ids.subquery()).scalar_subquery()
+
+
 async def count_unified_query(
     stmt: Select[Any],
     *,
@@ -0,0 +1,159 @@
+import base64
+import hashlib
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from api.query.inputs import QuerySortClauseInput
+from graphql import GraphQLError
+from sqlalchemy import Select, and_, false, or_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+_SORT_KEY_LABEL = "_sort_key_"
+
+
+@dataclass(frozen=True)
+class SortKey:
+    expression: ColumnElement[Any]
+    descending: bool
+    nulls_first: bool
+
+    def clause(self) -> ColumnElement[Any]:
+        ordered = self.expression.desc() if self.descending else self.expression.asc()
+        return ordered.nulls_first() if self.nulls_first else ordered.nulls_last()
+
+
+def _sort_key_from_clause(clause: Any) -> SortKey:
+    nulls_first: bool | None = None
+    if isinstance(clause, UnaryExpression) and clause.modifier in (
+        operators.nulls_first_op,
+        operators.nulls_last_op,
+    ):
+        nulls_first = clause.modifier is operators.nulls_first_op
+        clause = clause.element
+    descending = False
+    if isinstance(clause, UnaryExpression) and clause.modifier in (
+        operators.asc_op,
+        operators.desc_op,
+    ):
+        descending = clause.modifier is operators.desc_op
+        clause = clause.element
+    if nulls_first is None:
+        # Postgres default: NULLs sort as the largest value.
+        nulls_first = descending
+    return SortKey(clause, descending, nulls_first)
+
+
+def keyset_sort_keys(stmt: Select[Any]) -> list[SortKey]:
+    return [_sort_key_from_clause(c) for c in stmt._order_by_clauses]
+
+
+def sort_fingerprint(sorts: list[QuerySortClauseInput] | None) -> str:
+    parts = [f"{s.field_key}:{s.direction.value}" for s in sorts or []]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any], fingerprint: str) -> str:
+    payload = {"s": fingerprint, "k": [_encode_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _invalid_cursor() -> GraphQLError:
+    return GraphQLError(
+        "Invalid pagination cursor.",
+        extensions={"code": "BAD_REQUEST"},
+    )
+
+
+def decode_cursor(cursor: str, fingerprint: str, key_count: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(v) for v in payload["k"]]
+    except (ValueError, TypeError, KeyError) as e:
+        raise _invalid_cursor() from e
+    if payload.get("s") != fingerprint or len(values) != key_count:
+        raise _invalid_cursor()
+    return values
+
+
+def _after(key: SortKey, value: Any) -> ColumnElement[bool] | None:
+    expr = key.expression
+    if value is None:
+        return expr.is_not(None) if key.nulls_first else None
+    past = expr < value if key.descending else expr > value
+    if not key.nulls_first:
+        past = or_(past, expr.is_(None))
+    return past
+
+
+def _equal(key: SortKey, value: Any) -> ColumnElement[bool]:
+    if value is None:
+        return key.expression.is_(None)
+    return key.expression == value
+
+
+def keyset_predicate(keys: list[SortKey], values: list[Any]) -> ColumnElement[bool]:
+    """Rows strictly after ``values`` in the order described by ``keys``."""
+    branches: list[ColumnElement[bool]] = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        past = _after(key, value)
+        if past is None:
+            continue
+        prefix = [_equal(k, v) for k, v in zip(keys[:i], values[:i])]
+        branches.append(and_(*prefix, past) if prefix else past)
+    return or_(*branches) if branches else false()
+
+
+def apply_keyset_pagination(
+    stmt: Select[Any],
+    *,
+    page_size: int,
+    page_index: int,
+    after: str | None,
+    fingerprint: str,
+) -> tuple[Select[Any], int]:
+    """Paginate ``stmt`` by its ORDER BY and select the sort keys as extra columns.
+
+    Returns the statement and the number of key columns appended after the
+    entity. With ``after`` the page starts behind that cursor, otherwise
+    ``page_index`` is used as an offset.
+    """
+    keys = keyset_sort_keys(stmt)
+    stmt = stmt.order_by(None).order_by(*(k.clause() for k in keys))
+    if after:
+        values = decode_cursor(after, fingerprint, len(keys))
+        stmt = stmt.where(keyset_predicate(keys, values))
+    elif page_index:
+        stmt = stmt.offset(page_index * page_size)
+    stmt = stmt.add_columns(
+        *(k.expression.label(f"{_SORT_KEY_LABEL}{i}") for i, k in enumerate(keys))
+    ).limit(page_size)
+    return stmt, len(keys)
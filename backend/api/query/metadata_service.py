@@ -1,6 +1,5 @@
-from typing import Any
-
-from sqlalchemy import select
+import hashlib
+from dataclasses import dataclass
 
 from api.query.adapters import patient as patient_adapters
 from api.query.adapters import task as task_adapters
@@ -18,7 +17,10 @@ from api.query.graphql_types import (
     sort_directions_for,
 )
 from api.query.registry import PATIENT, TASK, USER
-from database import models
+from api.services.property_definitions import (
+    PropertyDefinitionSnapshot,
+    property_definition_cache,
+)
 
 
 def _str_ops() -> list[QueryOperator]:
@@ -110,7 +112,7 @@ def _user_ref_ops() -> list[QueryOperator]:
     ]
 
 
-def _property_definition_to_field(p: models.PropertyDefinition) -> QueryableField:
+def _property_definition_to_field(p: PropertyDefinitionSnapshot) -> QueryableField:
     ft = p.field_type
     key = f"property_{p.id}"
     name = p.name
@@ -241,42 +243,51 @@ def _property_definition_to_field(p: models.PropertyDefinition) -> QueryableFiel
     )
 
 
-async def load_queryable_fields(
-    db: Any, entity: str
-) -> list[QueryableField]:
+@dataclass(frozen=True)
+class QueryableFieldSet:
+    fields: list[QueryableField]
+    version: str
+    generation: int = 0
+
+
+def _field_set(fields: list[QueryableField], generation: int = 0) -> QueryableFieldSet:
+    # Content hash, so every worker reports the same version for the same fields.
+    digest = hashlib.sha1("\n".join(sorted(map(repr, fields))).encode())
+    return QueryableFieldSet(fields, digest.hexdigest()[:16], generation)
+
+
+_STATIC_FIELD_SETS: dict[str, QueryableFieldSet] = {
+    TASK: _field_set(task_adapters.build_task_queryable_fields_static()),
+    PATIENT: _field_set(patient_adapters.build_patient_queryable_fields_static()),
+    USER: _field_set(user_adapters.build_user_queryable_fields_static()),
+}
+
+_PROPERTY_ENTITIES = {TASK: "TASK", PATIENT: "PATIENT"}
+
+_property_field_sets: dict[str, QueryableFieldSet] = {}
+
+
+async def load_queryable_field_set(entity: str) -> QueryableFieldSet:
     e = entity.strip()
-    if e == TASK:
-        base = task_adapters.build_task_queryable_fields_static()
-        prop_rows = (
-            await db.execute(
-                select(models.PropertyDefinition).where(
-                    models.PropertyDefinition.is_active.is_(True),
-                )
-            )
-        ).scalars().all()
-        extra = []
-        for p in prop_rows:
-            ents = (p.allowed_entities or "").split(",")
-            if "TASK" not in [x.strip() for x in ents if x.strip()]:
-                continue
-            extra.append(_property_definition_to_field(p))
-        return base + extra
-    if e == PATIENT:
-        base = patient_adapters.build_patient_queryable_fields_static()
-        prop_rows = (
-            await db.execute(
-                select(models.PropertyDefinition).where(
-                    models.PropertyDefinition.is_active.is_(True),
-                )
-            )
-        ).scalars().all()
-        extra = []
-        for p in prop_rows:
-            ents = (p.allowed_entities or "").split(",")
-            if "PATIENT" not in [x.strip() for x in ents if x.strip()]:
-                continue
-            extra.append(_property_definition_to_field(p))
-        return base + extra
-    if e == USER:
-        return user_adapters.build_user_queryable_fields_static()
-    return []
+    static = _STATIC_FIELD_SETS.get(e)
+    if static is None:
+        return _field_set([])
+    property_entity = _PROPERTY_ENTITIES.get(e)
+    if property_entity is None:
+        return static
+    definitions = await property_definition_cache.all()
+    generation = property_definition_cache.generation
+    cached = _property_field_sets.get(e)
+    if cached is None or cached.generation != generation:
+        extra = [
+            _property_definition_to_field(p)
+            for p in definitions.values()
+            if p.is_active and p.allows(property_entity)
+        ]
+        cached = _field_set(static.fields + extra, generation)
+        _property_field_sets[e] = cached
+    return cached
+
+
+async def load_queryable_fields(entity: str) -> list[QueryableField]:
+    return (await load_queryable_field_set(entity)).fields
@@ -1,32 +1,68 @@
 from typing import Any
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, exists, or_, select, union_all
 from sqlalchemy.orm import aliased
 
+from api.query.dedupe_select import dedupe_orm_select_by_root_id
+from config import QUERY_SEMI_JOINS
 from database import models
 
 
 def build_location_descendants_cte(
-    seed_ids: list[str],
+    seed_ids: list[str] | set[str],
     *,
     cte_name: str = "location_descendants",
 ) -> Any:
     if not seed_ids:
         raise ValueError("seed_ids must not be empty")
+    seed_ids = list(seed_ids)
     if len(seed_ids) == 1:
-        anchor = select(models.LocationNode.id).where(
-            models.LocationNode.id == seed_ids[0]
-        )
+        condition = models.location_closure.c.ancestor_id == seed_ids[0]
     else:
-        anchor = select(models.LocationNode.id).where(
-            models.LocationNode.id.in_(seed_ids)
+        condition = models.location_closure.c.ancestor_id.in_(seed_ids)
+    return (
+        select(models.location_closure.c.descendant_id.label("id"))
+        .where(condition)
+        .cte(name=cte_name)
+    )
+
+
+async def load_location_descendant_ids(
+    db: Any,
+    seed_ids: list[str] | set[str],
+) -> set[str]:
+    if not seed_ids:
+        return set()
+    result = await db.execute(
+        select(models.location_closure.c.descendant_id)
+        .where(models.location_closure.c.ancestor_id.in_(list(seed_ids)))
+        .distinct()
+    )
+    return {row[0] for row in result.all()}
+
+
+async def load_patient_location_ids(
+    db: Any,
+    patient_id: str,
+) -> set[str] | None:
+    patient = models.Patient
+    result = await db.execute(
+        union_all(
+            select(patient.clinic_id).where(patient.id == patient_id),
+            select(patient.position_id).where(patient.id == patient_id),
+            select(patient.assigned_location_id).where(patient.id == patient_id),
+            select(models.patient_locations.c.location_id).where(
+                models.patient_locations.c.patient_id == patient_id
+            ),
+            select(models.patient_teams.c.location_id).where(
+                models.patient_teams.c.patient_id == patient_id
+            ),
         )
-    filter_cte = anchor.cte(name=cte_name, recursive=True)
-    children = select(models.LocationNode.id).join(
-        filter_cte,
-        models.LocationNode.parent_id == filter_cte.c.id,
     )
-    return filter_cte.union_all(children)
+    rows = result.all()
+    if not rows:
+        return None
+    return {row[0] for row in rows if row[0] is not None}
 
 
 def apply_patient_subtree_filter_from_cte(
@@ -69,3 +105,36 @@ def apply_patient_subtree_filter_from_cte(
             )
         )
     )
+
+
+def patient_in_locations_clause(location_cte: Any) -> Any:
+    """Match patients placed in or assigned to a location of ``location_cte``.
+
+    The one-to-many location and team links are checked with ``EXISTS`` so the
+    patient select is never fanned out.
+    """
+    location_ids = select(location_cte.c.id)
+    patient_locations = models.patient_locations
+    patient_teams = models.patient_teams
+    return or_(
+        models.Patient.clinic_id.in_(location_ids),
+        models.Patient.position_id.in_(location_ids),
+        models.Patient.assigned_location_id.in_(location_ids),
+        exists().where(
+            patient_locations.c.patient_id == models.Patient.id,
+            patient_locations.c.location_id.in_(location_ids),
+        ),
+        exists().where(
+            patient_teams.c.patient_id == models.Patient.id,
+            patient_teams.c.location_id.in_(location_ids),
+        ),
+    )
+
+
+def scope_patients_to_locations(query: Select[Any], location_cte: Any) -> Select[Any]:
+    if QUERY_SEMI_JOINS:
+        return query.where(patient_in_locations_clause(location_cte))
+    return dedupe_orm_select_by_root_id(
+        apply_patient_subtree_filter_from_cte(query, location_cte),
+        models.Patient,
+    )
@@ -1,10 +1,42 @@
 from typing import Any
 
-from sqlalchemy import Select, and_, select
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    Select,
+    and_,
+    case,
+    cast,
+    exists,
+    func,
+    null,
+    select,
+)
 from sqlalchemy.orm import aliased
+from sqlalchemy.sql import ColumnElement
 
+from api.query.enums import QueryOperator
+from api.query.field_ops import apply_ops_to_column
+from api.query.inputs import QueryFilterValueInput
+from api.services.property_definitions import property_definition_cache
+from config import QUERY_SEMI_JOINS
 from database import models
 
+# Operators that also match entities without a stored value. They cannot be
+# answered from ``property_values`` rows alone, so they go through the pivot.
+NULL_MATCHING_OPERATORS = frozenset(
+    {
+        QueryOperator.IS_NULL,
+        QueryOperator.IS_EMPTY,
+        QueryOperator.NOT_BETWEEN,
+        QueryOperator.NOT_CONTAINS,
+    }
+)
+
+MULTI_SELECT_OPERATORS = frozenset(
+    {QueryOperator.ANY_IN, QueryOperator.ALL_IN, QueryOperator.NONE_IN}
+)
+
 
 def property_value_column_for_field_type(field_type: str) -> str:
     mapping = {
@@ -32,30 +64,185 @@ def join_property_value(
         property_alias, property_value_column_for_field_type(field_type)
     )
 
+    join_condition = and_(
+        _owner_column(property_alias, entity) == root_model.id,
+        property_alias.definition_id == property_definition_id,
+    )
+
+    query = query.outerjoin(property_alias, join_condition)
+    return query, property_alias, value_column
+
+
+def _owner_column(property_alias: Any, entity: str) -> Any:
     if entity == "patient":
-        join_condition = and_(
-            property_alias.patient_id == root_model.id,
-            property_alias.definition_id == property_definition_id,
+        return property_alias.patient_id
+    return property_alias.task_id
+
+
+def build_property_pivot(entity: str, property_field_types: dict[str, str]) -> Any:
+    """One row per entity with a column per property definition."""
+    pv = aliased(models.PropertyValue)
+    owner = _owner_column(pv, entity)
+    columns: list[Any] = [owner.label("entity_id")]
+    for definition_id, field_type in sorted(property_field_types.items()):
+        value = getattr(pv, property_value_column_for_field_type(field_type))
+        if field_type == "FIELD_TYPE_CHECKBOX":
+            value = cast(value, Integer)
+        picked = func.max(case((pv.definition_id == definition_id, value), else_=None))
+        if field_type == "FIELD_TYPE_CHECKBOX":
+            picked = cast(picked, Boolean)
+        columns.append(picked.label(definition_id))
+    return (
+        select(*columns)
+        .where(
+            pv.definition_id.in_(sorted(property_field_types)),
+            owner.isnot(None),
         )
-    else:
-        join_condition = and_(
-            property_alias.task_id == root_model.id,
-            property_alias.definition_id == property_definition_id,
+        .group_by(owner)
+        .subquery()
+    )
+
+
+def property_value_column(
+    query: Select[Any],
+    root_model: type,
+    property_definition_id: str,
+    field_type: str,
+    entity: str,
+    ctx: dict[str, Any],
+    property_field_types: dict[str, str],
+) -> tuple[Select[Any], Any]:
+    """Value column of a property for sorting or null-matching filters.
+
+    All properties used by a query share a single join on the pivot instead of
+    one outer join on ``property_values`` per property.
+    """
+    if not QUERY_SEMI_JOINS:
+        query, _pa, col = join_property_value(
+            query, root_model, property_definition_id, field_type, entity
+        )
+        return query, col
+    pivot = ctx.get("property_pivot")
+    if pivot is None:
+        pivot = build_property_pivot(
+            entity, {**property_field_types, property_definition_id: field_type}
         )
+        query = query.outerjoin(pivot, pivot.c.entity_id == root_model.id)
+        ctx["property_pivot"] = pivot
+    if property_definition_id not in pivot.c:
+        return query, null()
+    return query, pivot.c[property_definition_id]
 
-    query = query.outerjoin(property_alias, join_condition)
-    return query, property_alias, value_column
 
+def property_value_condition(
+    column: Any,
+    field_type: str,
+    operator: QueryOperator,
+    value: QueryFilterValueInput | None,
+) -> ColumnElement[bool] | None:
+    if field_type == "FIELD_TYPE_DATE":
+        return apply_ops_to_column(column, operator, value, as_date=True)
+    if field_type == "FIELD_TYPE_DATE_TIME":
+        return apply_ops_to_column(column, operator, value, as_datetime=True)
+    if (
+        field_type == "FIELD_TYPE_CHECKBOX"
+        and operator == QueryOperator.EQ
+        and value
+        and value.bool_value is not None
+    ):
+        return column == value.bool_value
+    return apply_ops_to_column(column, operator, value)
 
-async def load_property_field_types(
-    db: Any, definition_ids: set[str]
-) -> dict[str, str]:
-    if not definition_ids:
-        return {}
-    result = await db.execute(
-        select(models.PropertyDefinition).where(
-            models.PropertyDefinition.id.in_(definition_ids)
+
+def multi_select_option_match(
+    root_model: type,
+    property_definition_id: str,
+    entity: str,
+    operator: QueryOperator,
+    value: QueryFilterValueInput | None,
+) -> ColumnElement[bool] | None:
+    if value is None or not value.string_values:
+        return None
+    tags = list(dict.fromkeys(value.string_values))
+    pv = aliased(models.PropertyValue)
+    options = models.property_value_options
+    owner = _owner_column(pv, entity)
+    owners = select(owner).where(
+        pv.definition_id == property_definition_id, owner.isnot(None)
+    )
+    if operator == QueryOperator.NONE_IN:
+        return root_model.id.in_(
+            owners.where(
+                pv.multi_select_values.isnot(None),
+                ~exists().where(
+                    options.c.property_value_id == pv.id,
+                    options.c.option.in_(tags),
+                ),
+            )
         )
+    owners = owners.join(options, options.c.property_value_id == pv.id).where(
+        options.c.option.in_(tags)
     )
-    rows = result.scalars().all()
-    return {str(p.id): p.field_type for p in rows}
+    if operator == QueryOperator.ALL_IN:
+        owners = owners.group_by(owner).having(
+            func.count(options.c.option.distinct()) == len(tags)
+        )
+    return root_model.id.in_(owners)
+
+
+def apply_property_filter(
+    query: Select[Any],
+    root_model: type,
+    property_definition_id: str,
+    field_type: str,
+    entity: str,
+    operator: QueryOperator,
+    value: QueryFilterValueInput | None,
+    ctx: dict[str, Any],
+    property_field_types: dict[str, str],
+) -> Select[Any]:
+    if not QUERY_SEMI_JOINS:
+        query, _pa, col = join_property_value(
+            query, root_model, property_definition_id, field_type, entity
+        )
+        ctx["needs_distinct"] = True
+        cond = property_value_condition(col, field_type, operator, value)
+    elif field_type == "FIELD_TYPE_MULTI_SELECT" and operator in MULTI_SELECT_OPERATORS:
+        cond = multi_select_option_match(
+            root_model, property_definition_id, entity, operator, value
+        )
+    elif operator in NULL_MATCHING_OPERATORS:
+        query, col = property_value_column(
+            query,
+            root_model,
+            property_definition_id,
+            field_type,
+            entity,
+            ctx,
+            property_field_types,
+        )
+        cond = property_value_condition(col, field_type, operator, value)
+    else:
+        pv = aliased(models.PropertyValue)
+        col = getattr(pv, property_value_column_for_field_type(field_type))
+        cond = property_value_condition(col, field_type, operator, value)
+        if cond is not None:
+            cond = root_model.id.in_(
+                select(_owner_column(pv, entity)).where(
+                    pv.definition_id == property_definition_id, cond
+                )
+            )
+    if cond is not None:
+        query = query.where(cond)
+    return query
+
+
+async def load_property_field_types(definition_ids: set[str]) -> dict[str, str]:
+    if not definition_ids:
+        return {}
+    definitions = await property_definition_cache.all()
+    return {
+        definition_id: definitions[definition_id].field_type
+        for definition_id in definition_ids
+        if definition_id in definitions
+    }
@@ -1,6 +1,8 @@
 from typing import Any
 
-from sqlalchemy import String, and_, case, cast, func
+from sqlalchemy import Float, String, and_, case, cast, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 
 def user_display_label_expr(user_table: Any) -> Any:
@@ -31,3 +33,20 @@ def patient_display_name_expr(patient_table: Any) -> Any:
 
 def location_title_expr(location_table: Any) -> Any:
     return cast(location_table.title, String)
+
+
+class text_similarity(FunctionElement):
+    """pg_trgm ``similarity(document, text)``; constant on other dialects."""
+
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(text_similarity)
+def _compile_text_similarity(element: Any, compiler: Any, **kw: Any) -> str:
+    return "0.0"
+
+
+@compiles(text_similarity, "postgresql")
+def _compile_text_similarity_pg(element: Any, compiler: Any, **kw: Any) -> str:
+    return f"similarity({compiler.process(element.clauses, **kw)})"
@@ -7,6 +7,7 @@ import strawberry
 from api.context import Info
 from api.services.base import BaseRepository
 from api.services.notifications import (
+    load_notification_scope,
     notify_entity_created,
     notify_entity_deleted,
     notify_entity_update,
@@ -78,11 +79,21 @@ class BaseMutationResolver(Generic[ModelType]):
         related_entity_type: str | None = None,
         related_entity_id: str | None = None,
     ) -> None:
-        repo = BaseRepository(info.context.db, model)
+        db = info.context.db
+        repo = BaseRepository(db, model)
         entity_id = entity.id
+        patient_id, location_ids = await load_notification_scope(
+            db, entity_name, entity_id
+        )
         await repo.delete(entity)
         await notify_entity_deleted(
-            entity_name, entity_id, related_entity_type, related_entity_id
+            entity_name,
+            entity_id,
+            related_entity_type,
+            related_entity_id,
+            location_ids=location_ids,
+            patient_id=patient_id,
+            db=db,
         )
 
     @staticmethod
@@ -96,9 +107,11 @@ class BaseMutationResolver(Generic[ModelType]):
     ) -> ModelType:
         repo = BaseRepository(info.context.db, model)
         await repo.create(entity)
-        await notify_entity_created(entity_name, entity.id)
+        await notify_entity_created(entity_name, entity.id, db=info.context.db)
         if related_entity_type and related_entity_id:
-            await notify_entity_update(related_entity_type, related_entity_id)
+            await notify_entity_update(
+                related_entity_type, related_entity_id, db=info.context.db
+            )
         return entity
 
     @staticmethod
@@ -113,7 +126,11 @@ class BaseMutationResolver(Generic[ModelType]):
         repo = BaseRepository(info.context.db, model)
         await repo.update(entity)
         await notify_entity_update(
-            entity_name, entity.id, related_entity_type, related_entity_id
+            entity_name,
+            entity.id,
+            related_entity_type,
+            related_entity_id,
+            db=info.context.db,
         )
         return entity
 
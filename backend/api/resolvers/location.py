@@ -2,12 +2,14 @@ from collections.abc import AsyncGenerator
 
 import strawberry
 from api.audit import audit_log
-from api.context import Info
+from api.context import Info, read_only_resolver
 from api.decorators.pagination import apply_pagination
 from api.errors import raise_forbidden
 from api.inputs import CreateLocationNodeInput, LocationType, UpdateLocationNodeInput
+from api.query.patient_location_scope import load_location_descendant_ids
 from api.resolvers.base import BaseMutationResolver, BaseSubscriptionResolver
 from api.services.authorization import AuthorizationService
+from api.services.patient_counts import PatientCountService
 from api.types.location import LocationNodeType
 from database import models
 from graphql import GraphQLError
@@ -17,6 +19,7 @@ from sqlalchemy import select
 @strawberry.type
 class LocationQuery:
     @strawberry.field
+    @read_only_resolver
     async def location_roots(self, info: Info) -> list[LocationNodeType]:
         auth_service = AuthorizationService(info.context.db)
         accessible_location_ids = await auth_service.get_user_accessible_location_ids(
@@ -58,6 +61,7 @@ class LocationQuery:
         return location
 
     @strawberry.field
+    @read_only_resolver
     async def location_nodes(
         self,
         info: Info,
@@ -83,18 +87,18 @@ class LocationQuery:
             if parent_id not in accessible_location_ids:
                 raise_forbidden()
 
-            cte = (
+            query = (
                 select(models.LocationNode)
-                .where(models.LocationNode.id == parent_id)
-                .cte(name="location_tree", recursive=True)
+                .join(
+                    models.location_closure,
+                    models.location_closure.c.descendant_id
+                    == models.LocationNode.id,
+                )
+                .where(
+                    models.location_closure.c.ancestor_id == parent_id,
+                    models.LocationNode.id.in_(accessible_location_ids),
+                )
             )
-
-            parent = select(models.LocationNode).join(
-                cte,
-                models.LocationNode.parent_id == cte.c.id,
-            )
-            cte = cte.union_all(parent)
-            query = select(cte).where(cte.c.id.in_(accessible_location_ids))
         else:
             query = select(models.LocationNode).where(
                 models.LocationNode.id.in_(accessible_location_ids)
@@ -185,12 +189,25 @@ class LocationMutation(BaseMutationResolver[models.LocationNode]):
         if data.parent_id is not None and data.parent_id not in accessible_location_ids:
             raise_forbidden()
 
+        if data.parent_id is not None and data.parent_id != location.parent_id:
+            subtree_ids = await load_location_descendant_ids(db, [location.id])
+            if data.parent_id in subtree_ids:
+                raise GraphQLError(
+                    "A location cannot be moved below itself or one of its descendants.",
+                    extensions={"code": "BAD_REQUEST"},
+                )
+
         if data.title is not None:
             location.title = data.title
         if data.kind is not None:
             location.kind = data.kind.value
+        previous_parent_id = location.parent_id
+        moved = data.parent_id is not None and data.parent_id != previous_parent_id
         if data.parent_id is not None:
             location.parent_id = data.parent_id
+        if moved:
+            await db.flush()
+            await PatientCountService(db).reconcile([previous_parent_id, location.parent_id])
 
         location = await BaseMutationResolver.update_and_notify(
             info, location, models.LocationNode, "location_node"
@@ -223,9 +240,14 @@ class LocationMutation(BaseMutationResolver[models.LocationNode]):
         if location.id not in accessible_location_ids:
             raise_forbidden()
 
+        parent_id = location.parent_id
         await BaseMutationResolver.delete_entity(
             info, location, models.LocationNode, "location_node"
         )
+        # Patients attached inside the subtree were detached by cascading
+        # deletes, which the counters of the remaining ancestors do not see.
+        await PatientCountService(db).reconcile([parent_id])
+        await db.commit()
         return True
 
 
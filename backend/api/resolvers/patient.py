@@ -3,9 +3,9 @@ from datetime import datetime
 
 import strawberry
 from api.audit import audit_log
-from api.context import Info
+from api.context import Info, read_only_resolver
 from api.inputs import CreatePatientInput, PatientState, UpdatePatientInput
-from api.inputs import PaginationInput
+from api.inputs import CountMode, PaginationInput
 from api.query.execute import count_unified_query, is_unset, unified_list_query
 from api.query.inputs import (
     QueryFilterClauseInput,
@@ -18,18 +18,20 @@ from api.services.authorization import AuthorizationService
 from api.services.checksum import validate_checksum
 from api.services.location import LocationService
 from api.services.notifications import notify_entity_deleted, notify_entity_update
+from api.services.patient_counts import PatientCountService
 from api.services.property import PropertyService
+from api.types.pagination import PaginatedPatientResult
 from api.types.patient import PatientType, ScopedPatientCountsType
 from api.errors import raise_forbidden
-from api.query.dedupe_select import dedupe_orm_select_by_root_id
 from api.query.patient_location_scope import (
-    apply_patient_subtree_filter_from_cte,
     build_location_descendants_cte,
+    scope_patients_to_locations,
 )
+from config import PATIENT_STATE_COUNTERS
 from database import models
 from graphql import GraphQLError
 from sqlalchemy import func, select
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import Select
 
 
@@ -90,10 +92,7 @@ class PatientQuery:
             )
 
         if filter_cte is not None:
-            query = dedupe_orm_select_by_root_id(
-                apply_patient_subtree_filter_from_cte(query, filter_cte),
-                models.Patient,
-            )
+            query = scope_patients_to_locations(query, filter_cte)
 
         return query, accessible_location_ids
 
@@ -123,6 +122,7 @@ class PatientQuery:
         return patient
 
     @strawberry.field
+    @read_only_resolver
     @unified_list_query(PATIENT)
     async def patients(
         self,
@@ -141,6 +141,7 @@ class PatientQuery:
         return query
 
     @strawberry.field
+    @read_only_resolver
     async def patientsTotal(
         self,
         info: Info,
@@ -166,11 +167,51 @@ class PatientQuery:
         )
 
     @strawberry.field
+    @read_only_resolver
+    async def patients_page(
+        self,
+        info: Info,
+        location_node_id: strawberry.ID | None = None,
+        root_location_ids: list[strawberry.ID] | None = None,
+        states: list[PatientState] | None = None,
+        filters: list[QueryFilterClauseInput] | None = None,
+        sorts: list[QuerySortClauseInput] | None = None,
+        pagination: PaginationInput | None = None,
+        search: QuerySearchInput | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> PaginatedPatientResult:
+        page = await PatientQuery.patients.fetch_page(
+            self,
+            info,
+            location_node_id=location_node_id,
+            root_location_ids=root_location_ids,
+            states=states,
+            filters=filters,
+            sorts=sorts,
+            pagination=pagination,
+            search=search,
+            count_mode=count_mode,
+        )
+        return PaginatedPatientResult(
+            items=page.items,
+            total_count=page.total_count,
+            total_is_exact=page.total_is_exact,
+        )
+
+    @strawberry.field
+    @read_only_resolver
     async def scoped_patient_counts(
         self,
         info: Info,
         root_location_ids: list[strawberry.ID] | None = None,
     ) -> ScopedPatientCountsType:
+        if PATIENT_STATE_COUNTERS:
+            counts_by_state = await PatientQuery._scoped_counts_from_counters(
+                info, root_location_ids
+            )
+            if counts_by_state is not None:
+                return ScopedPatientCountsType.from_counts(counts_by_state)
+
         all_states = list(PatientState)
         query, accessible_location_ids = await PatientQuery._build_patients_base_query(
             info, None, root_location_ids, all_states
@@ -197,17 +238,37 @@ class PatientQuery:
         result = await info.context.db.execute(count_query)
         counts_by_state = {row[0]: row[1] for row in result.all()}
 
-        return ScopedPatientCountsType(
-            scoped_patients_total=sum(counts_by_state.values()),
-            scoped_patients_waiting=counts_by_state.get(PatientState.WAIT.value, 0),
-            scoped_patients_admitted=counts_by_state.get(PatientState.ADMITTED.value, 0),
-            scoped_patients_discharged=counts_by_state.get(
-                PatientState.DISCHARGED.value, 0
-            ),
-            scoped_patients_deceased=counts_by_state.get(PatientState.DEAD.value, 0),
+        return ScopedPatientCountsType.from_counts(counts_by_state)
+
+    @staticmethod
+    async def _scoped_counts_from_counters(
+        info: Info,
+        root_location_ids: list[strawberry.ID] | None,
+    ) -> dict[str, int] | None:
+        db = info.context.db
+        auth_service = AuthorizationService(db)
+        accessible_location_ids = await auth_service.get_user_accessible_location_ids(
+            info.context.user, info.context
         )
+        if not accessible_location_ids:
+            return {}
+        if root_location_ids:
+            roots = [
+                str(lid) for lid in root_location_ids if lid in accessible_location_ids
+            ]
+            if not roots:
+                return {}
+        else:
+            result = await db.execute(
+                select(models.user_root_locations.c.location_id).where(
+                    models.user_root_locations.c.user_id == info.context.user.id
+                )
+            )
+            roots = [row[0] for row in result.all()]
+        return await PatientCountService(db).scoped_counts(roots)
 
     @strawberry.field
+    @read_only_resolver
     @unified_list_query(PATIENT)
     async def recent_patients(
         self,
@@ -228,15 +289,6 @@ class PatientQuery:
         if not accessible_location_ids:
             return []
 
-        max_task_update_date = (
-            select(
-                func.max(models.Task.update_date).label("max_update_date"),
-                models.Task.patient_id.label("patient_id"),
-            )
-            .group_by(models.Task.patient_id)
-            .subquery()
-        )
-
         query = (
             select(models.Patient)
             .options(
@@ -244,10 +296,6 @@ class PatientQuery:
                 selectinload(models.Patient.tasks),
                 selectinload(models.Patient.teams),
             )
-            .outerjoin(
-                max_task_update_date,
-                models.Patient.id == max_task_update_date.c.patient_id,
-            )
             .where(models.Patient.deleted.is_(False))
         )
         query = auth_service.filter_patients_by_access(
@@ -257,45 +305,15 @@ class PatientQuery:
         if root_location_ids:
             valid_root_ids = [lid for lid in root_location_ids if lid in accessible_location_ids]
             if valid_root_ids:
-                root_cte = (
-                    select(models.LocationNode.id)
-                    .where(models.LocationNode.id.in_(valid_root_ids))
-                    .cte(name="recent_root_descendants", recursive=True)
-                )
-                root_children = select(models.LocationNode.id).join(
-                    root_cte, models.LocationNode.parent_id == root_cte.c.id
-                )
-                root_cte = root_cte.union_all(root_children)
-                patient_locations_root = aliased(models.patient_locations)
-                patient_teams_root = aliased(models.patient_teams)
-                query = dedupe_orm_select_by_root_id(
-                    query.outerjoin(
-                        patient_locations_root,
-                        models.Patient.id == patient_locations_root.c.patient_id,
-                    )
-                    .outerjoin(
-                        patient_teams_root,
-                        models.Patient.id == patient_teams_root.c.patient_id,
-                    )
-                    .where(
-                        (models.Patient.clinic_id.in_(select(root_cte.c.id)))
-                        | (
-                            models.Patient.position_id.isnot(None)
-                            & models.Patient.position_id.in_(select(root_cte.c.id))
-                        )
-                        | (
-                            models.Patient.assigned_location_id.isnot(None)
-                            & models.Patient.assigned_location_id.in_(select(root_cte.c.id))
-                        )
-                        | (patient_locations_root.c.location_id.in_(select(root_cte.c.id)))
-                        | (patient_teams_root.c.location_id.in_(select(root_cte.c.id)))
-                    ),
-                    models.Patient,
+                root_cte = build_location_descendants_cte(
+                    valid_root_ids, cte_name="recent_root_descendants"
                 )
+                query = scope_patients_to_locations(query, root_cte)
 
         return query
 
     @strawberry.field
+    @read_only_resolver
     async def recentPatientsTotal(
         self,
         info: Info,
@@ -314,21 +332,8 @@ class PatientQuery:
         if not accessible_location_ids:
             return 0
 
-        max_task_update_date = (
-            select(
-                func.max(models.Task.update_date).label("max_update_date"),
-                models.Task.patient_id.label("patient_id"),
-            )
-            .group_by(models.Task.patient_id)
-            .subquery()
-        )
-
         query = (
             select(models.Patient)
-            .outerjoin(
-                max_task_update_date,
-                models.Patient.id == max_task_update_date.c.patient_id,
-            )
             .where(models.Patient.deleted.is_(False))
         )
         query = auth_service.filter_patients_by_access(
@@ -338,41 +343,10 @@ class PatientQuery:
         if root_location_ids:
             valid_root_ids = [lid for lid in root_location_ids if lid in accessible_location_ids]
             if valid_root_ids:
-                root_cte = (
-                    select(models.LocationNode.id)
-                    .where(models.LocationNode.id.in_(valid_root_ids))
-                    .cte(name="recent_patients_total_root", recursive=True)
-                )
-                root_children = select(models.LocationNode.id).join(
-                    root_cte, models.LocationNode.parent_id == root_cte.c.id
-                )
-                root_cte = root_cte.union_all(root_children)
-                patient_locations_root = aliased(models.patient_locations)
-                patient_teams_root = aliased(models.patient_teams)
-                query = dedupe_orm_select_by_root_id(
-                    query.outerjoin(
-                        patient_locations_root,
-                        models.Patient.id == patient_locations_root.c.patient_id,
-                    )
-                    .outerjoin(
-                        patient_teams_root,
-                        models.Patient.id == patient_teams_root.c.patient_id,
-                    )
-                    .where(
-                        (models.Patient.clinic_id.in_(select(root_cte.c.id)))
-                        | (
-                            models.Patient.position_id.isnot(None)
-                            & models.Patient.position_id.in_(select(root_cte.c.id))
-                        )
-                        | (
-                            models.Patient.assigned_location_id.isnot(None)
-                            & models.Patient.assigned_location_id.in_(select(root_cte.c.id))
-                        )
-                        | (patient_locations_root.c.location_id.in_(select(root_cte.c.id)))
-                        | (patient_teams_root.c.location_id.in_(select(root_cte.c.id)))
-                    ),
-                    models.Patient,
+                root_cte = build_location_descendants_cte(
+                    valid_root_ids, cte_name="recent_patients_total_root"
                 )
+                query = scope_patients_to_locations(query, root_cte)
 
         return await count_unified_query(
             query,
@@ -384,6 +358,34 @@ class PatientQuery:
             info=info,
         )
 
+    @strawberry.field
+    @read_only_resolver
+    async def recent_patients_page(
+        self,
+        info: Info,
+        root_location_ids: list[strawberry.ID] | None = None,
+        filters: list[QueryFilterClauseInput] | None = None,
+        sorts: list[QuerySortClauseInput] | None = None,
+        pagination: PaginationInput | None = None,
+        search: QuerySearchInput | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> PaginatedPatientResult:
+        page = await PatientQuery.recent_patients.fetch_page(
+            self,
+            info,
+            root_location_ids=root_location_ids,
+            filters=filters,
+            sorts=sorts,
+            pagination=pagination,
+            search=search,
+            count_mode=count_mode,
+        )
+        return PaginatedPatientResult(
+            items=page.items,
+            total_count=page.total_count,
+            total_is_exact=page.total_is_exact,
+        )
+
 
 @strawberry.type
 class PatientMutation(BaseMutationResolver[models.Patient]):
@@ -441,7 +443,7 @@ class PatientMutation(BaseMutationResolver[models.Patient]):
         await db.commit()
 
         for patient in patients:
-            await notify_entity_update("patient", patient.id)
+            await notify_entity_update("patient", patient.id, db=db)
 
         return int(delete_result.rowcount or 0)
 
@@ -534,6 +536,8 @@ class PatientMutation(BaseMutationResolver[models.Patient]):
         if new_patient.position_id is not None:
             new_patient.position_updated_at = now
 
+        db.add(new_patient)
+        await PatientCountService(db).record_change(new_patient, None)
         repo = BaseMutationResolver.get_repository(db, models.Patient)
         await repo.create(new_patient)
         await db.refresh(new_patient, ["assigned_locations", "teams"])
@@ -572,6 +576,9 @@ class PatientMutation(BaseMutationResolver[models.Patient]):
         if data.checksum:
             validate_checksum(patient, data.checksum, "Patient")
 
+        patient_counts = PatientCountService(db)
+        counted_before = await patient_counts.snapshot(patient.id)
+
         if data.firstname is not None:
             patient.firstname = data.firstname
         if data.lastname is not None:
@@ -651,6 +658,7 @@ class PatientMutation(BaseMutationResolver[models.Patient]):
 
         patient.updated_at = datetime.now()
 
+        await patient_counts.record_change(patient, counted_before)
         await BaseMutationResolver.update_and_notify(
             info, patient, models.Patient, "patient"
         )
@@ -680,11 +688,14 @@ class PatientMutation(BaseMutationResolver[models.Patient]):
         ):
             raise_forbidden()
 
+        patient_counts = PatientCountService(db)
+        counted_before = await patient_counts.snapshot(patient.id)
         patient.deleted = True
+        await patient_counts.record_change(patient, counted_before)
         await BaseMutationResolver.update_and_notify(
             info, patient, models.Patient, "patient"
         )
-        await notify_entity_deleted("patient", patient.id)
+        await notify_entity_deleted("patient", patient.id, db=db)
         return True
 
     @staticmethod
@@ -713,16 +724,19 @@ class PatientMutation(BaseMutationResolver[models.Patient]):
         ):
             raise_forbidden()
 
+        patient_counts = PatientCountService(db)
+        counted_before = await patient_counts.snapshot(patient.id)
         now = datetime.now()
         if patient.state != state.value:
             patient.state_updated_at = now
         patient.state = state.value
         patient.updated_at = now
+        await patient_counts.record_change(patient, counted_before)
         await BaseMutationResolver.update_and_notify(
             info, patient, models.Patient, "patient"
         )
         await db.refresh(patient, ["assigned_locations"])
-        await notify_entity_update("patient_state_changed", patient.id)
+        await notify_entity_update("patient_state_changed", patient.id, db=db)
         return patient
 
     @strawberry.mutation
@@ -5,9 +5,9 @@ from api.inputs import (
     UpdatePropertyDefinitionInput,
 )
 from api.resolvers.base import BaseMutationResolver
+from api.services.property_definitions import property_definition_cache
 from api.types.property import PropertyDefinitionType
 from database import models
-from sqlalchemy import select
 
 
 @strawberry.type
@@ -17,10 +17,8 @@ class PropertyDefinitionQuery:
         self,
         info: Info,
     ) -> list[PropertyDefinitionType]:
-        result = await info.context.db.execute(
-            select(models.PropertyDefinition),
-        )
-        return result.scalars().all()
+        definitions = await property_definition_cache.all()
+        return list(definitions.values())
 
 
 @strawberry.type
@@ -46,9 +44,11 @@ class PropertyDefinitionMutation(
             is_active=data.is_active,
             allowed_entities=entities_str,
         )
-        return await BaseMutationResolver.create_and_notify(
+        defn = await BaseMutationResolver.create_and_notify(
             info, defn, models.PropertyDefinition, "property_definition"
         )
+        await property_definition_cache.invalidate()
+        return defn
 
     @strawberry.mutation
     async def update_property_definition(
@@ -76,9 +76,11 @@ class PropertyDefinitionMutation(
                 [e.value for e in data.allowed_entities],
             )
 
-        return await BaseMutationResolver.update_and_notify(
+        defn = await BaseMutationResolver.update_and_notify(
             info, defn, models.PropertyDefinition, "property_definition"
         )
+        await property_definition_cache.invalidate()
+        return defn
 
     @strawberry.mutation
     async def delete_property_definition(
@@ -95,4 +97,5 @@ class PropertyDefinitionMutation(
         await BaseMutationResolver.delete_entity(
             info, defn, models.PropertyDefinition, "property_definition"
         )
+        await property_definition_cache.invalidate()
         return True
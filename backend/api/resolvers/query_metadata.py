@@ -2,7 +2,10 @@ import strawberry
 
 from api.context import Info
 from api.query.graphql_types import QueryableField
-from api.query.metadata_service import load_queryable_fields
+from api.query.metadata_service import (
+    load_queryable_field_set,
+    load_queryable_fields,
+)
 
 
 @strawberry.type
@@ -11,4 +14,9 @@ class QueryMetadataQuery:
     async def queryable_fields(
         self, info: Info, entity: str
     ) -> list[QueryableField]:
-        return await load_queryable_fields(info.context.db, entity)
+        return await load_queryable_fields(entity)
+
+    @strawberry.field
+    async def queryable_fields_version(self, info: Info, entity: str) -> str:
+        field_set = await load_queryable_field_set(entity)
+        return field_set.version
@@ -3,10 +3,11 @@ from typing import Any
 
 import strawberry
 from api.audit import audit_log
-from api.context import Info
+from api.context import Info, read_only_resolver
 from api.errors import raise_forbidden
 from api.inputs import (
     ApplyTaskGraphInput,
+    CountMode,
     CreateTaskInput,
     PaginationInput,
     PatientState,
@@ -19,6 +20,10 @@ from api.query.inputs import (
     QuerySearchInput,
     QuerySortClauseInput,
 )
+from api.query.patient_location_scope import (
+    build_location_descendants_cte,
+    patient_in_locations_clause,
+)
 from api.query.registry import TASK
 from api.resolvers.base import BaseMutationResolver, BaseSubscriptionResolver
 from api.services.authorization import AuthorizationService
@@ -33,7 +38,9 @@ from api.services.task_graph import (
     replace_incoming_task_dependencies,
     validate_task_graph_dict,
 )
+from api.types.pagination import PaginatedTaskResult
 from api.types.task import TaskType
+from config import QUERY_SEMI_JOINS
 from database import models
 from database.models.task_preset import TaskPresetScope as DbTaskPresetScope
 from graphql import GraphQLError
@@ -70,6 +77,41 @@ def _patient_visibility_clause(location_cte, patient_locations, patient_teams):
     )
 
 
+def _scope_tasks_to_locations(query, location_cte, no_patient_scope_clause):
+    query = query.outerjoin(
+        models.Patient, models.Task.patient_id == models.Patient.id
+    )
+    if QUERY_SEMI_JOINS:
+        visibility = patient_in_locations_clause(location_cte)
+    else:
+        patient_locations = aliased(models.patient_locations)
+        patient_teams = aliased(models.patient_teams)
+        query = query.outerjoin(
+            patient_locations,
+            models.Patient.id == patient_locations.c.patient_id,
+        ).outerjoin(
+            patient_teams,
+            models.Patient.id == patient_teams.c.patient_id,
+        )
+        visibility = _patient_visibility_clause(
+            location_cte, patient_locations, patient_teams
+        )
+    query = query.where(
+        and_(
+            models.Task.patient_id.isnot(None),
+            visibility,
+            models.Patient.state.notin_(
+                [PatientState.DISCHARGED.value, PatientState.DEAD.value]
+            ),
+        )
+        | and_(
+            models.Task.patient_id.is_(None),
+            no_patient_scope_clause,
+        )
+    )
+    return query if QUERY_SEMI_JOINS else query.distinct()
+
+
 @strawberry.type
 class TaskQuery:
     @strawberry.field
@@ -96,6 +138,7 @@ class TaskQuery:
         return task
 
     @strawberry.field
+    @read_only_resolver
     @unified_list_query(TASK)
     async def tasks(
         self,
@@ -156,20 +199,9 @@ class TaskQuery:
         if not accessible_location_ids:
             return []
 
-        patient_locations = aliased(models.patient_locations)
-        patient_teams = aliased(models.patient_teams)
-
-        cte = (
-            select(models.LocationNode.id)
-            .where(models.LocationNode.id.in_(accessible_location_ids))
-            .cte(name="accessible_locations", recursive=True)
-        )
-
-        children = select(models.LocationNode.id).join(
-            cte,
-            models.LocationNode.parent_id == cte.c.id,
+        cte = build_location_descendants_cte(
+            accessible_location_ids, cte_name="accessible_locations"
         )
-        cte = cte.union_all(children)
 
         if root_location_ids:
             invalid_ids = [
@@ -179,16 +211,9 @@ class TaskQuery:
             ]
             if invalid_ids:
                 raise_forbidden()
-            root_cte = (
-                select(models.LocationNode.id)
-                .where(models.LocationNode.id.in_(root_location_ids))
-                .cte(name="root_location_descendants", recursive=True)
+            root_cte = build_location_descendants_cte(
+                root_location_ids, cte_name="root_location_descendants"
             )
-            root_children = select(models.LocationNode.id).join(
-                root_cte,
-                models.LocationNode.parent_id == root_cte.c.id,
-            )
-            root_cte = root_cte.union_all(root_children)
         else:
             root_cte = cte
 
@@ -196,16 +221,9 @@ class TaskQuery:
         if assignee_team_id:
             if assignee_team_id not in accessible_location_ids:
                 raise_forbidden()
-            team_location_cte = (
-                select(models.LocationNode.id)
-                .where(models.LocationNode.id == assignee_team_id)
-                .cte(name="team_location_descendants", recursive=True)
-            )
-            team_children = select(models.LocationNode.id).join(
-                team_location_cte,
-                models.LocationNode.parent_id == team_location_cte.c.id,
+            team_location_cte = build_location_descendants_cte(
+                [assignee_team_id], cte_name="team_location_descendants"
             )
-            team_location_cte = team_location_cte.union_all(team_children)
 
         viewer_assignee_clause = _assignee_match_clause(
             info.context.user.id if info.context.user else None
@@ -217,39 +235,15 @@ class TaskQuery:
                 no_patient_scope_clause,
             )
 
-        query = (
-            select(models.Task)
-            .options(
+        query = _scope_tasks_to_locations(
+            select(models.Task).options(
                 selectinload(models.Task.patient).selectinload(
                     models.Patient.assigned_locations,
                 ),
                 selectinload(models.Task.assignees),
-            )
-            .outerjoin(models.Patient, models.Task.patient_id == models.Patient.id)
-            .outerjoin(
-                patient_locations,
-                models.Patient.id == patient_locations.c.patient_id,
-            )
-            .outerjoin(
-                patient_teams,
-                models.Patient.id == patient_teams.c.patient_id,
-            )
-            .where(
-                (
-                    and_(
-                        models.Task.patient_id.isnot(None),
-                        _patient_visibility_clause(root_cte, patient_locations, patient_teams),
-                        models.Patient.state.notin_(
-                            [PatientState.DISCHARGED.value, PatientState.DEAD.value]
-                        ),
-                    )
-                )
-                | and_(
-                    models.Task.patient_id.is_(None),
-                    no_patient_scope_clause,
-                )
-            )
-            .distinct()
+            ),
+            root_cte,
+            no_patient_scope_clause,
         )
 
         if assignee_id:
@@ -271,6 +265,7 @@ class TaskQuery:
         return query
 
     @strawberry.field
+    @read_only_resolver
     async def tasksTotal(
         self,
         info: Info,
@@ -320,20 +315,9 @@ class TaskQuery:
             if not accessible_location_ids:
                 return 0
 
-            patient_locations = aliased(models.patient_locations)
-            patient_teams = aliased(models.patient_teams)
-
-            cte = (
-                select(models.LocationNode.id)
-                .where(models.LocationNode.id.in_(accessible_location_ids))
-                .cte(name="accessible_locations", recursive=True)
-            )
-
-            children = select(models.LocationNode.id).join(
-                cte,
-                models.LocationNode.parent_id == cte.c.id,
+            cte = build_location_descendants_cte(
+                accessible_location_ids, cte_name="accessible_locations"
             )
-            cte = cte.union_all(children)
 
             if root_location_ids:
                 invalid_ids = [
@@ -343,16 +327,9 @@ class TaskQuery:
                 ]
                 if invalid_ids:
                     raise_forbidden()
-                root_cte = (
-                    select(models.LocationNode.id)
-                    .where(models.LocationNode.id.in_(root_location_ids))
-                    .cte(name="root_location_descendants", recursive=True)
+                root_cte = build_location_descendants_cte(
+                    root_location_ids, cte_name="root_location_descendants"
                 )
-                root_children = select(models.LocationNode.id).join(
-                    root_cte,
-                    models.LocationNode.parent_id == root_cte.c.id,
-                )
-                root_cte = root_cte.union_all(root_children)
             else:
                 root_cte = cte
 
@@ -360,16 +337,9 @@ class TaskQuery:
             if assignee_team_id:
                 if assignee_team_id not in accessible_location_ids:
                     raise_forbidden()
-                team_location_cte = (
-                    select(models.LocationNode.id)
-                    .where(models.LocationNode.id == assignee_team_id)
-                    .cte(name="team_location_descendants", recursive=True)
-                )
-                team_children = select(models.LocationNode.id).join(
-                    team_location_cte,
-                    models.LocationNode.parent_id == team_location_cte.c.id,
+                team_location_cte = build_location_descendants_cte(
+                    [assignee_team_id], cte_name="team_location_descendants"
                 )
-                team_location_cte = team_location_cte.union_all(team_children)
 
             viewer_assignee_clause = _assignee_match_clause(
                 info.context.user.id if info.context.user else None
@@ -381,40 +351,10 @@ class TaskQuery:
                     no_patient_scope_clause,
                 )
 
-            query = (
-                select(models.Task)
-                .outerjoin(
-                    models.Patient,
-                    models.Task.patient_id == models.Patient.id,
-                )
-                .outerjoin(
-                    patient_locations,
-                    models.Patient.id == patient_locations.c.patient_id,
-                )
-                .outerjoin(
-                    patient_teams,
-                    models.Patient.id == patient_teams.c.patient_id,
-                )
-                .where(
-                    (
-                        and_(
-                            models.Task.patient_id.isnot(None),
-                            _patient_visibility_clause(
-                                root_cte,
-                                patient_locations,
-                                patient_teams,
-                            ),
-                            models.Patient.state.notin_(
-                                [PatientState.DISCHARGED.value, PatientState.DEAD.value]
-                            ),
-                        )
-                    )
-                    | and_(
-                        models.Task.patient_id.is_(None),
-                        no_patient_scope_clause,
-                    )
-                )
-                .distinct()
+            query = _scope_tasks_to_locations(
+                select(models.Task),
+                root_cte,
+                no_patient_scope_clause,
             )
 
             if assignee_id:
@@ -444,6 +384,41 @@ class TaskQuery:
         )
 
     @strawberry.field
+    @read_only_resolver
+    async def tasks_page(
+        self,
+        info: Info,
+        patient_id: strawberry.ID | None = None,
+        assignee_id: strawberry.ID | None = None,
+        assignee_team_id: strawberry.ID | None = None,
+        root_location_ids: list[strawberry.ID] | None = None,
+        filters: list[QueryFilterClauseInput] | None = None,
+        sorts: list[QuerySortClauseInput] | None = None,
+        pagination: PaginationInput | None = None,
+        search: QuerySearchInput | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> PaginatedTaskResult:
+        page = await TaskQuery.tasks.fetch_page(
+            self,
+            info,
+            patient_id=patient_id,
+            assignee_id=assignee_id,
+            assignee_team_id=assignee_team_id,
+            root_location_ids=root_location_ids,
+            filters=filters,
+            sorts=sorts,
+            pagination=pagination,
+            search=search,
+            count_mode=count_mode,
+        )
+        return PaginatedTaskResult(
+            items=page.items,
+            total_count=page.total_count,
+            total_is_exact=page.total_is_exact,
+        )
+
+    @strawberry.field
+    @read_only_resolver
     @unified_list_query(
         TASK,
         default_sorts_when_empty=[
@@ -473,21 +448,10 @@ class TaskQuery:
         if not accessible_location_ids:
             return []
 
-        patient_locations = aliased(models.patient_locations)
-        patient_teams = aliased(models.patient_teams)
-
-        cte = (
-            select(models.LocationNode.id)
-            .where(models.LocationNode.id.in_(accessible_location_ids))
-            .cte(name="accessible_locations", recursive=True)
+        cte = build_location_descendants_cte(
+            accessible_location_ids, cte_name="accessible_locations"
         )
 
-        children = select(models.LocationNode.id).join(
-            cte,
-            models.LocationNode.parent_id == cte.c.id,
-        )
-        cte = cte.union_all(children)
-
         if root_location_ids:
             invalid_ids = [
                 lid
@@ -496,16 +460,9 @@ class TaskQuery:
             ]
             if invalid_ids:
                 raise_forbidden()
-            root_cte = (
-                select(models.LocationNode.id)
-                .where(models.LocationNode.id.in_(root_location_ids))
-                .cte(name="recent_tasks_root_descendants", recursive=True)
+            root_cte = build_location_descendants_cte(
+                root_location_ids, cte_name="recent_tasks_root_descendants"
             )
-            root_children = select(models.LocationNode.id).join(
-                root_cte,
-                models.LocationNode.parent_id == root_cte.c.id,
-            )
-            root_cte = root_cte.union_all(root_children)
             location_cte = root_cte
         else:
             location_cte = cte
@@ -520,48 +477,21 @@ class TaskQuery:
                 no_patient_scope_clause,
             )
 
-        query = (
-            select(models.Task)
-            .options(
+        query = _scope_tasks_to_locations(
+            select(models.Task).options(
                 selectinload(models.Task.patient).selectinload(
                     models.Patient.assigned_locations,
                 ),
                 selectinload(models.Task.assignees),
-            )
-            .outerjoin(models.Patient, models.Task.patient_id == models.Patient.id)
-            .outerjoin(
-                patient_locations,
-                models.Patient.id == patient_locations.c.patient_id,
-            )
-            .outerjoin(
-                patient_teams,
-                models.Patient.id == patient_teams.c.patient_id,
-            )
-            .where(
-                (
-                    and_(
-                        models.Task.patient_id.isnot(None),
-                        _patient_visibility_clause(
-                            location_cte,
-                            patient_locations,
-                            patient_teams,
-                        ),
-                        models.Patient.state.notin_(
-                            [PatientState.DISCHARGED.value, PatientState.DEAD.value]
-                        ),
-                    )
-                )
-                | and_(
-                    models.Task.patient_id.is_(None),
-                    no_patient_scope_clause,
-                )
-            )
-            .distinct()
+            ),
+            location_cte,
+            no_patient_scope_clause,
         )
 
         return query
 
     @strawberry.field
+    @read_only_resolver
     async def recentTasksTotal(
         self,
         info: Info,
@@ -581,20 +511,9 @@ class TaskQuery:
         if not accessible_location_ids:
             return 0
 
-        patient_locations = aliased(models.patient_locations)
-        patient_teams = aliased(models.patient_teams)
-
-        cte = (
-            select(models.LocationNode.id)
-            .where(models.LocationNode.id.in_(accessible_location_ids))
-            .cte(name="accessible_locations", recursive=True)
-        )
-
-        children = select(models.LocationNode.id).join(
-            cte,
-            models.LocationNode.parent_id == cte.c.id,
+        cte = build_location_descendants_cte(
+            accessible_location_ids, cte_name="accessible_locations"
         )
-        cte = cte.union_all(children)
 
         if root_location_ids:
             invalid_ids = [
@@ -604,16 +523,9 @@ class TaskQuery:
             ]
             if invalid_ids:
                 raise_forbidden()
-            root_cte = (
-                select(models.LocationNode.id)
-                .where(models.LocationNode.id.in_(root_location_ids))
-                .cte(name="recent_tasks_total_root", recursive=True)
+            root_cte = build_location_descendants_cte(
+                root_location_ids, cte_name="recent_tasks_total_root"
             )
-            root_children = select(models.LocationNode.id).join(
-                root_cte,
-                models.LocationNode.parent_id == root_cte.c.id,
-            )
-            root_cte = root_cte.union_all(root_children)
             location_cte = root_cte
         else:
             location_cte = cte
@@ -628,37 +540,10 @@ class TaskQuery:
                 no_patient_scope_clause,
             )
 
-        query = (
-            select(models.Task)
-            .outerjoin(models.Patient, models.Task.patient_id == models.Patient.id)
-            .outerjoin(
-                patient_locations,
-                models.Patient.id == patient_locations.c.patient_id,
-            )
-            .outerjoin(
-                patient_teams,
-                models.Patient.id == patient_teams.c.patient_id,
-            )
-            .where(
-                (
-                    and_(
-                        models.Task.patient_id.isnot(None),
-                        _patient_visibility_clause(
-                            location_cte,
-                            patient_locations,
-                            patient_teams,
-                        ),
-                        models.Patient.state.notin_(
-                            [PatientState.DISCHARGED.value, PatientState.DEAD.value]
-                        ),
-                    )
-                )
-                | and_(
-                    models.Task.patient_id.is_(None),
-                    no_patient_scope_clause,
-                )
-            )
-            .distinct()
+        query = _scope_tasks_to_locations(
+            select(models.Task),
+            location_cte,
+            no_patient_scope_clause,
         )
 
         return await count_unified_query(
@@ -671,6 +556,34 @@ class TaskQuery:
             info=info,
         )
 
+    @strawberry.field
+    @read_only_resolver
+    async def recent_tasks_page(
+        self,
+        info: Info,
+        root_location_ids: list[strawberry.ID] | None = None,
+        filters: list[QueryFilterClauseInput] | None = None,
+        sorts: list[QuerySortClauseInput] | None = None,
+        pagination: PaginationInput | None = None,
+        search: QuerySearchInput | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> PaginatedTaskResult:
+        page = await TaskQuery.recent_tasks.fetch_page(
+            self,
+            info,
+            root_location_ids=root_location_ids,
+            filters=filters,
+            sorts=sorts,
+            pagination=pagination,
+            search=search,
+            count_mode=count_mode,
+        )
+        return PaginatedTaskResult(
+            items=page.items,
+            total_count=page.total_count,
+            total_is_exact=page.total_is_exact,
+        )
+
 
 @strawberry.type
 class TaskMutation(BaseMutationResolver[models.Task]):
@@ -760,10 +673,10 @@ class TaskMutation(BaseMutationResolver[models.Task]):
 
         touched_patient_ids: set[str] = set()
         for task in tasks:
-            await notify_entity_update("task", task.id)
+            await notify_entity_update("task", task.id, db=db)
             if task.patient_id and task.patient_id not in touched_patient_ids:
                 touched_patient_ids.add(task.patient_id)
-                await notify_entity_update("patient", task.patient_id)
+                await notify_entity_update("patient", task.patient_id, db=db)
 
         return int(delete_result.rowcount or 0)
 
@@ -1,7 +1,11 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm import selectinload
 
+from api.query.patient_location_scope import (
+    build_location_descendants_cte,
+    scope_patients_to_locations,
+)
 from database import models
 
 
@@ -33,33 +37,16 @@ class AuthorizationService:
             return result
 
         result = await self.db.execute(
-            select(models.user_root_locations.c.location_id).where(
-                models.user_root_locations.c.user_id == user.id
+            select(models.location_closure.c.descendant_id)
+            .join(
+                models.user_root_locations,
+                models.user_root_locations.c.location_id
+                == models.location_closure.c.ancestor_id,
             )
+            .where(models.user_root_locations.c.user_id == user.id)
+            .distinct()
         )
-        rows = result.fetchall()
-        root_location_ids = {row[0] for row in rows}
-
-        if not root_location_ids:
-            result = set()
-            if context:
-                context._accessible_location_ids = result
-            return result
-
-        cte = (
-            select(models.LocationNode.id)
-            .where(models.LocationNode.id.in_(root_location_ids))
-            .cte(name="accessible_locations", recursive=True)
-        )
-
-        children = select(models.LocationNode.id).join(
-            cte, models.LocationNode.parent_id == cte.c.id
-        )
-        cte = cte.union_all(children)
-
-        result = await self.db.execute(select(cte.c.id))
-        rows = result.fetchall()
-        accessible_ids = {row[0] for row in rows}
+        accessible_ids = {row[0] for row in result.all()}
 
         if context:
             context._accessible_location_ids = accessible_ids
@@ -163,46 +150,8 @@ class AuthorizationService:
         if not accessible_location_ids:
             return query.where(False)
 
-        cte = (
-            select(models.LocationNode.id)
-            .where(models.LocationNode.id.in_(accessible_location_ids))
-            .cte(name="accessible_locations", recursive=True)
-        )
-
-        children = select(models.LocationNode.id).join(
-            cte, models.LocationNode.parent_id == cte.c.id
+        cte = build_location_descendants_cte(
+            accessible_location_ids, cte_name="accessible_locations"
         )
-        cte = cte.union_all(children)
-
-        patient_locations = aliased(models.patient_locations)
-        patient_teams = aliased(models.patient_teams)
 
-        expanded = (
-            query.outerjoin(
-                patient_locations,
-                models.Patient.id == patient_locations.c.patient_id,
-            )
-            .outerjoin(
-                patient_teams,
-                models.Patient.id == patient_teams.c.patient_id,
-            )
-            .where(
-                (models.Patient.clinic_id.in_(select(cte.c.id)))
-                | (
-                    models.Patient.position_id.isnot(None)
-                    & models.Patient.position_id.in_(select(cte.c.id))
-                )
-                | (
-                    models.Patient.assigned_location_id.isnot(None)
-                    & models.Patient.assigned_location_id.in_(select(cte.c.id))
-                )
-                | (patient_locations.c.location_id.in_(select(cte.c.id)))
-                | (patient_teams.c.location_id.in_(select(cte.c.id)))
-            )
-        )
-        opts = getattr(expanded, "_with_options", None) or ()
-        ids_sq = expanded.with_only_columns(models.Patient.id).distinct().scalar_subquery()
-        out = select(models.Patient).where(models.Patient.id.in_(ids_sq))
-        for opt in opts:
-            out = out.options(opt)
-        return out
+        return scope_patients_to_locations(query, cte)
@@ -1,9 +1,110 @@
+import json
 import logging
+from collections.abc import Iterable
+from typing import Self
 
-from database.session import publish_to_redis
+from api.query.patient_location_scope import load_patient_location_ids
+from database import models
+from database.session import publish_many_to_redis, publish_to_redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+_PATIENT_SCOPED_ENTITY_TYPES = frozenset({"patient", "patient_state_changed"})
+
+
+class EntityNotification(str):
+    """Entity id received from a subscription channel, plus its location scope.
+
+    The value compares and serializes as the bare entity id. ``location_ids``
+    holds the clinic, position, assigned and team locations the entity was
+    attached to when it was published, or ``None`` if the publisher sent no
+    scope, in which case subscribers fall back to looking it up.
+    """
+
+    patient_id: str | None
+    location_ids: frozenset[str] | None
+
+    def __new__(
+        cls,
+        entity_id: str,
+        patient_id: str | None = None,
+        location_ids: Iterable[str] | None = None,
+    ) -> Self:
+        notification = super().__new__(cls, entity_id)
+        notification.patient_id = patient_id
+        notification.location_ids = (
+            frozenset(location_ids) if location_ids is not None else None
+        )
+        return notification
+
+    def encode(self) -> str:
+        if self.location_ids is None and self.patient_id is None:
+            return str(self)
+        payload: dict[str, object] = {"id": str(self)}
+        if self.patient_id is not None:
+            payload["patient_id"] = self.patient_id
+        if self.location_ids is not None:
+            payload["location_ids"] = sorted(self.location_ids)
+        return json.dumps(payload, separators=(",", ":"))
+
+    @classmethod
+    def decode(cls, message: str) -> "EntityNotification":
+        if not message.startswith("{"):
+            return cls(message)
+        try:
+            payload = json.loads(message)
+            return cls(
+                payload["id"],
+                payload.get("patient_id"),
+                payload.get("location_ids"),
+            )
+        except (ValueError, KeyError, TypeError):
+            return cls(message)
+
+
+async def load_notification_scope(
+    db: AsyncSession,
+    entity_type: str,
+    entity_id: str,
+) -> tuple[str | None, list[str] | None]:
+    """Return ``(patient_id, location_ids)`` to publish with an entity event."""
+    if entity_type in _PATIENT_SCOPED_ENTITY_TYPES:
+        location_ids = await load_patient_location_ids(db, entity_id)
+        if location_ids is None:
+            return None, None
+        return entity_id, sorted(location_ids)
+    if entity_type == "task":
+        result = await db.execute(
+            select(models.Task.patient_id, models.Task.assignee_team_id).where(
+                models.Task.id == entity_id
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None, None
+        patient_id, assignee_team_id = row
+        if patient_id:
+            location_ids = await load_patient_location_ids(db, patient_id)
+            return patient_id, sorted(location_ids or [])
+        return None, [assignee_team_id] if assignee_team_id else []
+    return None, None
+
+
+async def _build_message(
+    entity_type: str,
+    entity_id: str,
+    location_ids: list[str] | None,
+    patient_id: str | None,
+    db: AsyncSession | None,
+) -> str:
+    if db is not None and location_ids is None:
+        patient_id, location_ids = await load_notification_scope(
+            db, entity_type, str(entity_id)
+        )
+    return EntityNotification(str(entity_id), patient_id, location_ids).encode()
+
 
 async def notify_entity_update(
     entity_type: str,
@@ -11,6 +112,8 @@ async def notify_entity_update(
     related_entity_type: str | None = None,
     related_entity_id: str | None = None,
     location_ids: list[str] | None = None,
+    patient_id: str | None = None,
+    db: AsyncSession | None = None,
 ) -> None:
     channel = f"{entity_type}_updated"
     logger.info(
@@ -18,7 +121,10 @@ async def notify_entity_update(
         f"entity_id={entity_id}, channel={channel}, "
         f"location_ids={location_ids}, related_entity={related_entity_type}:{related_entity_id}"
     )
-    await publish_to_redis(channel, str(entity_id))
+    message = await _build_message(
+        entity_type, entity_id, location_ids, patient_id, db
+    )
+    await publish_to_redis(channel, message)
     logger.info(
         f"[SUBSCRIPTION] Successfully published entity update: "
         f"entity_type={entity_type}, entity_id={entity_id}, channel={channel}"
@@ -30,7 +136,10 @@ async def notify_entity_update(
             f"entity_type={related_entity_type}, entity_id={related_entity_id}, "
             f"channel={related_channel}"
         )
-        await publish_to_redis(related_channel, str(related_entity_id))
+        related_message = await _build_message(
+            related_entity_type, related_entity_id, None, None, db
+        )
+        await publish_to_redis(related_channel, related_message)
         logger.info(
             f"[SUBSCRIPTION] Successfully published related entity update: "
             f"entity_type={related_entity_type}, entity_id={related_entity_id}, "
@@ -42,25 +151,70 @@ async def notify_entity_created(
     entity_type: str,
     entity_id: str,
     location_ids: list[str] | None = None,
+    patient_id: str | None = None,
+    db: AsyncSession | None = None,
 ) -> None:
     channel = f"{entity_type}_created"
     logger.info(
         f"[SUBSCRIPTION] Publishing entity creation: entity_type={entity_type}, "
         f"entity_id={entity_id}, channel={channel}, location_ids={location_ids}"
     )
-    await publish_to_redis(channel, str(entity_id))
+    message = await _build_message(
+        entity_type, entity_id, location_ids, patient_id, db
+    )
+    await publish_to_redis(channel, message)
     logger.info(
         f"[SUBSCRIPTION] Successfully published entity creation: "
         f"entity_type={entity_type}, entity_id={entity_id}, channel={channel}"
     )
 
 
+async def notify_entities_created(
+    entity_type: str,
+    entity_ids: list[str],
+    location_ids: list[str] | None = None,
+    patient_id: str | None = None,
+    db: AsyncSession | None = None,
+    related_updates: list[tuple[str, str]] | None = None,
+) -> None:
+    """Publish creation events for ``entity_ids``, plus ``(entity_type, id)``
+    update events from ``related_updates``, in one Redis round trip.
+
+    All events share the ``location_ids`` scope; pass it to avoid a lookup
+    per entity.
+    """
+    channel = f"{entity_type}_created"
+    logger.info(
+        f"[SUBSCRIPTION] Publishing {len(entity_ids)} entity creations: "
+        f"entity_type={entity_type}, channel={channel}, location_ids={location_ids}"
+    )
+    messages = [
+        (channel, await _build_message(entity_type, entity_id, location_ids, patient_id, db))
+        for entity_id in entity_ids
+    ]
+    for related_type, related_id in related_updates or []:
+        related_patient_id = (
+            related_id if related_type in _PATIENT_SCOPED_ENTITY_TYPES else patient_id
+        )
+        messages.append(
+            (
+                f"{related_type}_updated",
+                await _build_message(
+                    related_type, related_id, location_ids, related_patient_id, db
+                ),
+            )
+        )
+    await publish_many_to_redis(messages)
+
+
 async def notify_entity_deleted(
     entity_type: str,
     entity_id: str,
     related_entity_type: str | None = None,
     related_entity_id: str | None = None,
     location_ids: list[str] | None = None,
+    patient_id: str | None = None,
+    db: AsyncSession | None = None,
 ) -> None:
     channel = f"{entity_type}_deleted"
     logger.info(
@@ -68,7 +222,10 @@ async def notify_entity_deleted(
         f"entity_id={entity_id}, channel={channel}, location_ids={location_ids}, "
         f"related_entity={related_entity_type}:{related_entity_id}"
     )
-    await publish_to_redis(channel, str(entity_id))
+    message = await _build_message(
+        entity_type, entity_id, location_ids, patient_id, db
+    )
+    await publish_to_redis(channel, message)
     logger.info(
         f"[SUBSCRIPTION] Successfully published entity deletion: "
         f"entity_type={entity_type}, entity_id={entity_id}, channel={channel}"
@@ -80,7 +237,10 @@ async def notify_entity_deleted(
             f"entity_type={related_entity_type}, entity_id={related_entity_id}, "
             f"channel={related_channel}"
         )
-        await publish_to_redis(related_channel, str(related_entity_id))
+        related_message = await _build_message(
+            related_entity_type, related_entity_id, None, None, db
+        )
+        await publish_to_redis(related_channel, related_message)
         logger.info(
             f"[SUBSCRIPTION] Successfully published related entity update: "
             f"entity_type={related_entity_type}, entity_id={related_entity_id}, "
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from api.inputs import PatientState
+from api.query.patient_location_scope import load_patient_location_ids
+from config import PATIENT_COUNT_RECONCILE_INTERVAL_SECONDS
+from database import models
+from database.session import async_session, redis_client
+from redis import exceptions as redis_exceptions
+from sqlalchemy import case, exists, func, insert, or_, select, union_all, update
+
+logger = logging.getLogger(__name__)
+
+counts_table = models.location_patient_counts
+
+STATE_COLUMNS: dict[str, str] = {
+    PatientState.WAIT.value: "waiting",
+    PatientState.ADMITTED.value: "admitted",
+    PatientState.DISCHARGED.value: "discharged",
+    PatientState.DEAD.value: "deceased",
+}
+
+_RECONCILE_LOCK_KEY = "location_patient_counts:reconcile"
+
+
+@dataclass(frozen=True)
+class PatientCountKey:
+    """What a patient contributes to the counters: its state and every
+    location it is attached to, together with all of their ancestors."""
+
+    state: str
+    location_ids: frozenset[str]
+
+
+def _patient_attachments() -> Any:
+    patient = models.Patient
+    active = patient.deleted.is_(False)
+    return union_all(
+        select(patient.id.label("patient_id"), patient.clinic_id.label("location_id"))
+        .where(active),
+        select(patient.id, patient.position_id)
+        .where(active, patient.position_id.isnot(None)),
+        select(patient.id, patient.assigned_location_id)
+        .where(active, patient.assigned_location_id.isnot(None)),
+        select(models.patient_locations.c.patient_id, models.patient_locations.c.location_id)
+        .join(patient, patient.id == models.patient_locations.c.patient_id)
+        .where(active),
+        select(models.patient_teams.c.patient_id, models.patient_teams.c.location_id)
+        .join(patient, patient.id == models.patient_teams.c.patient_id)
+        .where(active),
+    ).subquery()
+
+
+def _fresh_counts(scope: Any = None) -> Any:
+    attachments = _patient_attachments()
+    closure = models.location_closure
+    scoped = select(
+        closure.c.ancestor_id.label("location_id"),
+        attachments.c.patient_id,
+    ).join(closure, closure.c.descendant_id == attachments.c.location_id)
+    if scope is not None:
+        scoped = scoped.where(closure.c.ancestor_id.in_(scope))
+    scoped = scoped.distinct().subquery()
+    return (
+        select(
+            scoped.c.location_id,
+            *[
+                func.sum(case((models.Patient.state == state, 1), else_=0)).label(column)
+                for state, column in STATE_COLUMNS.items()
+            ],
+        )
+        .join(models.Patient, models.Patient.id == scoped.c.patient_id)
+        .group_by(scoped.c.location_id)
+        .subquery()
+    )
+
+
+class PatientCountService:
+    def __init__(self, db: Any):
+        self.db = db
+
+    async def snapshot(self, patient_id: str) -> PatientCountKey | None:
+        # Lock the patient row so concurrent writers of the same patient take
+        # their before/after snapshots one after the other.
+        result = await self.db.execute(
+            select(models.Patient.state, models.Patient.deleted)
+            .where(models.Patient.id == patient_id)
+            .with_for_update()
+        )
+        row = result.first()
+        if row is None or row.deleted:
+            return None
+        location_ids = await load_patient_location_ids(self.db, patient_id) or set()
+        if not location_ids:
+            return PatientCountKey(row.state, frozenset())
+        result = await self.db.execute(
+            select(models.location_closure.c.ancestor_id)
+            .where(models.location_closure.c.descendant_id.in_(location_ids))
+            .distinct()
+        )
+        return PatientCountKey(row.state, frozenset(r[0] for r in result.all()))
+
+    async def record_change(
+        self, patient: models.Patient, before: PatientCountKey | None
+    ) -> None:
+        """Apply the difference between ``before`` and the patient's pending
+        state to the counters, inside the caller's transaction."""
+        await self.db.flush()
+        after = await self.snapshot(patient.id)
+        if before == after:
+            return
+        changes: list[tuple[str, frozenset[str], int]] = []
+        if before is not None and after is not None and before.state == after.state:
+            # Shared ancestors keep their count, so their rows stay unlocked.
+            changes.append((before.state, before.location_ids - after.location_ids, -1))
+            changes.append((after.state, after.location_ids - before.location_ids, 1))
+        else:
+            if before is not None:
+                changes.append((before.state, before.location_ids, -1))
+            if after is not None:
+                changes.append((after.state, after.location_ids, 1))
+        await self._lock_counters(frozenset().union(*(ids for _, ids, _ in changes)))
+        for state, location_ids, delta in changes:
+            await self._increment(state, location_ids, delta)
+
+    async def _lock_counters(self, location_ids: frozenset[str]) -> None:
+        # Take every row this change touches up front and in a fixed order, so
+        # two moves in opposite directions wait for each other instead of
+        # deadlocking halfway through their increments.
+        if not location_ids:
+            return
+        location_id = counts_table.c.location_id
+        await self.db.execute(
+            select(location_id)
+            .where(location_id.in_(sorted(location_ids)))
+            .order_by(location_id)
+            .with_for_update()
+        )
+
+    async def _increment(self, state: str, location_ids: frozenset[str], delta: int) -> None:
+        column_name = STATE_COLUMNS.get(state)
+        if column_name is None or not location_ids:
+            return
+        column = counts_table.c[column_name]
+        await self.db.execute(
+            update(counts_table)
+            .where(counts_table.c.location_id.in_(sorted(location_ids)))
+            .values({column_name: column + delta})
+        )
+
+    async def _outermost(self, location_ids: list[str]) -> list[str]:
+        ids = set(location_ids)
+        if len(ids) > 1:
+            closure = models.location_closure
+            result = await self.db.execute(
+                select(closure.c.descendant_id).where(
+                    closure.c.ancestor_id.in_(ids),
+                    closure.c.descendant_id.in_(ids),
+                    closure.c.depth > 0,
+                )
+            )
+            ids -= {row[0] for row in result.all()}
+        return sorted(ids)
+
+    async def scoped_counts(self, root_location_ids: list[str]) -> dict[str, int] | None:
+        """Patients per state below ``root_location_ids``.
+
+        Returns ``None`` when the roots span several disjoint subtrees: a patient
+        attached below more than one of them would be counted twice, so those
+        scopes have to be counted from the patients table.
+        """
+        roots = await self._outermost(root_location_ids)
+        if len(roots) != 1:
+            return None
+        result = await self.db.execute(
+            select(*[counts_table.c[c] for c in STATE_COLUMNS.values()]).where(
+                counts_table.c.location_id == roots[0]
+            )
+        )
+        row = result.first()
+        if row is None:
+            return {state: 0 for state in STATE_COLUMNS}
+        return dict(zip(STATE_COLUMNS, row))
+
+    async def reconcile(self, location_ids: Iterable[str | None] | None = None) -> None:
+        """Recompute counters from the patients table: every counter, or only
+        those of ``location_ids`` and their ancestors. Rows are updated in
+        place, and only where they drifted, rather than deleted and rebuilt.
+        The caller commits."""
+        closure = models.location_closure
+        scope = None
+        if location_ids is not None:
+            ids = sorted({location_id for location_id in location_ids if location_id})
+            if not ids:
+                return
+            scope = select(closure.c.ancestor_id).where(closure.c.descendant_id.in_(ids))
+        location_id = counts_table.c.location_id
+        in_scope = [] if scope is None else [location_id.in_(scope)]
+        columns = list(STATE_COLUMNS.values())
+        fresh = _fresh_counts(scope)
+
+        node_id = models.LocationNode.id
+        await self.db.execute(
+            insert(counts_table).from_select(
+                ["location_id"],
+                select(node_id).where(
+                    ~exists().where(location_id == node_id),
+                    *([] if scope is None else [node_id.in_(scope)]),
+                ),
+            )
+        )
+        await self.db.execute(
+            update(counts_table)
+            .where(
+                location_id == fresh.c.location_id,
+                or_(*[counts_table.c[c] != fresh.c[c] for c in columns]),
+            )
+            .values({c: fresh.c[c] for c in columns})
+        )
+        await self.db.execute(
+            update(counts_table)
+            .where(
+                *in_scope,
+                location_id.not_in(select(fresh.c.location_id)),
+                or_(*[counts_table.c[c] != 0 for c in columns]),
+            )
+            .values({c: 0 for c in columns})
+        )
+
+
+class PatientCountReconciler:
+    """Periodically recomputes the counters to correct drift. A Redis lock
+    keeps workers from running it at once."""
+
+    def __init__(self, interval: float = PATIENT_COUNT_RECONCILE_INTERVAL_SECONDS):
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _acquire(self) -> bool:
+        try:
+            return bool(
+                await redis_client.set(
+                    _RECONCILE_LOCK_KEY, "1", nx=True, ex=max(int(self._interval), 1)
+                )
+            )
+        except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError):
+            return True
+
+    async def run_once(self) -> None:
+        async with async_session() as session:
+            await PatientCountService(session).reconcile()
+            await session.commit()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            if not await self._acquire():
+                continue
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Reconciling location patient counts failed")
+
+
+patient_count_reconciler = PatientCountReconciler()
@@ -1,7 +1,7 @@
 from api.inputs import PropertyValueInput
 from api.services.datetime import normalize_datetime_to_utc
 from database import models
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -31,10 +31,21 @@ class PropertyService:
 
         definition_ids_in_input = {prop.definition_id for prop in props_data}
 
+        if existing_props:
+            await self.db.execute(
+                delete(models.property_value_options).where(
+                    models.property_value_options.c.property_value_id.in_(
+                        [p.id for p in existing_props]
+                    )
+                )
+            )
+
         for existing_prop in existing_props:
             if existing_prop.definition_id not in definition_ids_in_input:
                 await self.db.delete(existing_prop)
 
+        selected_options: list[tuple[models.PropertyValue, list[str]]] = []
+
         for prop_input in props_data:
             multi_select_value = (
                 ",".join(prop_input.multi_select_values)
@@ -62,6 +73,7 @@ class PropertyService:
                 existing_prop.select_value = prop_input.select_value
                 existing_prop.multi_select_values = multi_select_value
                 existing_prop.user_value = prop_input.user_value
+                prop_value = existing_prop
             else:
                 prop_value = models.PropertyValue(
                     definition_id=prop_input.definition_id,
@@ -81,3 +93,19 @@ class PropertyService:
                     prop_value.task_id = entity.id
 
                 self.db.add(prop_value)
+
+            if prop_input.multi_select_values:
+                selected_options.append(
+                    (prop_value, list(dict.fromkeys(prop_input.multi_select_values)))
+                )
+
+        if selected_options:
+            await self.db.flush()
+            await self.db.execute(
+                insert(models.property_value_options),
+                [
+                    {"property_value_id": prop_value.id, "option": option}
+                    for prop_value, options in selected_options
+                    for option in options
+                ],
+            )
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from api.services.subscription_hub import subscription_hub
+from config import PROPERTY_DEFINITION_CACHE_TTL_SECONDS
+from database import models
+from database.session import async_session, publish_to_redis, redis_client
+from redis import exceptions as redis_exceptions
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+PROPERTY_DEFINITIONS_CHANNEL = "property_definitions_changed"
+_VERSION_KEY = "property_definitions:version"
+
+_REDIS_CONNECTION_ERRORS = (
+    redis_exceptions.ConnectionError,
+    redis_exceptions.TimeoutError,
+)
+
+
+@dataclass(frozen=True)
+class PropertyDefinitionSnapshot:
+    id: str
+    name: str
+    description: str | None
+    field_type: str
+    options: str | None
+    is_active: bool
+    allowed_entities: str
+
+    @classmethod
+    def from_model(
+        cls, definition: models.PropertyDefinition
+    ) -> "PropertyDefinitionSnapshot":
+        return cls(
+            id=str(definition.id),
+            name=definition.name,
+            description=definition.description,
+            field_type=definition.field_type,
+            options=definition.options,
+            is_active=bool(definition.is_active),
+            allowed_entities=definition.allowed_entities or "",
+        )
+
+    def allows(self, entity: str) -> bool:
+        return entity in {e.strip() for e in self.allowed_entities.split(",")}
+
+
+class PropertyDefinitionCache:
+    """Worker-local copy of all property definitions.
+
+    Mutations bump a version counter in Redis and publish it on
+    ``PROPERTY_DEFINITIONS_CHANNEL``; a worker drops its copy when it sees a
+    version other than the one it loaded. The version is also re-read every
+    ``ttl`` seconds, so a missed message delays an update by at most that long.
+    Without Redis the copy is simply reloaded every ``ttl`` seconds.
+
+    Definitions are read through a primary session of the cache's own, never
+    a request's (possibly replica-routed) session: a lagging replica would
+    otherwise be stored under the new version and kept until the next change.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: float = PROPERTY_DEFINITION_CACHE_TTL_SECONDS,
+        session_factory: Any = async_session,
+    ):
+        self._client = client
+        self._ttl = ttl
+        self.session_factory = session_factory
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = asyncio.Lock()
+        self._definitions: dict[str, PropertyDefinitionSnapshot] | None = None
+        self._version: str | None = None
+        self._checked_at = 0.0
+        self.generation = 0
+        self._watch_task: asyncio.Task | None = None
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._definitions = None
+        self._version = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._definitions is not None
+            and time.monotonic() - self._checked_at < self._ttl
+        )
+
+    def on_message(self, channel: str, message: str) -> None:
+        if channel == PROPERTY_DEFINITIONS_CHANNEL and message != self._version:
+            self._definitions = None
+
+    async def _current_version(self) -> str | None:
+        try:
+            return await self._client.get(_VERSION_KEY) or "0"
+        except _REDIS_CONNECTION_ERRORS as e:
+            logger.warning(f"Could not read property definition version: {e}")
+            return None
+
+    async def all(self) -> dict[str, PropertyDefinitionSnapshot]:
+        self._bind_to_running_loop()
+        if self._is_fresh():
+            return self._definitions
+        async with self._lock:
+            if self._is_fresh():
+                return self._definitions
+            version = await self._current_version()
+            if self._definitions is None or version is None or version != self._version:
+                async with self.session_factory() as session:
+                    result = await session.execute(select(models.PropertyDefinition))
+                    self._definitions = {
+                        str(d.id): PropertyDefinitionSnapshot.from_model(d)
+                        for d in result.scalars().all()
+                    }
+                self._version = version
+                self.generation += 1
+            self._checked_at = time.monotonic()
+            return self._definitions
+
+    async def get(self, definition_id: str) -> PropertyDefinitionSnapshot | None:
+        definitions = await self.all()
+        snapshot = definitions.get(definition_id)
+        if snapshot is None:
+            # Possibly created by another worker whose notification has not
+            # arrived yet; look up just this row instead of reloading them all.
+            async with self.session_factory() as session:
+                definition = await session.get(models.PropertyDefinition, definition_id)
+            if definition is not None:
+                snapshot = PropertyDefinitionSnapshot.from_model(definition)
+                definitions[snapshot.id] = snapshot
+                self.generation += 1
+        return snapshot
+
+    async def invalidate(self) -> None:
+        self._definitions = None
+        try:
+            version = await self._client.incr(_VERSION_KEY)
+        except _REDIS_CONNECTION_ERRORS as e:
+            logger.warning(f"Could not bump property definition version: {e}")
+            return
+        await publish_to_redis(PROPERTY_DEFINITIONS_CHANNEL, str(version))
+
+    def start(self) -> None:
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+    async def _watch(self) -> None:
+        async with subscription_hub.watch(PROPERTY_DEFINITIONS_CHANNEL):
+            await asyncio.Event().wait()
+
+
+property_definition_cache = PropertyDefinitionCache(redis_client)
+subscription_hub.add_listener(property_definition_cache.on_message)
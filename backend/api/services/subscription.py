@@ -1,173 +1,225 @@
 import asyncio
-import logging
-from collections.abc import AsyncGenerator, Awaitable, Callable
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
+from typing import Any
 
-from redis import exceptions as redis_exceptions
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from api.query.patient_location_scope import (
+    load_location_descendant_ids,
+    load_patient_location_ids,
+)
+from api.services.notifications import EntityNotification
+from api.services.subscription_hub import subscription_hub
 from database import models
-from database.session import redis_client
-
-logger = logging.getLogger(__name__)
-
-_SUBSCRIPTION_READ_TIMEOUT_SECONDS = 30.0
-_SUBSCRIPTION_RECONNECT_DELAY_SECONDS = 0.5
 
 
 async def create_redis_subscription(
     channel: str,
     filter_id: str | None = None,
 ) -> AsyncGenerator[str, None]:
-    """Yield message ids published to ``channel``, surviving idle gaps.
-
-    A long-lived blocking read returns empty whenever the channel is idle; that
-    is normal and must not tear the subscription down (the previous
-    ``pubsub.listen()`` propagated such read timeouts and crashed the
-    subscription). Read timeouts are therefore treated as "no message yet" and a
-    dropped connection reconnects instead of ending the stream. Cancellation
-    (the client going away) propagates out and closes the pubsub.
+    """Yield entity ids published to ``channel``.
+
+    Ids are yielded as ``EntityNotification`` so location filters can use the
+    scope published with the event.
+
+    Messages are read from the worker-wide subscription hub, which keeps a
+    single Redis pubsub connection and reconnects it on failure. Cancellation
+    (the client going away) releases this subscriber from the hub.
     """
-    while True:
-        pubsub = redis_client.pubsub()
-        try:
-            await pubsub.subscribe(channel)
-            while True:
-                try:
-                    message = await pubsub.get_message(
-                        ignore_subscribe_messages=True,
-                        timeout=_SUBSCRIPTION_READ_TIMEOUT_SECONDS,
-                    )
-                except (redis_exceptions.TimeoutError, asyncio.TimeoutError):
-                    continue
-                if message is None or message.get("type") != "message":
-                    continue
-                message_id = message["data"]
-                if filter_id is None or message_id == filter_id:
-                    yield message_id
-        except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError) as error:
-            logger.warning(
-                f"[SUBSCRIPTION] Redis connection lost on channel={channel}, reconnecting: {error}"
-            )
-            await asyncio.sleep(_SUBSCRIPTION_RECONNECT_DELAY_SECONDS)
-        finally:
-            try:
-                await pubsub.close()
-            except Exception:
-                pass
+    async with subscription_hub.subscribe(channel) as subscriber:
+        while True:
+            message_id = EntityNotification.decode(await subscriber.get())
+            if filter_id is None or message_id == filter_id:
+                yield message_id
 
 
-async def patient_belongs_to_root_locations(
-    db: AsyncSession,
-    patient_id: str,
-    root_location_ids: list[str],
-) -> bool:
-    if not root_location_ids:
-        return True
+_LOCATION_SCOPE_CHANNELS = (
+    "location_node_created",
+    "location_node_updated",
+    "location_node_deleted",
+    "patient_updated",
+)
+
+
+class SubscriptionLocationCache:
+    """Worker-wide cache backing the location filter of subscriptions.
 
-    result = await db.execute(
-        select(models.Patient)
-        .where(models.Patient.id == patient_id)
-        .options(
-            selectinload(models.Patient.assigned_locations),
-            selectinload(models.Patient.teams),
+    Every subscriber of a channel receives the same event, so the locations an
+    entity is attached to are resolved once per event and shared; concurrent
+    lookups for the same key await a single query. Entries are evicted when
+    the hub dispatches a new event for the entity, and descendant sets of root
+    locations are dropped whenever the location tree changes.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self._max_entries = max_entries
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._entities: OrderedDict[tuple[str, str], asyncio.Future] = OrderedDict()
+        self._task_patients: dict[str, str] = {}
+        self._descendants: OrderedDict[frozenset[str], asyncio.Future] = OrderedDict()
+
+    def on_message(self, channel: str, message: str) -> None:
+        if channel.startswith("location_node_"):
+            self._descendants.clear()
+            return
+        self._evict_entity(str(EntityNotification.decode(message)))
+
+    def _evict_entity(self, entity_id: str) -> None:
+        self._entities.pop(("patient", entity_id), None)
+        self._entities.pop(("task", entity_id), None)
+        self._task_patients.pop(entity_id, None)
+        stale_tasks = [
+            task_id
+            for task_id, patient_id in self._task_patients.items()
+            if patient_id == entity_id
+        ]
+        for task_id in stale_tasks:
+            self._entities.pop(("task", task_id), None)
+            del self._task_patients[task_id]
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._entities.clear()
+            self._task_patients.clear()
+            self._descendants.clear()
+
+    async def _shared(
+        self,
+        entries: OrderedDict,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        self._bind_to_running_loop()
+        while True:
+            future = entries.get(key)
+            if future is None:
+                break
+            entries.move_to_end(key)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The owning lookup failed; retry with this caller's session.
+
+        future = asyncio.get_running_loop().create_future()
+        entries[key] = future
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+        try:
+            value = await compute()
+        except BaseException:
+            if entries.get(key) is future:
+                del entries[key]
+            future.cancel()
+            raise
+        future.set_result(value)
+        return value
+
+    async def root_descendants(
+        self, db: AsyncSession, root_location_ids: list[str]
+    ) -> frozenset[str]:
+        return await self._shared(
+            self._descendants,
+            frozenset(root_location_ids),
+            lambda: _load_descendants(db, root_location_ids),
         )
-    )
-    patient = result.scalars().first()
 
-    if not patient:
-        return False
+    async def patient_locations(
+        self, db: AsyncSession, patient_id: str
+    ) -> frozenset[str] | None:
+        return await self._shared(
+            self._entities,
+            ("patient", patient_id),
+            lambda: _load_patient_locations(db, patient_id),
+        )
 
-    root_cte = (
-        select(models.LocationNode.id)
-        .where(
-            models.LocationNode.id.in_(root_location_ids)
+    async def task_locations(
+        self, db: AsyncSession, task_id: str
+    ) -> frozenset[str] | None:
+        return await self._shared(
+            self._entities,
+            ("task", task_id),
+            lambda: self._load_task_locations(db, task_id),
         )
-        .cte(name="root_location_descendants", recursive=True)
-    )
-    root_children = select(models.LocationNode.id).join(
-        root_cte, models.LocationNode.parent_id == root_cte.c.id
-    )
-    root_cte = root_cte.union_all(root_children)
 
-    result = await db.execute(select(root_cte.c.id))
-    root_location_descendants = {row[0] for row in result.all()}
+    async def _load_task_locations(
+        self, db: AsyncSession, task_id: str
+    ) -> frozenset[str] | None:
+        result = await db.execute(
+            select(models.Task.patient_id, models.Task.assignee_team_id).where(
+                models.Task.id == task_id
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None
+        patient_id, assignee_team_id = row
+        if patient_id:
+            self._task_patients[task_id] = patient_id
+            return await self.patient_locations(db, patient_id)
+        if not assignee_team_id:
+            return None
+        return frozenset({assignee_team_id})
 
-    if patient.clinic_id in root_location_descendants:
-        return True
 
-    if (
-        patient.position_id
-        and patient.position_id in root_location_descendants
-    ):
-        return True
+async def _load_descendants(
+    db: AsyncSession, root_location_ids: list[str]
+) -> frozenset[str]:
+    return frozenset(await load_location_descendant_ids(db, root_location_ids))
 
-    if (
-        patient.assigned_location_id
-        and patient.assigned_location_id
-        in root_location_descendants
-    ):
-        return True
 
-    if patient.assigned_locations:
-        for location in patient.assigned_locations:
-            if location.id in root_location_descendants:
-                return True
+async def _load_patient_locations(
+    db: AsyncSession, patient_id: str
+) -> frozenset[str] | None:
+    location_ids = await load_patient_location_ids(db, patient_id)
+    return frozenset(location_ids) if location_ids is not None else None
 
-    if patient.teams:
-        for team in patient.teams:
-            if team.id in root_location_descendants:
-                return True
 
-    return False
+subscription_location_cache = SubscriptionLocationCache()
+subscription_hub.add_listener(subscription_location_cache.on_message)
 
 
-async def task_belongs_to_root_locations(
+async def patient_belongs_to_root_locations(
     db: AsyncSession,
-    task_id: str,
+    patient_id: str,
     root_location_ids: list[str],
 ) -> bool:
     if not root_location_ids:
         return True
 
-    result = await db.execute(
-        select(models.Task)
-        .where(models.Task.id == task_id)
-        .options(
-            selectinload(models.Task.patient).selectinload(
-                models.Patient.assigned_locations
-            ),
-            selectinload(models.Task.patient).selectinload(
-                models.Patient.teams
-            ),
-        )
+    location_ids = await subscription_location_cache.patient_locations(
+        db, patient_id
     )
-    task = result.scalars().first()
-
-    if not task:
+    if not location_ids:
         return False
 
-    if task.patient:
-        return await patient_belongs_to_root_locations(
-            db, task.patient.id, root_location_ids
-        )
+    root_location_descendants = (
+        await subscription_location_cache.root_descendants(db, root_location_ids)
+    )
+    return not location_ids.isdisjoint(root_location_descendants)
 
-    if not task.assignee_team_id:
+
+async def task_belongs_to_root_locations(
+    db: AsyncSession,
+    task_id: str,
+    root_location_ids: list[str],
+) -> bool:
+    if not root_location_ids:
+        return True
+
+    location_ids = await subscription_location_cache.task_locations(db, task_id)
+    if not location_ids:
         return False
 
-    root_cte = (
-        select(models.LocationNode.id)
-        .where(models.LocationNode.id.in_(root_location_ids))
-        .cte(name="root_location_descendants", recursive=True)
-    )
-    root_children = select(models.LocationNode.id).join(
-        root_cte, models.LocationNode.parent_id == root_cte.c.id
+    root_location_descendants = (
+        await subscription_location_cache.root_descendants(db, root_location_ids)
     )
-    root_cte = root_cte.union(root_children)
-    result = await db.execute(select(root_cte.c.id))
-    root_location_descendants = {row[0] for row in result.all()}
-    return task.assignee_team_id in root_location_descendants
+    return not location_ids.isdisjoint(root_location_descendants)
 
 
 async def subscribe_with_location_filter(
@@ -182,6 +234,17 @@ async def subscribe_with_location_filter(
         async for entity_id in entity_id_iterator:
             yield entity_id
         return
-    async for entity_id in entity_id_iterator:
-        if await belongs_check(db, str(entity_id), root_location_ids):
-            yield entity_id
+    async with subscription_hub.watch(*_LOCATION_SCOPE_CHANNELS):
+        async for entity_id in entity_id_iterator:
+            location_ids = getattr(entity_id, "location_ids", None)
+            if location_ids is None:
+                visible = await belongs_check(db, str(entity_id), root_location_ids)
+            else:
+                root_location_descendants = (
+                    await subscription_location_cache.root_descendants(
+                        db, root_location_ids
+                    )
+                )
+                visible = not location_ids.isdisjoint(root_location_descendants)
+            if visible:
+                yield entity_id
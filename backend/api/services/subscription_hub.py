@@ -0,0 +1,227 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+
+from config import SUBSCRIPTION_QUEUE_MAXSIZE
+from database.session import redis_client
+from redis import exceptions as redis_exceptions
+
+logger = logging.getLogger(__name__)
+
+_HUB_READ_TIMEOUT_SECONDS = 30.0
+_HUB_RECONNECT_DELAY_SECONDS = 0.5
+
+_REDIS_CONNECTION_ERRORS = (
+    redis_exceptions.ConnectionError,
+    redis_exceptions.TimeoutError,
+)
+
+
+class ChannelSubscriber:
+    """Bounded in-process queue for one subscriber of one channel.
+
+    Pending duplicates are coalesced (the message only says "this entity
+    changed"), and when a slow consumer fills its queue the oldest pending
+    message is dropped so the hub never blocks on a single client.
+    """
+
+    def __init__(self, channel: str, maxsize: int):
+        self.channel = channel
+        self.dropped = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=maxsize)
+        self._pending: set[str] = set()
+
+    def offer(self, message: str) -> None:
+        if message in self._pending:
+            return
+        if self._queue.full():
+            oldest = self._queue.get_nowait()
+            self._pending.discard(oldest)
+            self.dropped += 1
+        self._queue.put_nowait(message)
+        self._pending.add(message)
+
+    async def get(self) -> str:
+        message = await self._queue.get()
+        self._pending.discard(message)
+        return message
+
+
+class _ChannelWatcher:
+    def offer(self, message: str) -> None:
+        pass
+
+
+class SubscriptionHub:
+    """Shares one Redis pubsub connection between all subscriptions of a worker.
+
+    Each channel is subscribed on Redis once, when its first local subscriber
+    arrives, and unsubscribed when the last one leaves. A single reader task
+    fans incoming messages out to the subscribers' queues and re-subscribes
+    every active channel after a dropped connection.
+    """
+
+    def __init__(self, client: Any, queue_maxsize: int = SUBSCRIPTION_QUEUE_MAXSIZE):
+        self._client = client
+        self._queue_maxsize = queue_maxsize
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = asyncio.Lock()
+        self._subscribers: dict[str, set[ChannelSubscriber | _ChannelWatcher]] = {}
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._pubsub: Any = None
+        self._reader_task: asyncio.Task | None = None
+
+    @property
+    def channels(self) -> list[str]:
+        return list(self._subscribers)
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._subscribers = {}
+        self._pubsub = None
+        self._reader_task = None
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Call ``listener(channel, message)`` for every dispatched message."""
+        self._listeners.append(listener)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[ChannelSubscriber]:
+        subscriber = ChannelSubscriber(channel, self._queue_maxsize)
+        async with self._attach(channel, subscriber):
+            yield subscriber
+
+    @asynccontextmanager
+    async def watch(self, *channels: str) -> AsyncIterator[None]:
+        """Keep ``channels`` subscribed so listeners see them, without queueing."""
+        async with AsyncExitStack() as stack:
+            for channel in channels:
+                await stack.enter_async_context(
+                    self._attach(channel, _ChannelWatcher())
+                )
+            yield
+
+    @asynccontextmanager
+    async def _attach(
+        self, channel: str, subscriber: "ChannelSubscriber | _ChannelWatcher"
+    ) -> AsyncIterator[None]:
+        self._bind_to_running_loop()
+        async with self._lock:
+            subscribers = self._subscribers.setdefault(channel, set())
+            subscribers.add(subscriber)
+            if len(subscribers) == 1:
+                await self._subscribe_channel(channel)
+            self._ensure_reader()
+        try:
+            yield
+        finally:
+            async with self._lock:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[channel]
+                        await self._unsubscribe_channel(channel)
+
+    def _ensure_reader(self) -> None:
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _subscribe_channel(self, channel: str) -> None:
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.subscribe(channel)
+        except _REDIS_CONNECTION_ERRORS as error:
+            logger.warning(
+                f"[SUBSCRIPTION] Hub failed to subscribe channel={channel}, reconnecting: {error}"
+            )
+            await self._discard_pubsub()
+
+    async def _unsubscribe_channel(self, channel: str) -> None:
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(channel)
+        except _REDIS_CONNECTION_ERRORS as error:
+            logger.warning(
+                f"[SUBSCRIPTION] Hub failed to unsubscribe channel={channel}: {error}"
+            )
+            await self._discard_pubsub()
+
+    async def _discard_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.close()
+        except (*_REDIS_CONNECTION_ERRORS, OSError):
+            logger.debug("[SUBSCRIPTION] Hub failed to close pubsub", exc_info=True)
+
+    async def _connect(self) -> Any:
+        async with self._lock:
+            if self._pubsub is None:
+                pubsub = self._client.pubsub()
+                if self._subscribers:
+                    await pubsub.subscribe(*self._subscribers)
+                self._pubsub = pubsub
+            return self._pubsub
+
+    async def _stop_reader_if_idle(self) -> bool:
+        # Checked under the lock that _attach holds while it adds a subscriber
+        # and calls _ensure_reader, so a subscriber arriving during teardown
+        # either keeps this reader running or gets a new one.
+        async with self._lock:
+            if self._subscribers:
+                return False
+            await self._discard_pubsub()
+            if self._reader_task is asyncio.current_task():
+                self._reader_task = None
+            return True
+
+    async def _read_loop(self) -> None:
+        while not await self._stop_reader_if_idle():
+            try:
+                pubsub = await self._connect()
+                if not pubsub.subscribed:
+                    await asyncio.sleep(_HUB_RECONNECT_DELAY_SECONDS)
+                    continue
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=_HUB_READ_TIMEOUT_SECONDS,
+                )
+            except (redis_exceptions.TimeoutError, TimeoutError):
+                continue
+            except redis_exceptions.ConnectionError as error:
+                logger.warning(
+                    f"[SUBSCRIPTION] Hub lost Redis connection, reconnecting: {error}"
+                )
+                await self._discard_pubsub()
+                await asyncio.sleep(_HUB_RECONNECT_DELAY_SECONDS)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            self.dispatch(message["channel"], message["data"])
+
+    def dispatch(self, channel: str, message: str) -> None:
+        for listener in self._listeners:
+            try:
+                listener(channel, message)
+            except Exception:
+                logger.exception(
+                    f"[SUBSCRIPTION] Hub listener failed for channel={channel}"
+                )
+        for subscriber in list(self._subscribers.get(channel, ())):
+            subscriber.offer(message)
+
+
+subscription_hub = SubscriptionHub(redis_client)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import uuid
 from collections import defaultdict, deque
+from datetime import datetime
 from typing import Any
 
-from api.services.notifications import notify_entity_created, notify_entity_update
+from api.query.patient_location_scope import load_patient_location_ids
+from api.services.notifications import notify_entities_created
 from database import models
 from graphql import GraphQLError
-from sqlalchemy import delete, insert, select
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -106,39 +109,32 @@ async def insert_task_dependencies(
 ) -> None:
     if not previous_task_ids:
         return
-    seen: list[str] = []
-    dup: set[str] = set()
-    for pid in previous_task_ids:
-        if pid in dup:
-            continue
-        dup.add(pid)
-        seen.append(pid)
-        if pid == next_task_id:
-            raise GraphQLError(
-                "Task cannot depend on itself",
-                extensions={"code": "BAD_REQUEST"},
-            )
-        res_prev = await db.execute(
-            select(models.Task).where(models.Task.id == pid),
+    seen = list(dict.fromkeys(previous_task_ids))
+    if next_task_id in seen:
+        raise GraphQLError(
+            "Task cannot depend on itself",
+            extensions={"code": "BAD_REQUEST"},
         )
-        prev = res_prev.scalars().first()
-        if not prev:
-            raise GraphQLError(
-                "Previous task not found",
-                extensions={"code": "BAD_REQUEST"},
-            )
-        if prev.patient_id != patient_id:
-            raise GraphQLError(
-                "Previous task must belong to the same patient",
-                extensions={"code": "BAD_REQUEST"},
-            )
-    for pid in seen:
-        await db.execute(
-            insert(models.task_dependencies).values(
-                previous_task_id=pid,
-                next_task_id=next_task_id,
-            ),
+    res_prev = await db.execute(
+        select(models.Task.id, models.Task.patient_id).where(
+            models.Task.id.in_(seen),
+        ),
+    )
+    prev_patients = {row.id: row.patient_id for row in res_prev.all()}
+    if len(prev_patients) != len(seen):
+        raise GraphQLError(
+            "Previous task not found",
+            extensions={"code": "BAD_REQUEST"},
+        )
+    if any(pid != patient_id for pid in prev_patients.values()):
+        raise GraphQLError(
+            "Previous task must belong to the same patient",
+            extensions={"code": "BAD_REQUEST"},
         )
+    await db.execute(
+        insert(models.task_dependencies),
+        [{"previous_task_id": pid, "next_task_id": next_task_id} for pid in seen],
+    )
 
 
 async def replace_incoming_task_dependencies(
@@ -188,68 +184,85 @@ async def apply_task_graph_to_patient(
     validate_task_graph_dict(graph)
     nodes_raw = graph["nodes"]
     edges_raw = graph["edges"]
-    assignees: list[models.User] = []
+    assignee_exists = False
     if assignee_id:
         ur = await db.execute(
-            select(models.User).where(models.User.id == assignee_id),
+            select(models.User.id).where(models.User.id == assignee_id),
         )
-        assignee_user = ur.scalars().first()
-        if assignee_user:
-            assignees = [assignee_user]
+        assignee_exists = ur.first() is not None
+    now = datetime.now()
     temp_to_task: dict[str, str] = {}
-    created: list[models.Task] = []
+    task_rows: list[dict[str, Any]] = []
     for n in nodes_raw:
-        nid = n["id"]
-        title = n["title"]
         description = n.get("description")
         priority = n.get("priority")
         estimated_time = n.get("estimated_time")
-        task = models.Task(
-            title=title,
-            description=description if isinstance(description, str) else None,
-            patient_id=patient_id,
-            source_task_preset_id=source_task_preset_id,
-            assignees=assignees,
-            assignee_team_id=None,
-            due_date=None,
-            priority=priority if isinstance(priority, str) else None,
-            estimated_time=estimated_time if isinstance(estimated_time, int) else None,
+        task_id = str(uuid.uuid4())
+        temp_to_task[n["id"]] = task_id
+        task_rows.append(
+            {
+                "id": task_id,
+                "title": n["title"],
+                "description": description if isinstance(description, str) else None,
+                "done": False,
+                "patient_id": patient_id,
+                "source_task_preset_id": source_task_preset_id,
+                "assignee_team_id": None,
+                "due_date": None,
+                "priority": priority if isinstance(priority, str) else None,
+                "estimated_time": (
+                    estimated_time if isinstance(estimated_time, int) else None
+                ),
+                "creation_date": now,
+                "update_date": now,
+            },
         )
-        db.add(task)
-        created.append(task)
-    await db.flush()
-    for n, task in zip(nodes_raw, created, strict=True):
-        nid = n["id"]
-        tid = task.id
-        if not tid:
-            raise GraphQLError(
-                "Task id was not assigned after insert",
-                extensions={"code": "INTERNAL_ERROR"},
-            )
-        temp_to_task[nid] = tid
     dep_key: set[tuple[str, str]] = set()
     dep_rows: list[dict[str, str]] = []
     for e in edges_raw:
-        prev_real = temp_to_task[e["from"]]
-        next_real = temp_to_task[e["to"]]
-        key = (prev_real, next_real)
+        key = (temp_to_task[e["from"]], temp_to_task[e["to"]])
         if key in dep_key:
             continue
         dep_key.add(key)
-        dep_rows.append(
-            {"previous_task_id": prev_real, "next_task_id": next_real},
+        dep_rows.append({"previous_task_id": key[0], "next_task_id": key[1]})
+    task_ids = [row["id"] for row in task_rows]
+
+    # Bulk statements skip the per-task mapper listeners, so the patient's
+    # last_activity_at is refreshed once below.
+    await db.execute(insert(models.Task), task_rows)
+    if assignee_exists:
+        await db.execute(
+            insert(models.task_assignees),
+            [{"task_id": task_id, "user_id": assignee_id} for task_id in task_ids],
         )
-    for row in dep_rows:
-        await db.execute(insert(models.task_dependencies).values(row))
+    if dep_rows:
+        await db.execute(insert(models.task_dependencies), dep_rows)
+    await db.execute(
+        update(models.Patient)
+        .where(models.Patient.id == patient_id)
+        .values(
+            last_activity_at=select(func.max(models.Task.update_date))
+            .where(models.Task.patient_id == patient_id)
+            .scalar_subquery(),
+            # Without this the onupdate of updated_at turns the refresh into
+            # a patient edit and changes its checksum.
+            updated_at=models.Patient.updated_at,
+        ),
+    )
     await db.commit()
-    task_ids = [t.id for t in created]
     res = await db.execute(
         select(models.Task).where(models.Task.id.in_(task_ids)),
     )
     tasks = list(res.scalars().all())
     order = {tid: i for i, tid in enumerate(task_ids)}
     tasks.sort(key=lambda t: order.get(t.id, 0))
-    for task in tasks:
-        await notify_entity_created("task", task.id)
-    await notify_entity_update("patient", patient_id)
+    location_ids = await load_patient_location_ids(db, patient_id)
+    await notify_entities_created(
+        "task",
+        task_ids,
+        location_ids=sorted(location_ids or []),
+        patient_id=patient_id,
+        related_updates=[("patient", patient_id)],
+        db=db,
+    )
     return tasks
@@ -8,7 +8,7 @@ from api.audit import AuditLogger
 def calculate_checksum_for_instance(instance: Any) -> str:
     try:
         exclude = getattr(instance, "_checksum_exclude", set())
-        if not isinstance(exclude, set):
+        if not isinstance(exclude, (set, frozenset)):
             exclude = set()
     except Exception:
         exclude = set()
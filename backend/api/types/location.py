@@ -30,12 +30,7 @@ class LocationNodeType:
     ):
         if not self.parent_id:
             return None
-        result = await info.context.db.execute(
-            select(models.LocationNode).where(
-                models.LocationNode.id == self.parent_id,
-            ),
-        )
-        return result.scalars().first()
+        return await info.context.loaders.location_by_id.load(self.parent_id)
 
     @strawberry.field
     async def children(
@@ -44,25 +39,14 @@ class LocationNodeType:
     ) -> list[
         Annotated["LocationNodeType", strawberry.lazy("api.types.location")]
     ]:
-        result = await info.context.db.execute(
-            select(models.LocationNode).where(
-                models.LocationNode.parent_id == self.id,
-            ),
-        )
-        return result.scalars().all()
+        return await info.context.loaders.location_children.load(self.id)
 
     @strawberry.field
     async def patients(
         self,
         info: Info,
     ) -> list[Annotated["PatientType", strawberry.lazy("api.types.patient")]]:
-
-        result = await info.context.db.execute(
-            select(models.Patient).where(
-                models.Patient.assigned_location_id == self.id,
-            ),
-        )
-        return result.scalars().all()
+        return await info.context.loaders.location_legacy_patients.load(self.id)
 
     @strawberry.field
     async def organization_ids(self, info: Info) -> list[str]:
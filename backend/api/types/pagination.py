@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import strawberry
 
@@ -7,13 +7,29 @@ if TYPE_CHECKING:
     from api.types.task import TaskType
 
 
+def _end_cursor(items: list[Any]) -> str | None:
+    if not items:
+        return None
+    return getattr(items[-1], "page_cursor", None)
+
+
 @strawberry.type
 class PaginatedPatientResult:
     items: list[Annotated["PatientType", strawberry.lazy("api.types.patient")]]
     total_count: int
+    total_is_exact: bool = True
+
+    @strawberry.field
+    def end_cursor(self) -> str | None:
+        return _end_cursor(self.items)
 
 
 @strawberry.type
 class PaginatedTaskResult:
     items: list[Annotated["TaskType", strawberry.lazy("api.types.task")]]
     total_count: int
+    total_is_exact: bool = True
+
+    @strawberry.field
+    def end_cursor(self) -> str | None:
+        return _end_cursor(self.items)
@@ -6,9 +6,6 @@ from api.context import Info
 from api.inputs import PatientState, Sex
 from api.types.base import calculate_checksum_for_instance
 from api.types.property import PropertyValueType
-from database import models
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
 
 if TYPE_CHECKING:
     from api.types.location import LocationNodeType
@@ -33,6 +30,18 @@ class ScopedPatientCountsType:
             scoped_patients_deceased=0,
         )
 
+    @staticmethod
+    def from_counts(counts_by_state: dict[str, int]) -> "ScopedPatientCountsType":
+        return ScopedPatientCountsType(
+            scoped_patients_total=sum(counts_by_state.values()),
+            scoped_patients_waiting=counts_by_state.get(PatientState.WAIT.value, 0),
+            scoped_patients_admitted=counts_by_state.get(PatientState.ADMITTED.value, 0),
+            scoped_patients_discharged=counts_by_state.get(
+                PatientState.DISCHARGED.value, 0
+            ),
+            scoped_patients_deceased=counts_by_state.get(PatientState.DEAD.value, 0),
+        )
+
 
 @strawberry.type
 class PatientType:
@@ -51,6 +60,10 @@ class PatientType:
     def name(self) -> str:
         return f"{self.firstname} {self.lastname}"
 
+    @strawberry.field
+    def cursor(self) -> str | None:
+        return getattr(self, "page_cursor", None)
+
     @strawberry.field
     def age(self) -> int:
         today = date.today()
@@ -75,21 +88,12 @@ class PatientType:
         | None
     ):
         if self.assigned_location_id:
-            result = await info.context.db.execute(
-                select(models.LocationNode).where(
-                    models.LocationNode.id == self.assigned_location_id,
-                ),
+            return await info.context.loaders.location_by_id.load(
+                self.assigned_location_id
             )
-            return result.scalars().first()
-
-        query = (
-            select(models.LocationNode)
-            .join(models.patient_locations)
-            .where(models.patient_locations.c.patient_id == self.id)
-            .limit(1)
+        return await info.context.loaders.patient_first_assigned_location.load(
+            self.id
         )
-        result = await info.context.db.execute(query)
-        return result.scalars().first()
 
     @strawberry.field
     async def assigned_locations(
@@ -112,12 +116,7 @@ class PatientType:
         "LocationNodeType",
         strawberry.lazy("api.types.location"),
     ]:
-        result = await info.context.db.execute(
-            select(models.LocationNode).where(
-                models.LocationNode.id == self.clinic_id,
-            ),
-        )
-        clinic = result.scalars().first()
+        clinic = await info.context.loaders.location_by_id.load(self.clinic_id)
         if not clinic:
             raise Exception(f"Clinic location not found for patient {self.id}")
         return clinic
@@ -135,12 +134,7 @@ class PatientType:
     ):
         if not self.position_id:
             return None
-        result = await info.context.db.execute(
-            select(models.LocationNode).where(
-                models.LocationNode.id == self.position_id,
-            ),
-        )
-        return result.scalars().first()
+        return await info.context.loaders.location_by_id.load(self.position_id)
 
     @strawberry.field
     async def teams(
@@ -156,13 +150,8 @@ class PatientType:
         return self.teams or []
 
     @strawberry.field
-    async def update_date(self, info: Info) -> datetime | None:
-        result = await info.context.db.execute(
-            select(func.max(models.Task.update_date)).where(
-                models.Task.patient_id == self.id
-            )
-        )
-        task_max = result.scalar()
+    def update_date(self) -> datetime | None:
+        task_max = self.last_activity_at
         patient_updated = self.updated_at
         if task_max is not None and patient_updated is not None:
             return max(task_max, patient_updated)
@@ -186,22 +175,14 @@ class PatientType:
         info: Info,
         done: bool | None = None,
     ) -> list[Annotated["TaskType", strawberry.lazy("api.types.task")]]:
-
-        query = select(models.Task).where(models.Task.patient_id == self.id)
-        if done is not None:
-            query = query.where(models.Task.done == done)
-        result = await info.context.db.execute(query)
-        return result.scalars().all()
+        tasks = await info.context.loaders.patient_tasks.load(self.id)
+        if done is None:
+            return tasks
+        return [task for task in tasks if task.done == done]
 
     @strawberry.field
     async def properties(self, info: Info) -> list[PropertyValueType]:
-        query = (
-            select(models.PropertyValue)
-            .where(models.PropertyValue.patient_id == self.id)
-            .options(selectinload(models.PropertyValue.definition))
-        )
-        result = await info.context.db.execute(query)
-        return result.scalars().all()
+        return await info.context.loaders.patient_properties.load(self.id)
 
     @strawberry.field
     def checksum(self) -> str:
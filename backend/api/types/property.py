@@ -4,8 +4,7 @@ from typing import TYPE_CHECKING, Annotated
 import strawberry
 from api.context import Info
 from api.inputs import FieldType, PropertyEntity
-from database import models
-from sqlalchemy import select
+from api.services.property_definitions import property_definition_cache
 
 if TYPE_CHECKING:
     from api.types.location import LocationNodeType
@@ -34,7 +33,6 @@ class PropertyDefinitionType:
 @strawberry.type
 class PropertyValueType:
     id: strawberry.ID
-    definition: PropertyDefinitionType
     text_value: str | None
     number_value: float | None
     boolean_value: bool | None
@@ -43,6 +41,10 @@ class PropertyValueType:
     select_value: str | None
     user_value: str | None
 
+    @strawberry.field
+    async def definition(self, info: Info) -> PropertyDefinitionType:
+        return await property_definition_cache.get(self.definition_id)
+
     @strawberry.field
     def multi_select_values(self) -> list[str] | None:
         return (
@@ -58,10 +60,7 @@ class PropertyValueType:
     ) -> Annotated["UserType", strawberry.lazy("api.types.user")] | None:
         if not self.user_value or self.user_value.startswith("team:"):
             return None
-        result = await info.context.db.execute(
-            select(models.User).where(models.User.id == self.user_value),
-        )
-        return result.scalars().first()
+        return await info.context.loaders.user_by_id.load(self.user_value)
 
     @strawberry.field
     async def team(
@@ -74,9 +73,4 @@ class PropertyValueType:
         if not self.user_value or not self.user_value.startswith("team:"):
             return None
         team_id = self.user_value[5:]
-        result = await info.context.db.execute(
-            select(models.LocationNode).where(
-                models.LocationNode.id == team_id,
-            ),
-        )
-        return result.scalars().first()
+        return await info.context.loaders.location_by_id.load(team_id)
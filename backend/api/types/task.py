@@ -5,10 +5,7 @@ import strawberry
 from api.context import Info
 from api.types.base import calculate_checksum_for_instance
 from api.types.property import PropertyValueType
-from database import models
 from sqlalchemy import inspect as sa_inspect
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import NO_VALUE
 
 if TYPE_CHECKING:
@@ -32,6 +29,10 @@ class TaskType:
     priority: str | None
     estimated_time: int | None
 
+    @strawberry.field
+    def cursor(self) -> str | None:
+        return getattr(self, "page_cursor", None)
+
     @strawberry.field
     async def assignees(
         self,
@@ -44,12 +45,7 @@ class TaskType:
                 return list(attr.value)
         except Exception:
             pass
-        result = await info.context.db.execute(
-            select(models.User)
-            .join(models.task_assignees, models.task_assignees.c.user_id == models.User.id)
-            .where(models.task_assignees.c.task_id == self.id),
-        )
-        return result.scalars().all()
+        return await info.context.loaders.task_assignees.load(self.id)
 
     @strawberry.field
     async def assignee_team(
@@ -58,10 +54,7 @@ class TaskType:
     ) -> Annotated["LocationNodeType", strawberry.lazy("api.types.location")] | None:
         if not self.assignee_team_id:
             return None
-        result = await info.context.db.execute(
-            select(models.LocationNode).where(models.LocationNode.id == self.assignee_team_id),
-        )
-        return result.scalars().first()
+        return await info.context.loaders.location_by_id.load(self.assignee_team_id)
 
     @strawberry.field
     async def patient(
@@ -70,20 +63,11 @@ class TaskType:
     ) -> Annotated["PatientType", strawberry.lazy("api.types.patient")] | None:
         if not self.patient_id:
             return None
-        result = await info.context.db.execute(
-            select(models.Patient).where(models.Patient.id == self.patient_id),
-        )
-        return result.scalars().first()
+        return await info.context.loaders.patient_by_id.load(self.patient_id)
 
     @strawberry.field
     async def properties(self, info: Info) -> list[PropertyValueType]:
-        query = (
-            select(models.PropertyValue)
-            .where(models.PropertyValue.task_id == self.id)
-            .options(selectinload(models.PropertyValue.definition))
-        )
-        result = await info.context.db.execute(query)
-        return result.scalars().all()
+        return await info.context.loaders.task_properties.load(self.id)
 
     @strawberry.field
     def checksum(self) -> str:
@@ -29,6 +29,10 @@ class UserType:
             return f"{self.firstname} {self.lastname}"
         return self.username
 
+    @strawberry.field
+    def cursor(self) -> str | None:
+        return getattr(self, "page_cursor", None)
+
     @strawberry.field
     def is_online(self) -> bool:
         if not self.last_online:
@@ -47,6 +51,7 @@ class UserType:
         info: Info,
         root_location_ids: list[strawberry.ID] | None = None,
     ) -> list[Annotated["TaskType", strawberry.lazy("api.types.task")]]:
+        from api.query.patient_location_scope import build_location_descendants_cte
         from api.services.authorization import AuthorizationService
 
         auth_service = AuthorizationService(info.context.db)
@@ -65,17 +70,10 @@ class UserType:
 
         from sqlalchemy import select
 
-        cte = (
-            select(models.LocationNode.id)
-            .where(models.LocationNode.id.in_(accessible_location_ids))
-            .cte(name="accessible_locations", recursive=True)
+        cte = build_location_descendants_cte(
+            accessible_location_ids, cte_name="accessible_locations"
         )
 
-        children = select(models.LocationNode.id).join(
-            cte, models.LocationNode.parent_id == cte.c.id
-        )
-        cte = cte.union_all(children)
-
         if root_location_ids:
             invalid_ids = [
                 lid
@@ -84,15 +82,9 @@ class UserType:
             ]
             if invalid_ids:
                 return []
-            root_cte = (
-                select(models.LocationNode.id)
-                .where(models.LocationNode.id.in_(root_location_ids))
-                .cte(name="root_location_descendants", recursive=True)
-            )
-            root_children = select(models.LocationNode.id).join(
-                root_cte, models.LocationNode.parent_id == root_cte.c.id
+            root_cte = build_location_descendants_cte(
+                root_location_ids, cte_name="root_location_descendants"
             )
-            root_cte = root_cte.union_all(root_children)
         else:
             root_cte = cte
 
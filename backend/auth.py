@@ -1,24 +1,180 @@
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from typing import Any, Optional
 
-import requests
+import httpx
 from config import (
     CLIENT_ID,
     FRONTEND_CLIENT_ID,
     ISSUER_URI,
+    JWKS_REFRESH_INTERVAL_SECONDS,
     LOGGER,
     PUBLIC_ISSUER_URI,
+    VERIFIED_TOKEN_CACHE_SIZE,
 )
 from fastapi import Request
 from fastapi.responses import RedirectResponse
 from jose import jwk, jwt
+from jose.exceptions import JWKError
 from starlette.requests import HTTPConnection
 
 logger = logging.getLogger(LOGGER)
 
 AUTH_COOKIE_NAME = "access_token"
 
-jwks_cache: dict[str, Any] = {}
+
+class JWKSFetchError(Exception):
+    pass
+
+
+class JWKSClient:
+    """Async JWKS key store for the issuer.
+
+    Keys are refreshed in the background every ``refresh_interval`` seconds.
+    An unknown ``kid`` triggers at most one concurrent fetch (other requests
+    wait for it) and forced fetches are rate limited, so a key rotation or a
+    token with a bogus ``kid`` cannot stampede the issuer.
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        refresh_interval: float = JWKS_REFRESH_INTERVAL_SECONDS,
+        min_fetch_interval: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.jwks_uri = jwks_uri
+        self.refresh_interval = refresh_interval
+        self.min_fetch_interval = min_fetch_interval
+        self._transport = transport
+        self._keys: dict[str, Any] = {}
+        self._last_fetch = float("-inf")
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def get_key(self, kid: str) -> Any:
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        async with self._get_lock():
+            key = self._keys.get(kid)
+            if key is not None:
+                return key
+            if time.monotonic() - self._last_fetch >= self.min_fetch_interval:
+                await self._fetch()
+        key = self._keys.get(kid)
+        if key is None:
+            raise Exception(f"Public key (kid={kid}) not found in JWKS")
+        return key
+
+    async def refresh(self) -> None:
+        async with self._get_lock():
+            await self._fetch()
+
+    async def _fetch(self) -> None:
+        self._last_fetch = time.monotonic()
+        try:
+            async with httpx.AsyncClient(
+                timeout=5, transport=self._transport
+            ) as client:
+                response = await client.get(self.jwks_uri)
+                response.raise_for_status()
+                jwks = response.json()
+        except (httpx.HTTPError, ValueError) as net_err:
+            logger.error(f"Failed to fetch JWKS from {self.jwks_uri}: {net_err}")
+            raise JWKSFetchError(
+                "Could not reach authentication server to verify token",
+            ) from net_err
+
+        keys = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data)
+            except (JWKError, ValueError) as e:
+                logger.warning(f"Skipping unusable JWKS key kid={kid}: {e}")
+        self._keys = keys
+
+    def start(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except JWKSFetchError as e:
+                logger.warning(f"Background JWKS refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token payloads, keyed by token hash.
+
+    Entries never outlive the token's ``exp`` claim.
+    """
+
+    def __init__(self, max_entries: int = VERIFIED_TOKEN_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        if self._max_entries <= 0:
+            return
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (payload, float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+jwks_client = JWKSClient(f"{ISSUER_URI}/protocol/openid-connect/certs")
+verified_token_cache = VerifiedTokenCache()
 
 
 def delete_auth_cookie(response):
@@ -31,20 +187,20 @@ def delete_auth_cookie(response):
     )
 
 
-def get_user_payload(connection: HTTPConnection) -> Optional[dict]:
+async def get_user_payload(connection: HTTPConnection) -> Optional[dict]:
     token = get_token_source(connection)
 
     if not token:
         return None
 
     try:
-        return verify_token(token)
+        return await verify_token(token)
     except Exception as e:
         logger.warning(f"Auth failed for token: {e}")
         return None
 
 
-def get_public_key(token: str) -> Any:
+async def get_public_key(token: str) -> Any:
     try:
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
@@ -52,44 +208,28 @@ def get_public_key(token: str) -> Any:
         if not kid:
             raise Exception("Token header missing 'kid' field")
 
-        if kid in jwks_cache:
-            return jwks_cache[kid]
-
-        jwks_uri = f"{ISSUER_URI}/protocol/openid-connect/certs"
-
-        try:
-            response = requests.get(jwks_uri, timeout=5)
-            response.raise_for_status()
-            jwks = response.json()
-        except Exception as net_err:
-            logger.error(f"Failed to fetch JWKS from {jwks_uri}: {net_err}")
-            raise Exception(
-                "Could not reach authentication server to verify token",
-            )
-
-        for key_data in jwks.get("keys", []):
-            if key_data.get("kid") == kid:
-                key = jwk.construct(key_data)
-                jwks_cache[kid] = key
-                return key
-
-        raise Exception(f"Public key (kid={kid}) not found in JWKS")
+        return await jwks_client.get_key(kid)
 
     except Exception as e:
         logger.error(f"Key retrieval error: {e}")
         raise e
 
 
-def verify_token(token: str) -> dict:
+async def verify_token(token: str) -> dict:
     """
     Verifies and decodes the access token JWT.
     Reads claims directly from the access token payload (not from /userinfo endpoint).
     The token is obtained from either:
     - Authorization header (Bearer token)
     - Cookie named 'access_token'
+    Verified payloads are cached until the token expires.
     """
+    cached = verified_token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
-        public_key = get_public_key(token)
+        public_key = await get_public_key(token)
 
         payload = jwt.decode(
             token,
@@ -107,9 +247,11 @@ def verify_token(token: str) -> dict:
             aud = []
 
         if (azp and azp == CLIENT_ID) or azp == FRONTEND_CLIENT_ID:
+            verified_token_cache.put(token, payload)
             return payload
 
         if CLIENT_ID in aud or FRONTEND_CLIENT_ID in aud:
+            verified_token_cache.put(token, payload)
             return payload
 
         error_msg = (
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from enum import Enum
 
 from dotenv import load_dotenv
@@ -23,6 +24,25 @@ DATABASE_URL = os.getenv(
     f"postgresql+asyncpg://{_db_username}:{_db_password}@{_db_hostname}:{_db_port}/{_db_name}",
 )
 
+DATABASE_READ_REPLICA_URL = os.getenv("DATABASE_READ_REPLICA_URL") or None
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+DATABASE_POOL_TIMEOUT_SECONDS = float(os.getenv("DATABASE_POOL_TIMEOUT_SECONDS", "10"))
+DATABASE_POOL_RECYCLE_SECONDS = int(os.getenv("DATABASE_POOL_RECYCLE_SECONDS", "1800"))
+# Pinging on every checkout costs a round trip; stale connections are instead
+# replaced by idle recycling and the background health check.
+DATABASE_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", "false").lower() == "true"
+DATABASE_POOL_IDLE_TIMEOUT_SECONDS = float(
+    os.getenv("DATABASE_POOL_IDLE_TIMEOUT_SECONDS", "300")
+)
+DATABASE_POOL_HEALTH_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("DATABASE_POOL_HEALTH_CHECK_INTERVAL_SECONDS", "30")
+)
+DATABASE_STATEMENT_TIMEOUT_MS = int(os.getenv("DATABASE_STATEMENT_TIMEOUT_MS", "30000"))
+# asyncpg prepared statement cache per connection; 0 behind PgBouncer in
+# transaction pooling mode.
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "100"))
+
 _redis_host = os.getenv("REDIS_HOSTNAME", "localhost")
 _redis_port = int(os.getenv("REDIS_PORT", 6379))
 _redis_password = os.getenv("REDIS_PASSWORD", None)
@@ -47,6 +67,10 @@ PUBLIC_ISSUER_URI = os.getenv(
 CLIENT_ID = os.getenv("CLIENT_ID", "tasks-backend")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET", "tasks-secret")
 FRONTEND_CLIENT_ID = os.getenv("FRONTEND_CLIENT_ID", "tasks-web")
+JWKS_REFRESH_INTERVAL_SECONDS = float(
+    os.getenv("JWKS_REFRESH_INTERVAL_SECONDS", "300")
+)
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "10000"))
 
 if IS_DEV:
     ALLOWED_ORIGINS = ["*"]
@@ -67,8 +91,40 @@ except ValueError:
     SCAFFOLD_STRATEGY = ScaffoldStrategy.CHECK
 
 EXPORT_MAX_ROWS = int(os.getenv("EXPORT_MAX_ROWS", "10000"))
+EXPORT_STREAM_BATCH_SIZE = int(os.getenv("EXPORT_STREAM_BATCH_SIZE", "500"))
+LIST_COUNT_CAP = int(os.getenv("LIST_COUNT_CAP", "10000"))
+QUERY_SEMI_JOINS = os.getenv("QUERY_SEMI_JOINS", "true").lower() == "true"
+
+PROPERTY_DEFINITION_CACHE_TTL_SECONDS = float(
+    os.getenv("PROPERTY_DEFINITION_CACHE_TTL_SECONDS", "60")
+)
+
+PATIENT_STATE_COUNTERS = os.getenv("PATIENT_STATE_COUNTERS", "true").lower() == "true"
+PATIENT_COUNT_RECONCILE_INTERVAL_SECONDS = float(
+    os.getenv("PATIENT_COUNT_RECONCILE_INTERVAL_SECONDS", "3600")
+)
+
+READ_SESSION_POOL_SIZE = int(os.getenv("READ_SESSION_POOL_SIZE", "4"))
+
+USER_CONTEXT_CACHE_TTL_SECONDS = float(
+    os.getenv("USER_CONTEXT_CACHE_TTL_SECONDS", "300")
+)
+USER_LAST_ONLINE_INTERVAL_SECONDS = float(
+    os.getenv("USER_LAST_ONLINE_INTERVAL_SECONDS", "60")
+)
+
+SUBSCRIPTION_QUEUE_MAXSIZE = int(os.getenv("SUBSCRIPTION_QUEUE_MAXSIZE", "256"))
 
 INFLUXDB_URL = os.getenv("INFLUXDB_URL", "http://localhost:8086")
 INFLUXDB_TOKEN = os.getenv("INFLUXDB_TOKEN", None)
 INFLUXDB_ORG = os.getenv("INFLUXDB_ORG", "tasks")
 INFLUXDB_BUCKET = os.getenv("INFLUXDB_BUCKET", "audit")
+
+AUDIT_QUEUE_MAXSIZE = int(os.getenv("AUDIT_QUEUE_MAXSIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+AUDIT_SPILL_PATH = os.getenv(
+    "AUDIT_SPILL_PATH",
+    os.path.join(tempfile.gettempdir(), "tasks-audit-spill.lp"),
+)
+AUDIT_SPILL_MAX_BYTES = int(os.getenv("AUDIT_SPILL_MAX_BYTES", str(64 * 1024 * 1024)))
@@ -0,0 +1,87 @@
+"""Add foreign-key and filter indexes.
+
+Revision ID: add_filter_indexes
+Revises: add_search_trigram_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_filter_indexes"
+down_revision: str | Sequence[str] | None = "add_search_trigram_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# (name, table, columns, partial predicate)
+INDEXES: list[tuple[str, str, list[str], str | None]] = [
+    ("ix_tasks_patient_id_done", "tasks", ["patient_id", "done"], None),
+    (
+        "ix_tasks_assignee_team_id",
+        "tasks",
+        ["assignee_team_id"],
+        "assignee_team_id IS NOT NULL",
+    ),
+    ("ix_tasks_update_date", "tasks", ["update_date"], None),
+    ("ix_tasks_open_due_date", "tasks", ["due_date"], "done = false"),
+    ("ix_task_assignees_user_id", "task_assignees", ["user_id"], None),
+    ("ix_patients_clinic_id", "patients", ["clinic_id"], None),
+    (
+        "ix_patients_position_id",
+        "patients",
+        ["position_id"],
+        "position_id IS NOT NULL",
+    ),
+    (
+        "ix_patients_assigned_location_id",
+        "patients",
+        ["assigned_location_id"],
+        "assigned_location_id IS NOT NULL",
+    ),
+    ("ix_patients_active_state", "patients", ["state"], "deleted = false"),
+    ("ix_patient_locations_location_id", "patient_locations", ["location_id"], None),
+    ("ix_patient_teams_location_id", "patient_teams", ["location_id"], None),
+    (
+        "ix_property_values_definition_patient",
+        "property_values",
+        ["definition_id", "patient_id"],
+        "patient_id IS NOT NULL",
+    ),
+    (
+        "ix_property_values_definition_task",
+        "property_values",
+        ["definition_id", "task_id"],
+        "task_id IS NOT NULL",
+    ),
+    (
+        "ix_property_values_patient_id",
+        "property_values",
+        ["patient_id"],
+        "patient_id IS NOT NULL",
+    ),
+    (
+        "ix_property_values_task_id",
+        "property_values",
+        ["task_id"],
+        "task_id IS NOT NULL",
+    ),
+    ("ix_location_nodes_parent_id", "location_nodes", ["parent_id"], None),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, where in INDEXES:
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+        )
+
+
+def downgrade() -> None:
+    for name, table, _columns, _where in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,54 @@
+"""Add location_closure table.
+
+Revision ID: add_location_closure
+Revises: add_patient_field_update_ts
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_location_closure"
+down_revision: str | Sequence[str] | None = "add_patient_field_update_ts"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "location_closure",
+        sa.Column("ancestor_id", sa.String(), nullable=False),
+        sa.Column("descendant_id", sa.String(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["location_nodes.id"]),
+        sa.ForeignKeyConstraint(["descendant_id"], ["location_nodes.id"]),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        op.f("ix_location_closure_descendant_id"),
+        "location_closure",
+        ["descendant_id"],
+    )
+    op.execute(
+        """
+        INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM location_nodes
+            UNION ALL
+            SELECT tree.ancestor_id, location_nodes.id, tree.depth + 1
+            FROM tree
+            JOIN location_nodes ON location_nodes.parent_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_location_closure_descendant_id"),
+        table_name="location_closure",
+    )
+    op.drop_table("location_closure")
@@ -0,0 +1,78 @@
+"""Add a per-location lineage projection (clinic/ward/room/bed and depth).
+
+Revision ID: add_location_lineage
+Revises: add_patient_last_activity
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_location_lineage"
+down_revision: str | Sequence[str] | None = "add_patient_last_activity"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LEVELS = {
+    "clinic": ("CLINIC", "PRACTICE"),
+    "ward": ("WARD",),
+    "room": ("ROOM",),
+    "bed": ("BED",),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "location_lineage",
+        sa.Column(
+            "location_id",
+            sa.String(),
+            sa.ForeignKey("location_nodes.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        *[
+            column
+            for level in LEVELS
+            for column in (
+                sa.Column(f"{level}_id", sa.String(), nullable=True),
+                sa.Column(f"{level}_title", sa.String(), nullable=True),
+            )
+        ],
+    )
+    for level in LEVELS:
+        op.create_index(
+            f"ix_location_lineage_{level}_id", "location_lineage", [f"{level}_id"]
+        )
+
+    columns = ", ".join(f"{level}_id, {level}_title" for level in LEVELS)
+    selected = ", ".join(f"{level}.id, {level}.title" for level in LEVELS)
+    joins = "\n".join(
+        f"""
+        LEFT JOIN LATERAL (
+            SELECT a.id, a.title
+            FROM location_closure c JOIN location_nodes a ON a.id = c.ancestor_id
+            WHERE c.descendant_id = n.id
+              AND a.kind IN ({", ".join(f"'{kind}'" for kind in kinds)})
+            ORDER BY c.depth
+            LIMIT 1
+        ) {level} ON true"""
+        for level, kinds in LEVELS.items()
+    )
+    op.execute(
+        f"""
+        INSERT INTO location_lineage (location_id, depth, {columns})
+        SELECT
+            n.id,
+            (SELECT max(c.depth) FROM location_closure c WHERE c.descendant_id = n.id),
+            {selected}
+        FROM location_nodes n
+        {joins}
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("location_lineage")
@@ -0,0 +1,82 @@
+"""Add per-location patient state counters.
+
+Revision ID: add_location_patient_counts
+Revises: add_property_value_storage
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_location_patient_counts"
+down_revision: str | Sequence[str] | None = "add_property_value_storage"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "location_patient_counts",
+        sa.Column(
+            "location_id",
+            sa.String(),
+            sa.ForeignKey("location_nodes.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("waiting", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("admitted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("discharged", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("deceased", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        WITH attachments AS (
+            SELECT id AS patient_id, clinic_id AS location_id
+            FROM patients WHERE deleted = false
+            UNION ALL
+            SELECT id, position_id FROM patients
+            WHERE deleted = false AND position_id IS NOT NULL
+            UNION ALL
+            SELECT id, assigned_location_id FROM patients
+            WHERE deleted = false AND assigned_location_id IS NOT NULL
+            UNION ALL
+            SELECT pl.patient_id, pl.location_id
+            FROM patient_locations pl JOIN patients p ON p.id = pl.patient_id
+            WHERE p.deleted = false
+            UNION ALL
+            SELECT pt.patient_id, pt.location_id
+            FROM patient_teams pt JOIN patients p ON p.id = pt.patient_id
+            WHERE p.deleted = false
+        ),
+        scoped AS (
+            SELECT DISTINCT lc.ancestor_id AS location_id, a.patient_id
+            FROM attachments a
+            JOIN location_closure lc ON lc.descendant_id = a.location_id
+        ),
+        counts AS (
+            SELECT
+                s.location_id,
+                count(*) FILTER (WHERE p.state = 'WAIT') AS waiting,
+                count(*) FILTER (WHERE p.state = 'ADMITTED') AS admitted,
+                count(*) FILTER (WHERE p.state = 'DISCHARGED') AS discharged,
+                count(*) FILTER (WHERE p.state = 'DEAD') AS deceased
+            FROM scoped s JOIN patients p ON p.id = s.patient_id
+            GROUP BY s.location_id
+        )
+        INSERT INTO location_patient_counts
+            (location_id, waiting, admitted, discharged, deceased)
+        SELECT
+            n.id,
+            coalesce(c.waiting, 0),
+            coalesce(c.admitted, 0),
+            coalesce(c.discharged, 0),
+            coalesce(c.deceased, 0)
+        FROM location_nodes n LEFT JOIN counts c ON c.location_id = n.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("location_patient_counts")
@@ -0,0 +1,50 @@
+"""Add patients.last_activity_at maintained from task writes.
+
+Revision ID: add_patient_last_activity
+Revises: add_location_patient_counts
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_patient_last_activity"
+down_revision: str | Sequence[str] | None = "add_location_patient_counts"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "patients",
+        sa.Column("last_activity_at", sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE patients p
+        SET last_activity_at = t.max_update_date
+        FROM (
+            SELECT patient_id, max(update_date) AS max_update_date
+            FROM tasks
+            WHERE patient_id IS NOT NULL
+            GROUP BY patient_id
+        ) t
+        WHERE t.patient_id = p.id
+        """
+    )
+    op.create_index(
+        "ix_patients_last_activity_at", "patients", ["last_activity_at"]
+    )
+    op.create_index(
+        "ix_patients_update_date",
+        "patients",
+        [sa.text("greatest(updated_at, last_activity_at)")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_patients_update_date", table_name="patients")
+    op.drop_index("ix_patients_last_activity_at", table_name="patients")
+    op.drop_column("patients", "last_activity_at")
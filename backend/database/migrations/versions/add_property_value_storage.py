@@ -0,0 +1,73 @@
+"""Add multi-select option table and typed property value indexes.
+
+Revision ID: add_property_value_storage
+Revises: add_filter_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_property_value_storage"
+down_revision: str | Sequence[str] | None = "add_filter_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# (name, value expression); every index leads with definition_id so a single
+# index serves the predicates of all definitions of that field type.
+VALUE_INDEXES = [
+    ("ix_property_values_definition_text", "text_value"),
+    ("ix_property_values_definition_number", "number_value"),
+    ("ix_property_values_definition_boolean", "boolean_value"),
+    ("ix_property_values_definition_date", "date(date_value)"),
+    ("ix_property_values_definition_date_time", "date_time_value"),
+    ("ix_property_values_definition_select", "select_value"),
+    ("ix_property_values_definition_user", "user_value"),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "property_value_options",
+        sa.Column(
+            "property_value_id",
+            sa.String(),
+            sa.ForeignKey("property_values.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("option", sa.String(), primary_key=True),
+    )
+    op.create_index(
+        "ix_property_value_options_option",
+        "property_value_options",
+        ["option"],
+    )
+    op.execute(
+        """
+        INSERT INTO property_value_options (property_value_id, option)
+        SELECT DISTINCT pv.id, o.option
+        FROM property_values pv,
+             unnest(string_to_array(pv.multi_select_values, ',')) AS o(option)
+        WHERE pv.multi_select_values IS NOT NULL AND o.option <> ''
+        """
+    )
+    for name, expression in VALUE_INDEXES:
+        column = expression.removeprefix("date(").removesuffix(")")
+        op.create_index(
+            name,
+            "property_values",
+            ["definition_id", sa.text(expression)],
+            postgresql_where=sa.text(f"{column} IS NOT NULL"),
+        )
+
+
+def downgrade() -> None:
+    for name, _expression in reversed(VALUE_INDEXES):
+        op.drop_index(name, table_name="property_values")
+    op.drop_index(
+        "ix_property_value_options_option", table_name="property_value_options"
+    )
+    op.drop_table("property_value_options")
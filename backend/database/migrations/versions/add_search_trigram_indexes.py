@@ -0,0 +1,61 @@
+"""Add search documents and trigram indexes.
+
+Revision ID: add_search_trigram_indexes
+Revises: add_location_closure
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "add_search_trigram_indexes"
+down_revision: str | Sequence[str] | None = "add_location_closure"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+SEARCH_DOCUMENTS = {
+    "tasks": "coalesce(title, '') || ' ' || coalesce(description, '')",
+    "patients": "firstname || ' ' || lastname || ' ' || coalesce(description, '')",
+    "users": (
+        "username || ' ' || coalesce(email, '') || ' '"
+        " || coalesce(firstname, '') || ' ' || coalesce(lastname, '')"
+    ),
+}
+
+TRIGRAM_INDEXES = [
+    ("ix_tasks_search_text_trgm", "tasks", "search_text"),
+    ("ix_patients_search_text_trgm", "patients", "search_text"),
+    ("ix_users_search_text_trgm", "users", "search_text"),
+    ("ix_property_values_text_value_trgm", "property_values", "text_value"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, expression in SEARCH_DOCUMENTS.items():
+        op.add_column(
+            table,
+            sa.Column(
+                "search_text",
+                sa.Text(),
+                sa.Computed(expression, persisted=True),
+            ),
+        )
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _column in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table)
+    for table in SEARCH_DOCUMENTS:
+        op.drop_column(table, "search_text")
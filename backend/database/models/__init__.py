@@ -1,8 +1,15 @@
 from .user import User, user_root_locations  # noqa: F401
-from .location import LocationNode, location_organizations  # noqa: F401
+from .location import (  # noqa: F401
+    LocationNode,
+    LINEAGE_LEVELS,
+    location_closure,
+    location_lineage,
+    location_organizations,
+    location_patient_counts,
+)
 from .patient import Patient, patient_locations, patient_teams  # noqa: F401
 from .task import Task, task_assignees, task_dependencies  # noqa: F401
-from .property import PropertyDefinition, PropertyValue  # noqa: F401
+from .property import PropertyDefinition, PropertyValue, property_value_options  # noqa: F401
 from .scaffold import ScaffoldImportState  # noqa: F401
 from .saved_view import SavedView  # noqa: F401
 from .task_preset import TaskPreset, TaskPresetScope  # noqa: F401
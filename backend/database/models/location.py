@@ -2,11 +2,25 @@ from __future__ import annotations
 
 import uuid
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from database.models.base import Base
-from sqlalchemy import Column, ForeignKey, String, Table, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    Table,
+    event,
+    func,
+    inspect,
+    literal,
+    or_,
+    select,
+    true,
+    Enum as SQLEnum,
+)
+from sqlalchemy.orm import Mapped, aliased, mapped_column, relationship
 
 if TYPE_CHECKING:
     from .patient import Patient
@@ -31,6 +45,64 @@ location_organizations = Table(
     Column("organization_id", String, primary_key=True),
 )
 
+location_closure = Table(
+    "location_closure",
+    Base.metadata,
+    Column("ancestor_id", ForeignKey("location_nodes.id"), primary_key=True),
+    Column(
+        "descendant_id",
+        ForeignKey("location_nodes.id"),
+        primary_key=True,
+        index=True,
+    ),
+    Column("depth", Integer, nullable=False),
+)
+
+# Non-deleted patients per state attached to a location's subtree, maintained
+# by PatientCountService.
+location_patient_counts = Table(
+    "location_patient_counts",
+    Base.metadata,
+    Column(
+        "location_id",
+        ForeignKey("location_nodes.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("waiting", Integer, nullable=False, default=0, server_default="0"),
+    Column("admitted", Integer, nullable=False, default=0, server_default="0"),
+    Column("discharged", Integer, nullable=False, default=0, server_default="0"),
+    Column("deceased", Integer, nullable=False, default=0, server_default="0"),
+)
+
+# Nearest enclosing location per level, including the location itself.
+LINEAGE_LEVELS: dict[str, tuple[str, ...]] = {
+    "clinic": ("CLINIC", "PRACTICE"),
+    "ward": ("WARD",),
+    "room": ("ROOM",),
+    "bed": ("BED",),
+}
+
+# Per-location projection of LINEAGE_LEVELS and the depth below the root,
+# maintained by the LocationNode listeners below.
+location_lineage = Table(
+    "location_lineage",
+    Base.metadata,
+    Column(
+        "location_id",
+        ForeignKey("location_nodes.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("depth", Integer, nullable=False),
+    *[
+        column
+        for level in LINEAGE_LEVELS
+        for column in (
+            Column(f"{level}_id", String, nullable=True, index=True),
+            Column(f"{level}_title", String, nullable=True),
+        )
+    ],
+)
+
 
 class LocationNode(Base):
     __tablename__ = "location_nodes"
@@ -47,6 +119,7 @@ class LocationNode(Base):
     parent_id: Mapped[str | None] = mapped_column(
         ForeignKey("location_nodes.id"),
         nullable=True,
+        index=True,
     )
 
     parent: Mapped[LocationNode | None] = relationship(
@@ -88,3 +161,135 @@ class LocationNode(Base):
         secondary="user_root_locations",
         back_populates="root_locations",
     )
+
+
+@event.listens_for(LocationNode, "after_insert")
+def _insert_location_closure(mapper, connection, target: LocationNode) -> None:
+    connection.execute(
+        location_closure.insert().values(
+            ancestor_id=target.id,
+            descendant_id=target.id,
+            depth=0,
+        )
+    )
+    connection.execute(location_patient_counts.insert().values(location_id=target.id))
+    if target.parent_id:
+        connection.execute(
+            location_closure.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    location_closure.c.ancestor_id,
+                    literal(target.id),
+                    location_closure.c.depth + 1,
+                ).where(location_closure.c.descendant_id == target.parent_id),
+            )
+        )
+
+
+@event.listens_for(LocationNode, "after_update")
+def _move_location_closure(mapper, connection, target: LocationNode) -> None:
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    subtree_ids = select(location_closure.c.descendant_id).where(
+        location_closure.c.ancestor_id == target.id
+    )
+    connection.execute(
+        location_closure.delete().where(
+            location_closure.c.descendant_id.in_(subtree_ids),
+            location_closure.c.ancestor_id.notin_(subtree_ids),
+        )
+    )
+    if target.parent_id:
+        above = aliased(location_closure)
+        below = aliased(location_closure)
+        connection.execute(
+            location_closure.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    above.c.ancestor_id,
+                    below.c.descendant_id,
+                    above.c.depth + below.c.depth + 1,
+                )
+                .select_from(above.join(below, true()))
+                .where(
+                    above.c.descendant_id == target.parent_id,
+                    below.c.ancestor_id == target.id,
+                ),
+            )
+        )
+
+
+@event.listens_for(LocationNode, "before_delete")
+def _delete_location_closure(mapper, connection, target: LocationNode) -> None:
+    connection.execute(
+        location_patient_counts.delete().where(
+            location_patient_counts.c.location_id == target.id
+        )
+    )
+    connection.execute(
+        location_lineage.delete().where(location_lineage.c.location_id == target.id)
+    )
+    connection.execute(
+        location_closure.delete().where(
+            or_(
+                location_closure.c.ancestor_id == target.id,
+                location_closure.c.descendant_id == target.id,
+            )
+        )
+    )
+
+
+def _lineage_select(location_ids: Any) -> Any:
+    nodes = LocationNode.__table__
+    columns: list[Any] = [
+        nodes.c.id,
+        select(func.max(location_closure.c.depth))
+        .where(location_closure.c.descendant_id == nodes.c.id)
+        .scalar_subquery(),
+    ]
+    for kinds in LINEAGE_LEVELS.values():
+        closure = aliased(location_closure)
+        ancestor = nodes.alias()
+        nearest = (
+            select(ancestor)
+            .join(closure, closure.c.ancestor_id == ancestor.c.id)
+            .where(closure.c.descendant_id == nodes.c.id, ancestor.c.kind.in_(kinds))
+            .order_by(closure.c.depth)
+            .limit(1)
+        )
+        columns.append(nearest.with_only_columns(ancestor.c.id).scalar_subquery())
+        columns.append(nearest.with_only_columns(ancestor.c.title).scalar_subquery())
+    return select(*columns).where(nodes.c.id.in_(location_ids))
+
+
+def refresh_location_lineage(connection, location_ids: Any) -> None:
+    """Recompute the lineage rows of ``location_ids`` (a list or a select)."""
+    connection.execute(
+        location_lineage.delete().where(location_lineage.c.location_id.in_(location_ids))
+    )
+    connection.execute(
+        location_lineage.insert().from_select(
+            [column.name for column in location_lineage.columns],
+            _lineage_select(location_ids),
+        )
+    )
+
+
+@event.listens_for(LocationNode, "after_insert")
+def _insert_location_lineage(mapper, connection, target: LocationNode) -> None:
+    refresh_location_lineage(connection, [target.id])
+
+
+@event.listens_for(LocationNode, "after_update")
+def _update_location_lineage(mapper, connection, target: LocationNode) -> None:
+    attrs = inspect(target).attrs
+    if not any(
+        attrs[name].history.has_changes() for name in ("parent_id", "kind", "title")
+    ):
+        return
+    refresh_location_lineage(
+        connection,
+        select(location_closure.c.descendant_id).where(
+            location_closure.c.ancestor_id == target.id
+        ),
+    )
@@ -2,10 +2,19 @@ from __future__ import annotations
 
 import uuid
 from datetime import date, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from database.models.base import Base
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Table
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    String,
+    Table,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -17,19 +26,34 @@ patient_locations = Table(
     "patient_locations",
     Base.metadata,
     Column("patient_id", ForeignKey("patients.id"), primary_key=True),
-    Column("location_id", ForeignKey("location_nodes.id"), primary_key=True),
+    Column(
+        "location_id",
+        ForeignKey("location_nodes.id"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 patient_teams = Table(
     "patient_teams",
     Base.metadata,
     Column("patient_id", ForeignKey("patients.id"), primary_key=True),
-    Column("location_id", ForeignKey("location_nodes.id"), primary_key=True),
+    Column(
+        "location_id",
+        ForeignKey("location_nodes.id"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
 class Patient(Base):
     __tablename__ = "patients"
+    # search_text is generated by the database and left expired after a
+    # flush; last_activity_at moves with every task write.
+    _checksum_exclude: ClassVar[frozenset[str]] = frozenset(
+        {"search_text", "last_activity_at"}
+    )
 
     id: Mapped[str] = mapped_column(
         String,
@@ -49,12 +73,19 @@ class Patient(Base):
     clinic_id: Mapped[str] = mapped_column(
         ForeignKey("location_nodes.id"),
         nullable=False,
+        index=True,
     )
     position_id: Mapped[str | None] = mapped_column(
         ForeignKey("location_nodes.id"),
         nullable=True,
     )
     description: Mapped[str | None] = mapped_column(String, nullable=True)
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        Computed(
+            "firstname || ' ' || lastname || ' ' || coalesce(description, '')"
+        ),
+    )
     updated_at: Mapped[datetime | None] = mapped_column(
         DateTime,
         nullable=True,
@@ -73,6 +104,11 @@ class Patient(Base):
         DateTime,
         nullable=True,
     )
+    last_activity_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        index=True,
+    )
 
     assigned_locations: Mapped[list[LocationNode]] = relationship(
         "LocationNode",
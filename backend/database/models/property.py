@@ -5,7 +5,7 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from database.models.base import Base
-from sqlalchemy import Boolean, Float, ForeignKey, String
+from sqlalchemy import Boolean, Column, Float, ForeignKey, String, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -13,6 +13,18 @@ if TYPE_CHECKING:
     from .task import Task
 
 
+property_value_options = Table(
+    "property_value_options",
+    Base.metadata,
+    Column(
+        "property_value_id",
+        ForeignKey("property_values.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("option", String, primary_key=True, index=True),
+)
+
+
 class PropertyDefinition(Base):
     __tablename__ = "property_definitions"
 
@@ -2,15 +2,32 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from database.models.base import Base
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Table
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    ForeignKey,
+    Integer,
+    String,
+    Table,
+    Text,
+    event,
+    func,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from .patient import Patient
 
 if TYPE_CHECKING:
     from .location import LocationNode
-    from .patient import Patient
     from .property import PropertyValue
     from .task_preset import TaskPreset
     from .user import User
@@ -26,12 +43,14 @@ task_assignees = Table(
     "task_assignees",
     Base.metadata,
     Column("task_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
-    Column("user_id", ForeignKey("users.id"), primary_key=True),
+    Column("user_id", ForeignKey("users.id"), primary_key=True, index=True),
 )
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Generated by the database and left expired after a flush.
+    _checksum_exclude: ClassVar[frozenset[str]] = frozenset({"search_text"})
 
     id: Mapped[str] = mapped_column(
         String,
@@ -47,6 +66,7 @@ class Task(Base):
         nullable=True,
         default=datetime.now,
         onupdate=datetime.now,
+        index=True,
     )
     assignee_team_id: Mapped[str | None] = mapped_column(
         ForeignKey("location_nodes.id"),
@@ -59,6 +79,10 @@ class Task(Base):
     )
     priority: Mapped[str | None] = mapped_column(String, nullable=True)
     estimated_time: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        Computed("coalesce(title, '') || ' ' || coalesce(description, '')"),
+    )
 
     assignees: Mapped[list[User]] = relationship(
         "User",
@@ -96,3 +120,48 @@ class Task(Base):
         secondaryjoin=id == task_dependencies.c.next_task_id,
         back_populates="previous_tasks",
     )
+
+
+def _refresh_last_activity(connection, target: Task, patient_ids: set[str | None]) -> None:
+    session = object_session(target)
+    for patient_id in patient_ids - {None}:
+        last_activity_at = connection.scalar(
+            select(func.max(Task.update_date)).where(Task.patient_id == patient_id)
+        )
+        # Pass updated_at through explicitly, otherwise Core applies its
+        # onupdate and a task write would look like a patient edit.
+        patients = Patient.__table__
+        connection.execute(
+            update(patients)
+            .where(patients.c.id == patient_id)
+            .values(last_activity_at=last_activity_at, updated_at=patients.c.updated_at)
+        )
+        if session is None:
+            continue
+        patient = session.identity_map.get(identity_key(Patient, patient_id))
+        if patient is not None:
+            set_committed_value(patient, "last_activity_at", last_activity_at)
+
+
+@event.listens_for(Task, "after_insert")
+def _task_inserted(mapper, connection, target: Task) -> None:
+    _refresh_last_activity(connection, target, {target.patient_id})
+
+
+@event.listens_for(Task, "after_update")
+def _task_updated(mapper, connection, target: Task) -> None:
+    session = object_session(target)
+    if session is not None and not session.is_modified(target, include_collections=False):
+        return
+    history = inspect(target).attrs.patient_id.history
+    _refresh_last_activity(
+        connection, target, {target.patient_id, *(history.deleted or ())}
+    )
+
+
+@event.listens_for(Task, "after_delete")
+def _task_deleted(mapper, connection, target: Task) -> None:
+    history = inspect(target).attrs.patient_id.history
+    _refresh_last_activity(
+        connection, target, {target.patient_id, *(history.deleted or ())}
+    )
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from database.models.base import Base
-from sqlalchemy import Column, DateTime, ForeignKey, String, Table
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, String, Table, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -23,6 +23,8 @@ user_root_locations = Table(
 
 class User(Base):
     __tablename__ = "users"
+    # Generated by the database and left expired after a flush.
+    _checksum_exclude: ClassVar[frozenset[str]] = frozenset({"search_text"})
 
     id: Mapped[str] = mapped_column(
         String,
@@ -34,6 +36,13 @@ class User(Base):
     firstname: Mapped[str | None] = mapped_column(String, nullable=True)
     lastname: Mapped[str | None] = mapped_column(String, nullable=True)
     title: Mapped[str | None] = mapped_column(String, nullable=True)
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        Computed(
+            "username || ' ' || coalesce(email, '') || ' '"
+            " || coalesce(firstname, '') || ' ' || coalesce(lastname, '')"
+        ),
+    )
     avatar_url: Mapped[str | None] = mapped_column(
         String,
         nullable=True,
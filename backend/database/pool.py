@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from config import (
+    DATABASE_POOL_HEALTH_CHECK_INTERVAL_SECONDS,
+    DATABASE_POOL_IDLE_TIMEOUT_SECONDS,
+    LOGGER,
+)
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(LOGGER)
+
+
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+    idle_recycled: int = 0
+    health_checks: int = 0
+    health_check_failures: int = 0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection.
+
+    Use ``instrumented_pool_class`` to get a subclass bound to a metrics
+    object; ``recreate()`` instantiates ``self.__class__`` so the binding
+    survives ``engine.dispose()``.
+    """
+
+    metrics: PoolMetrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.metrics.checkouts += 1
+            self.metrics.wait_seconds_total += waited
+            self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, waited)
+
+
+def instrumented_pool_class(metrics: PoolMetrics) -> type[InstrumentedQueuePool]:
+    return type("InstrumentedQueuePool", (InstrumentedQueuePool,), {"metrics": metrics})
+
+
+def install_idle_recycling(
+    engine: AsyncEngine,
+    metrics: PoolMetrics,
+    idle_timeout: float = DATABASE_POOL_IDLE_TIMEOUT_SECONDS,
+) -> None:
+    """Replace connections that sat idle in the pool for longer than
+    ``idle_timeout`` at checkout, before a server or firewall idle timeout can
+    kill them. Costs a clock read instead of a ``SELECT 1`` round trip."""
+    if idle_timeout <= 0:
+        return
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is not None and time.monotonic() - checked_in_at > idle_timeout:
+            metrics.idle_recycled += 1
+            # The pool discards the connection and retries with a fresh one.
+            raise exc.DisconnectionError("connection idle for too long")
+
+
+class PoolHealthChecker:
+    """Pings one pooled connection per engine every ``interval`` seconds.
+
+    A failed ping raises a disconnect error inside SQLAlchemy, which
+    invalidates every connection opened before it, so requests after a
+    database restart get fresh connections without pre-pinging each checkout.
+    """
+
+    def __init__(
+        self,
+        engines: dict[str, tuple[AsyncEngine, PoolMetrics]],
+        interval: float = DATABASE_POOL_HEALTH_CHECK_INTERVAL_SECONDS,
+    ):
+        self._engines = engines
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> None:
+        for name, (engine, metrics) in self._engines.items():
+            metrics.health_checks += 1
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            except (exc.DBAPIError, OSError) as e:
+                metrics.health_check_failures += 1
+                logger.warning(f"Database pool health check failed for {name}: {e}")
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.run_once()
+
+
+def pool_metrics_snapshot(
+    engines: dict[str, tuple[AsyncEngine, PoolMetrics]],
+) -> dict[str, dict[str, Any]]:
+    snapshot: dict[str, dict[str, Any]] = {}
+    for name, (engine, metrics) in engines.items():
+        pool = engine.pool
+        entry: dict[str, Any] = asdict(metrics)
+        entry["avg_wait_seconds"] = (
+            metrics.wait_seconds_total / metrics.checkouts if metrics.checkouts else 0.0
+        )
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        snapshot[name] = entry
+    return snapshot
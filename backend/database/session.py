@@ -1,10 +1,32 @@
 import logging
 from collections.abc import AsyncGenerator
+from typing import Any
 
 import redis.asyncio as redis
-from config import DATABASE_URL, REDIS_URL, LOGGER
+
+from config import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE_SECONDS,
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_TIMEOUT_SECONDS,
+    DATABASE_READ_REPLICA_URL,
+    DATABASE_STATEMENT_CACHE_SIZE,
+    DATABASE_STATEMENT_TIMEOUT_MS,
+    DATABASE_URL,
+    LOGGER,
+    REDIS_URL,
+)
 from database.models.base import Base
+from database.pool import (
+    PoolHealthChecker,
+    PoolMetrics,
+    install_idle_recycling,
+    instrumented_pool_class,
+)
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -12,9 +34,54 @@ from sqlalchemy.ext.asyncio import (
 
 logger = logging.getLogger(LOGGER)
 
-engine = create_async_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+
+def _create_engine(url: str, metrics: PoolMetrics) -> AsyncEngine:
+    parsed = make_url(url)
+    options: dict[str, Any] = {"echo": False, "pool_pre_ping": DATABASE_POOL_PRE_PING}
+    pooled = parsed.get_backend_name() == "postgresql"
+    if pooled:
+        options.update(
+            poolclass=instrumented_pool_class(metrics),
+            pool_size=DATABASE_POOL_SIZE,
+            max_overflow=DATABASE_MAX_OVERFLOW,
+            pool_timeout=DATABASE_POOL_TIMEOUT_SECONDS,
+            pool_recycle=DATABASE_POOL_RECYCLE_SECONDS,
+        )
+    if parsed.get_driver_name() == "asyncpg":
+        # SQLAlchemy keeps its own prepared statement cache on top of asyncpg's.
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(DATABASE_STATEMENT_CACHE_SIZE)}
+        )
+        options["connect_args"] = {
+            "statement_cache_size": DATABASE_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(DATABASE_STATEMENT_TIMEOUT_MS),
+            },
+        }
+    created = create_async_engine(parsed, **options)
+    if pooled:
+        install_idle_recycling(created, metrics)
+    return created
+
+
+engine_metrics = PoolMetrics()
+engine = _create_engine(DATABASE_URL, engine_metrics)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
+# Query resolvers and exports read through this; mutations always use
+# ``async_session``. Without a replica both point at the primary.
+pooled_engines: dict[str, tuple[AsyncEngine, PoolMetrics]] = {
+    "primary": (engine, engine_metrics),
+}
+read_engine = engine
+if DATABASE_READ_REPLICA_URL:
+    read_engine_metrics = PoolMetrics()
+    read_engine = _create_engine(DATABASE_READ_REPLICA_URL, read_engine_metrics)
+    pooled_engines["replica"] = (read_engine, read_engine_metrics)
+read_session = async_sessionmaker(read_engine, expire_on_commit=False)
+
+pool_health_checker = PoolHealthChecker(pooled_engines)
+
 redis_client = redis.from_url(
     REDIS_URL,
     decode_responses=True,
@@ -52,6 +119,34 @@ async def publish_to_redis(channel: str, message: str) -> None:
         raise
 
 
+async def publish_many_to_redis(messages: list[tuple[str, str]]) -> None:
+    """Publish ``(channel, message)`` pairs in one pipelined round trip."""
+    if not messages:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for channel, message in messages:
+                pipe.publish(channel, message)
+            await pipe.execute()
+        logger.debug(f"[SUBSCRIPTION] Published {len(messages)} messages to Redis")
+    except RuntimeError as e:
+        error_str = str(e)
+        if "Event loop is closed" in error_str or "attached to a different loop" in error_str:
+            logger.warning(
+                f"[SUBSCRIPTION] Skipping Redis publish of {len(messages)} messages due to event loop issue: error={error_str}"
+            )
+            return
+        logger.exception(
+            f"[SUBSCRIPTION] Failed to publish {len(messages)} messages to Redis: error={error_str}"
+        )
+        raise
+    except Exception:
+        logger.exception(
+            f"[SUBSCRIPTION] Failed to publish {len(messages)} messages to Redis"
+        )
+        raise
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
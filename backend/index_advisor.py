@@ -0,0 +1,213 @@
+"""Report sequential scans in the plans of representative list queries.
+
+Builds statements through ``apply_unified_query`` the same way the list
+resolvers do, runs ``EXPLAIN (FORMAT JSON)`` on each of them and flags every
+``Seq Scan`` node. Sequential scans are disabled for the session by default,
+so a remaining ``Seq Scan`` means no usable index exists, independent of the
+amount of data in the database.
+
+Usage: python index_advisor.py [--allow-seqscan]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from api.inputs import SortDirection
+from api.query.engine import apply_unified_query
+from api.query.enums import QueryOperator
+from api.query.inputs import (
+    QueryFilterClauseInput,
+    QueryFilterValueInput,
+    QuerySearchInput,
+    QuerySortClauseInput,
+)
+from api.query.patient_location_scope import (
+    build_location_descendants_cte,
+    scope_patients_to_locations,
+)
+from api.query.registry import PATIENT, TASK
+from database import models
+from database.session import async_session
+from sqlalchemy import Select, select
+
+PLACEHOLDER_ID = str(uuid.uuid4())
+
+
+@dataclass
+class Scenario:
+    name: str
+    entity: str
+    base: Callable[[], Select[Any]]
+    filters: list[QueryFilterClauseInput] = field(default_factory=list)
+    sorts: list[QuerySortClauseInput] = field(default_factory=list)
+    search: QuerySearchInput | None = None
+
+
+def _filter(key: str, operator: QueryOperator, **value: Any) -> QueryFilterClauseInput:
+    return QueryFilterClauseInput(
+        field_key=key, operator=operator, value=QueryFilterValueInput(**value)
+    )
+
+
+def _sort(key: str, direction: SortDirection) -> QuerySortClauseInput:
+    return QuerySortClauseInput(field_key=key, direction=direction)
+
+
+def _active_patients() -> Select[Any]:
+    return select(models.Patient).where(models.Patient.deleted.is_(False))
+
+
+def _patients_in_location() -> Select[Any]:
+    cte = build_location_descendants_cte([PLACEHOLDER_ID], cte_name="advisor_scope")
+    return scope_patients_to_locations(_active_patients(), cte)
+
+
+def _scenarios(property_ids: dict[str, str]) -> list[Scenario]:
+    scenarios = [
+        Scenario(
+            "tasks of a patient",
+            TASK,
+            lambda: select(models.Task),
+            filters=[_filter("patient", QueryOperator.EQ, uuid_value=PLACEHOLDER_ID)],
+        ),
+        Scenario(
+            "open tasks by due date",
+            TASK,
+            lambda: select(models.Task),
+            filters=[_filter("done", QueryOperator.EQ, bool_value=False)],
+            sorts=[_sort("dueDate", SortDirection.ASC)],
+        ),
+        Scenario(
+            "tasks of an assignee",
+            TASK,
+            lambda: select(models.Task),
+            filters=[_filter("assignee", QueryOperator.EQ, uuid_value=PLACEHOLDER_ID)],
+        ),
+        Scenario(
+            "recently updated tasks",
+            TASK,
+            lambda: select(models.Task),
+            sorts=[_sort("updateDate", SortDirection.DESC)],
+        ),
+        Scenario(
+            "task search",
+            TASK,
+            lambda: select(models.Task),
+            search=QuerySearchInput(search_text="blood", include_properties=True),
+        ),
+        Scenario(
+            "admitted patients",
+            PATIENT,
+            _active_patients,
+            filters=[_filter("state", QueryOperator.EQ, string_value="ADMITTED")],
+        ),
+        Scenario("patients in a location", PATIENT, _patients_in_location),
+        Scenario(
+            "patient search",
+            PATIENT,
+            _active_patients,
+            search=QuerySearchInput(search_text="doe"),
+        ),
+    ]
+    if "patient" in property_ids:
+        key = f"property_{property_ids['patient']}"
+        scenarios.append(
+            Scenario(
+                "patients by property",
+                PATIENT,
+                _active_patients,
+                filters=[_filter(key, QueryOperator.IS_NOT_NULL)],
+                sorts=[_sort(key, SortDirection.ASC)],
+            )
+        )
+    if "task" in property_ids:
+        key = f"property_{property_ids['task']}"
+        scenarios.append(
+            Scenario(
+                "tasks by property",
+                TASK,
+                lambda: select(models.Task),
+                filters=[_filter(key, QueryOperator.IS_NOT_NULL)],
+            )
+        )
+    return scenarios
+
+
+async def _load_property_ids(session: Any) -> dict[str, str]:
+    result = await session.execute(
+        select(
+            models.PropertyDefinition.id,
+            models.PropertyDefinition.allowed_entities,
+        ).where(models.PropertyDefinition.field_type == "FIELD_TYPE_TEXT")
+    )
+    ids: dict[str, str] = {}
+    for definition_id, allowed in result.all():
+        for entity in (allowed or "").split(","):
+            ids.setdefault(entity.strip().lower(), definition_id)
+    return ids
+
+
+def _seq_scans(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+async def _explain(session: Any, stmt: Select[Any]) -> dict[str, Any]:
+    connection = await session.connection()
+    sql = stmt.compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    raw = result.scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+async def run(allow_seqscan: bool) -> int:
+    flagged = 0
+    async with async_session() as session:
+        if not allow_seqscan:
+            connection = await session.connection()
+            await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        property_ids = await _load_property_ids(session)
+        for scenario in _scenarios(property_ids):
+            stmt = await apply_unified_query(
+                scenario.base(),
+                entity=scenario.entity,
+                db=session,
+                filters=scenario.filters,
+                sorts=scenario.sorts,
+                search=scenario.search,
+                pagination=None,
+            )
+            scans = list(_seq_scans(await _explain(session, stmt)))
+            status = "SEQ SCAN" if scans else "ok"
+            print(f"[{status}] {scenario.name}")
+            for scan in scans:
+                flagged += 1
+                detail = scan.get("Filter", "")
+                print(f"    {scan.get('Relation Name')}  {detail}".rstrip())
+        await session.rollback()
+    return 1 if flagged else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--allow-seqscan",
+        action="store_true",
+        help="keep the planner's default cost model instead of disabling seq scans",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.allow_seqscan)))
+
+
+if __name__ == "__main__":
+    main()
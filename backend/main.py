@@ -1,13 +1,23 @@
 import logging
 from contextlib import asynccontextmanager
+from typing import Annotated
 
-from api.context import get_context
-from api.extensions import GlobalAuthExtension
+from api.audit import audit_pipeline
+from api.context import Context, get_context
+from api.extensions import GlobalAuthExtension, ReadSessionExtension
 from api.resolvers import Mutation, Query, Subscription
 from api.router import AuthedGraphQLRouter
-from auth import UnauthenticatedRedirect, unauthenticated_redirect_handler
+from api.services.patient_counts import patient_count_reconciler
+from api.services.property_definitions import property_definition_cache
+from auth import (
+    UnauthenticatedRedirect,
+    jwks_client,
+    unauthenticated_redirect_handler,
+)
 from config import ALLOWED_ORIGINS, IS_DEV, LOGGER
-from fastapi import FastAPI, Request
+from database.pool import pool_metrics_snapshot
+from database.session import pool_health_checker, pooled_engines
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from routers import auth, export
@@ -22,15 +32,24 @@ logger = logging.getLogger(LOGGER)
 async def lifespan(app: FastAPI):
     logger.info("Starting up application...")
     await load_scaffold_data()
+    jwks_client.start()
+    property_definition_cache.start()
+    patient_count_reconciler.start()
+    pool_health_checker.start()
     yield
     logger.info("Shutting down application...")
+    await jwks_client.stop()
+    await property_definition_cache.stop()
+    await patient_count_reconciler.stop()
+    await pool_health_checker.stop()
+    await audit_pipeline.stop()
 
 
 schema = Schema(
     query=Query,
     mutation=Mutation,
     subscription=Subscription,
-    extensions=[GlobalAuthExtension],
+    extensions=[GlobalAuthExtension, ReadSessionExtension],
 )
 
 graphql_app = AuthedGraphQLRouter(
@@ -70,6 +89,16 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics(context: Annotated[Context, Depends(get_context)]):
+    if context.user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return {
+        "database_pools": pool_metrics_snapshot(pooled_engines),
+        "audit": audit_pipeline.metrics_snapshot(),
+    }
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
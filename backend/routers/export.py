@@ -2,8 +2,9 @@ from urllib.parse import quote
 
 from api.context import Context, get_context
 from api.export.schemas import ExportEntity, TableExportRequest
-from api.export.service import run_table_export
+from api.export.service import ExportStream, run_table_export, stream_table_export
 from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from graphql import GraphQLError
 
 router = APIRouter(prefix="/export", tags=["export"])
@@ -26,7 +27,10 @@ async def export_table(
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     try:
-        result = await run_table_export(context, entity, request)
+        if request.stream:
+            result = await stream_table_export(context, entity, request)
+        else:
+            result = await run_table_export(context, entity, request)
     except GraphQLError as error:
         code = (error.extensions or {}).get("code")
         raise HTTPException(
@@ -34,12 +38,19 @@ async def export_table(
             detail=error.message,
         ) from error
 
+    headers = {
+        "Content-Disposition": (
+            f"attachment; filename*=UTF-8''{quote(result.filename)}"
+        ),
+    }
+    if isinstance(result, ExportStream):
+        return StreamingResponse(
+            result.chunks,
+            media_type=result.media_type,
+            headers=headers,
+        )
     return Response(
         content=result.content,
         media_type=result.media_type,
-        headers={
-            "Content-Disposition": (
-                f"attachment; filename*=UTF-8''{quote(result.filename)}"
-            ),
-        },
+        headers=headers,
     )
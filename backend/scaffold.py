@@ -6,13 +6,18 @@ from pathlib import Path
 from typing import Any
 
 from api.inputs import LocationType
+from api.services.patient_counts import PatientCountService
 from config import (
     LOGGER,
     SCAFFOLD_DIRECTORY,
     SCAFFOLD_STRATEGY,
     ScaffoldStrategy,
 )
-from database.models.location import LocationNode, location_organizations
+from database.models.location import (
+    LocationNode,
+    location_closure,
+    location_organizations,
+)
 from database.models.patient import Patient, patient_locations, patient_teams
 from database.models.scaffold import ScaffoldImportState
 from database.models.task import Task
@@ -136,6 +141,12 @@ async def load_scaffold_data() -> None:
                         location_organizations.c.location_id == fallback_id
                     )
                 )
+                await session.execute(
+                    delete(location_closure).where(
+                        (location_closure.c.ancestor_id == fallback_id)
+                        | (location_closure.c.descendant_id == fallback_id)
+                    )
+                )
                 await session.execute(
                     delete(LocationNode).where(LocationNode.id == fallback_id)
                 )
@@ -246,6 +257,12 @@ async def load_scaffold_data() -> None:
                         location_organizations.c.location_id.in_(ids_to_delete)
                     )
                 )
+                await session.execute(
+                    delete(location_closure).where(
+                        location_closure.c.ancestor_id.in_(ids_to_delete)
+                        | location_closure.c.descendant_id.in_(ids_to_delete)
+                    )
+                )
                 await session.execute(
                     update(LocationNode)
                     .where(LocationNode.id.in_(ids_to_delete))
@@ -257,6 +274,9 @@ async def load_scaffold_data() -> None:
                     )
                 )
             await session.flush()
+            # The statements above move patients between locations without
+            # going through the counter bookkeeping.
+            await PatientCountService(session).reconcile()
 
         try:
             for item in payload:
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.pool import StaticPool
 
+from api.services.property_definitions import property_definition_cache
 from database.models.base import Base
 from database.models.location import LocationNode
 from database.models.patient import Patient
@@ -15,13 +16,14 @@ from api.inputs import Sex, PatientState
 
 
 @pytest.fixture
-async def db_session():
+async def db_session(monkeypatch):
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
     async_session = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(property_definition_cache, "session_factory", async_session)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -1,6 +1,8 @@
 import pytest
 from api.context import Context
+from api.resolvers import patient as patient_resolvers
 from api.resolvers.patient import PatientQuery, PatientMutation
+from api.services.patient_counts import PatientCountService
 from api.inputs import Sex, PatientState
 from database.models.property import PropertyDefinition, PropertyValue
 
@@ -30,8 +32,9 @@ async def test_patient_query_patients(db_session, sample_patient, sample_user_wi
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize("use_counters", [True, False])
 async def test_scoped_patient_counts(
-    db_session, sample_location, sample_user_with_location_access
+    monkeypatch, db_session, sample_location, sample_user_with_location_access, use_counters
 ):
     from datetime import date
 
@@ -56,6 +59,10 @@ async def test_scoped_patient_counts(
             )
         )
     await db_session.commit()
+    monkeypatch.setattr(patient_resolvers, "PATIENT_STATE_COUNTERS", use_counters)
+    if use_counters:
+        await PatientCountService(db_session).reconcile()
+        await db_session.commit()
 
     info = MockInfo(db_session, sample_user_with_location_access)
     query = PatientQuery()
@@ -1,9 +1,9 @@
-import asyncio
+from datetime import UTC, date, datetime
 
 import pytest
-
+import strawberry
 from api import audit as audit_module
-from api.audit import _schedule_audit_log, audit_log
+from api.audit import AuditLogger, AuditPipeline, AuditRecord, audit_log
 
 
 class _FakeUser:
@@ -22,14 +22,24 @@ class _Result:
     id = "entity-1"
 
 
-@pytest.mark.asyncio
-async def test_audit_log_returns_result_and_writes_in_background(monkeypatch):
-    calls: list[tuple] = []
+def _record(case_id: str) -> AuditRecord:
+    return AuditRecord(case_id, "activity", "user-1", None, datetime.now(UTC))
+
 
-    def fake_log_activity(case_id, activity_name, user_id=None, context=None):
-        calls.append((case_id, activity_name, user_id))
+def _serialize(record: AuditRecord) -> str:
+    return record.case_id
 
-    monkeypatch.setattr(audit_module.AuditLogger, "log_activity", fake_log_activity)
+
+@pytest.mark.asyncio
+async def test_audit_log_returns_result_and_writes_in_background(monkeypatch):
+    batches: list[list[str]] = []
+    pipeline = AuditPipeline(
+        writer=batches.append,
+        serializer=AuditLogger.to_line_protocol,
+        flush_interval=0.01,
+        spill_path=None,
+    )
+    monkeypatch.setattr(audit_module, "audit_pipeline", pipeline)
 
     @audit_log("update_patient")
     async def do_thing(self, info, id):
@@ -38,21 +48,101 @@ async def test_audit_log_returns_result_and_writes_in_background(monkeypatch):
     result = await do_thing(None, _FakeInfo(), id="entity-1")
 
     assert result.id == "entity-1"
-    pending = list(audit_module._pending_audit_tasks)
-    assert pending, "audit write must be scheduled off the response path"
+    assert pipeline.metrics.enqueued == 1
+
+    await pipeline.stop()
+    assert len(batches) == 1
+    assert "case_id=entity-1" in batches[0][0]
+    assert "activity=update_patient" in batches[0][0]
+    assert "user_id=user-1" in batches[0][0]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_batches_and_drops_when_full():
+    batches: list[list[str]] = []
+    pipeline = AuditPipeline(
+        writer=batches.append,
+        serializer=_serialize,
+        maxsize=3,
+        batch_size=10,
+        flush_interval=0.01,
+        spill_path=None,
+    )
+
+    accepted = [pipeline.submit(_record(f"case-{i}")) for i in range(5)]
+    await pipeline.stop()
+
+    assert accepted == [True, True, True, False, False]
+    assert batches == [["case-0", "case-1", "case-2"]]
+    assert pipeline.metrics_snapshot()["dropped"] == 2
 
-    await asyncio.gather(*pending)
-    assert calls == [("entity-1", "update_patient", "user-1")]
 
+@pytest.mark.asyncio
+async def test_pipeline_spills_when_unreachable_and_replays(tmp_path):
+    spill_path = tmp_path / "audit.lp"
+    written: list[str] = []
+    reachable = False
+
+    def writer(lines: list[str]) -> None:
+        if not reachable:
+            raise ConnectionError("influx down")
+        written.extend(lines)
+
+    pipeline = AuditPipeline(
+        writer=writer,
+        serializer=_serialize,
+        flush_interval=0.01,
+        spill_path=str(spill_path),
+    )
+
+    pipeline.submit(_record("case-1"))
+    await pipeline.flush()
+    assert spill_path.read_text().splitlines() == ["case-1"]
+    assert pipeline.metrics.spilled == 1
+
+    reachable = True
+    pipeline.submit(_record("case-2"))
+    await pipeline.stop()
+
+    assert written == ["case-1", "case-2"]
+    assert not spill_path.exists()
+    assert pipeline.metrics.replayed == 1
+
+
+def test_log_activity_writes_directly_without_running_loop(monkeypatch):
+    calls: list[list[str]] = []
+    monkeypatch.setattr(AuditLogger, "write_lines", classmethod(lambda cls, lines: calls.append(lines)))
+
+    AuditLogger.log_activity("case-1", "activity", "user-1", {})
 
-def test_schedule_audit_log_falls_back_without_running_loop(monkeypatch):
-    calls: list[str] = []
+    assert len(calls) == 1
+    assert "case_id=case-1" in calls[0][0]
+
+
+@strawberry.input
+class _SampleInput:
+    title: str
+    description: str | None = strawberry.UNSET
+    due: date | None = None
+
+
+@pytest.mark.asyncio
+async def test_audit_log_defers_payload_serialization(monkeypatch):
+    records: list[AuditRecord] = []
     monkeypatch.setattr(
-        audit_module.AuditLogger,
-        "log_activity",
-        lambda case_id, activity_name, user_id=None, context=None: calls.append(case_id),
+        audit_module.audit_pipeline, "submit", lambda record: records.append(record)
     )
 
-    _schedule_audit_log("case-1", "activity", "user-1", {})
+    @audit_log()
+    async def create_thing(self, info, data):
+        return _Result()
+
+    data = _SampleInput(title="Ward round", due=date(2026, 1, 2))
+    await create_thing(None, info=_FakeInfo(), data=data)
 
-    assert calls == ["case-1"]
+    assert records[0].activity_name == "create_thing"
+    assert records[0].payload == {"data": data}
+    line = AuditLogger.to_line_protocol(records[0])
+    assert '\\"title\\": \\"Ward round\\"' in line
+    assert "2026-01-02" in line
+    assert "description" not in line
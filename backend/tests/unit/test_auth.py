@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import auth
+import httpx
+import pytest
+from auth import JWKSClient, VerifiedTokenCache, verify_token
+from config import CLIENT_ID
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+
+def _generate_key(kid: str) -> tuple[bytes, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = kid
+    for field, value in public_jwk.items():
+        if isinstance(value, bytes):
+            public_jwk[field] = value.decode()
+    return private_pem, public_jwk
+
+
+class _JWKSServer:
+    def __init__(self, *keys: dict):
+        self.keys = list(keys)
+        self.requests = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"keys": self.keys})
+
+
+@pytest.fixture
+def signing_key():
+    return _generate_key("kid-1")
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_is_fetched_once_for_concurrent_requests(signing_key):
+    _, public_jwk = signing_key
+    server = _JWKSServer(public_jwk)
+    client = JWKSClient(
+        "http://issuer/certs", transport=httpx.MockTransport(server.handle)
+    )
+
+    keys = await asyncio.gather(*(client.get_key("kid-1") for _ in range(10)))
+
+    assert all(key is keys[0] for key in keys)
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_forced_fetches_are_rate_limited(signing_key):
+    _, public_jwk = signing_key
+    server = _JWKSServer(public_jwk)
+    client = JWKSClient(
+        "http://issuer/certs",
+        min_fetch_interval=60,
+        transport=httpx.MockTransport(server.handle),
+    )
+
+    for _ in range(3):
+        with pytest.raises(Exception, match="not found"):
+            await client.get_key("bogus")
+
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_rotated_key_is_picked_up_by_refresh(signing_key):
+    _, public_jwk = signing_key
+    server = _JWKSServer(public_jwk)
+    client = JWKSClient(
+        "http://issuer/certs",
+        min_fetch_interval=0,
+        transport=httpx.MockTransport(server.handle),
+    )
+    await client.refresh()
+
+    _, rotated_jwk = _generate_key("kid-2")
+    server.keys = [rotated_jwk]
+
+    assert await client.get_key("kid-2") is not None
+    with pytest.raises(Exception, match="not found"):
+        await client.get_key("kid-1")
+
+
+def test_verified_token_cache_respects_exp_and_size():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put("expired", {"exp": time.time() - 1})
+    cache.put("a", {"exp": time.time() + 60})
+    cache.put("b", {"exp": time.time() + 60})
+    cache.put("c", {"exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_verify_token_reuses_cached_payload(monkeypatch, signing_key):
+    private_pem, public_jwk = signing_key
+    server = _JWKSServer(public_jwk)
+    monkeypatch.setattr(
+        auth,
+        "jwks_client",
+        JWKSClient(
+            "http://issuer/certs", transport=httpx.MockTransport(server.handle)
+        ),
+    )
+    monkeypatch.setattr(auth, "verified_token_cache", VerifiedTokenCache())
+    token = jwt.encode(
+        {"sub": "user-1", "azp": CLIENT_ID, "exp": int(time.time()) + 60},
+        private_pem,
+        algorithm="RS256",
+        headers={"kid": "kid-1"},
+    )
+    decode_calls = 0
+    original_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        nonlocal decode_calls
+        decode_calls += 1
+        return original_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+
+    first = await verify_token(token)
+    second = await verify_token(token)
+
+    assert first["sub"] == second["sub"] == "user-1"
+    assert decode_calls == 1
+    assert server.requests == 1
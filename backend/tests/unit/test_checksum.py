@@ -19,3 +19,19 @@ async def test_validate_checksum_invalid(db_session, sample_task):
 @pytest.mark.asyncio
 async def test_validate_checksum_none(db_session, sample_task):
     validate_checksum(sample_task, None, "Task")
+
+
+@pytest.mark.asyncio
+async def test_checksum_after_update_matches_reload(db_session, sample_patient):
+    from api.types.base import calculate_checksum_for_instance
+    from database.models.patient import Patient
+
+    sample_patient.firstname = "Jane"
+    await db_session.commit()
+    checksum_after_update = calculate_checksum_for_instance(sample_patient)
+
+    db_session.expunge(sample_patient)
+    reloaded = await db_session.get(Patient, sample_patient.id)
+
+    assert reloaded is not sample_patient
+    assert calculate_checksum_for_instance(reloaded) == checksum_after_update
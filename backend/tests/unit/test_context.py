@@ -0,0 +1,74 @@
+import pytest
+from api.context import (
+    ResolvedUserCache,
+    _claims_hash,
+    _resolve_user_from_payload,
+    resolved_user_cache,
+)
+
+
+class _CountingSession:
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+        self.commits = 0
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+    async def commit(self):
+        self.commits += 1
+        return await self._session.commit()
+
+
+def _payload(user, **overrides):
+    payload = {
+        "sub": user.id,
+        "preferred_username": user.username,
+        "given_name": user.firstname,
+        "family_name": user.lastname,
+        "email": user.email,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _hash_for(payload):
+    return _claims_hash(
+        payload.get("preferred_username"),
+        payload.get("given_name"),
+        payload.get("family_name"),
+        payload.get("email"),
+        payload.get("picture"),
+        None,
+    )
+
+
+def test_cache_requires_matching_claims_and_ttl():
+    cache = ResolvedUserCache(ttl=60, last_online_interval=60)
+    cache.mark_synced("user-1", "hash-a")
+
+    assert cache.is_synced("user-1", "hash-a")
+    assert not cache.is_synced("user-1", "hash-b")
+    assert not cache.last_online_due("user-1")
+
+    expired = ResolvedUserCache(ttl=0, last_online_interval=0)
+    expired.mark_synced("user-1", "hash-a")
+    assert not expired.is_synced("user-1", "hash-a")
+    assert expired.last_online_due("user-1")
+
+
+@pytest.mark.asyncio
+async def test_synced_user_skips_profile_and_location_sync(db_session, sample_user):
+    payload = _payload(sample_user)
+    resolved_user_cache.mark_synced(sample_user.id, _hash_for(payload))
+    session = _CountingSession(db_session)
+    try:
+        user = await _resolve_user_from_payload(session, payload)
+    finally:
+        resolved_user_cache.invalidate(sample_user.id)
+
+    assert user.id == sample_user.id
+    assert session.executed == 1
+    assert session.commits == 0
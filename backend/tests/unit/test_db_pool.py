@@ -0,0 +1,86 @@
+import pytest
+from database.pool import (
+    PoolHealthChecker,
+    PoolMetrics,
+    install_idle_recycling,
+    instrumented_pool_class,
+    pool_metrics_snapshot,
+)
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+@pytest.fixture
+async def pooled_engine(tmp_path):
+    metrics = PoolMetrics()
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(metrics),
+        pool_size=1,
+        max_overflow=0,
+    )
+    yield engine, metrics
+    await engine.dispose()
+
+
+async def _select_one(engine):
+    async with engine.connect() as connection:
+        return (await connection.execute(text("SELECT 1"))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_checkouts_are_counted_and_survive_dispose(pooled_engine):
+    engine, metrics = pooled_engine
+
+    await _select_one(engine)
+    await engine.dispose()
+    await _select_one(engine)
+
+    snapshot = pool_metrics_snapshot({"primary": (engine, metrics)})["primary"]
+    assert snapshot["checkouts"] == 2
+    assert snapshot["size"] == 1
+    assert snapshot["checked_out"] == 0
+    assert snapshot["max_wait_seconds"] >= snapshot["avg_wait_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_are_replaced_at_checkout(pooled_engine):
+    engine, metrics = pooled_engine
+    install_idle_recycling(engine, metrics, idle_timeout=0.000001)
+
+    await _select_one(engine)
+    assert await _select_one(engine) == 1
+
+    assert metrics.idle_recycled == 1
+
+
+@pytest.mark.asyncio
+async def test_health_check_records_failures(pooled_engine, tmp_path):
+    engine, metrics = pooled_engine
+    broken_metrics = PoolMetrics()
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    checker = PoolHealthChecker(
+        {"primary": (engine, metrics), "broken": (broken, broken_metrics)}
+    )
+
+    await checker.run_once()
+
+    assert (metrics.health_checks, metrics.health_check_failures) == (1, 0)
+    assert (broken_metrics.health_checks, broken_metrics.health_check_failures) == (1, 1)
+    await broken.dispose()
+
+
+def test_metrics_requires_authentication():
+    from database.session import get_db_session
+    from fastapi.testclient import TestClient
+    from main import app
+
+    async def _no_db_session():
+        yield None
+
+    app.dependency_overrides[get_db_session] = _no_db_session
+    try:
+        response = TestClient(app).get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 401
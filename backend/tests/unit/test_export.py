@@ -219,6 +219,18 @@ def test_location_title_by_kind_missing_levels():
     assert location_title_by_kind(None, ("BED",), locations) is None
 
 
+def test_location_title_by_kind_prefers_lineage():
+    locations = {
+        "room-1": LocationInfo(
+            "Zimmer 12", "ROOM", None, lineage={"ward": "Station 3", "bed": None}
+        ),
+    }
+    assert (
+        location_title_by_kind("room-1", ("WARD",), locations) == "Station 3"
+    )
+    assert location_title_by_kind("room-1", ("BED",), locations) is None
+
+
 def test_number_formatting_uses_german_decimal_separator():
     ctx = make_context()
     assert format_cell_text(ExportCell(3.5, "number"), ctx) == "3,5"
@@ -354,3 +366,122 @@ async def test_run_table_export_tasks_xlsx_end_to_end(
     assert sheet.cell(row=5, column=1).value == "Test Task"
     assert sheet.cell(row=5, column=2).value == "John Doe"
     assert sheet.cell(row=5, column=3).value == "Nein"
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_stream_table_export_csv_matches_buffered_export(
+    db_session,
+    sample_patient,
+    sample_user_with_location_access,
+):
+    from api.context import Context
+    from api.export.schemas import TableExportRequest
+    from api.export.service import run_table_export, stream_table_export
+
+    context = Context(db=db_session, user=sample_user_with_location_access)
+    body = {
+        "format": "csv",
+        "columns": [
+            {"key": "name", "label": "Name"},
+            {"key": "clinic", "label": "Klinik"},
+        ],
+    }
+    buffered = await run_table_export(
+        context, "patients", TableExportRequest.model_validate(body),
+    )
+    streamed = await stream_table_export(
+        context,
+        "patients",
+        TableExportRequest.model_validate({**body, "stream": True}),
+    )
+
+    assert streamed.filename == buffered.filename
+    assert await _collect(streamed.chunks) == buffered.content
+
+
+@pytest.mark.asyncio
+async def test_stream_table_export_xlsx_uses_write_only_workbook(
+    db_session,
+    sample_task,
+    sample_user_with_location_access,
+):
+    from api.context import Context
+    from api.export.schemas import TableExportRequest
+    from api.export.service import stream_table_export
+
+    context = Context(db=db_session, user=sample_user_with_location_access)
+    request = TableExportRequest.model_validate({
+        "format": "xlsx",
+        "stream": True,
+        "columns": [
+            {"key": "title", "label": "Titel"},
+            {"key": "patient", "label": "Patient"},
+        ],
+        "title": "Meine Aufgaben",
+    })
+
+    streamed = await stream_table_export(context, "tasks", request)
+    workbook = load_workbook(io.BytesIO(await _collect(streamed.chunks)))
+    sheet = workbook.active
+
+    assert sheet.cell(row=1, column=1).value == "Meine Aufgaben"
+    assert sheet.cell(row=4, column=1).value == "Titel"
+    assert sheet.cell(row=5, column=1).value == "Test Task"
+    assert sheet.cell(row=5, column=2).value == "John Doe"
+    assert "1" in sheet.oddFooter.left.text
+
+
+@pytest.mark.asyncio
+async def test_stream_table_export_reads_batches_on_own_read_session(
+    db_session,
+    sample_task,
+    sample_user_with_location_access,
+    monkeypatch,
+):
+    from contextlib import asynccontextmanager
+
+    from api.context import Context
+    from api.export import service
+    from api.export.schemas import TableExportRequest
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    db_session.add(Task(id="task-2", title="Second Task", patient_id=sample_task.patient_id))
+    await db_session.commit()
+    monkeypatch.setattr(service, "EXPORT_STREAM_BATCH_SIZE", 1)
+
+    sessions = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    opened = []
+
+    @asynccontextmanager
+    async def read_session_factory():
+        async with sessions() as session:
+            opened.append(session)
+            yield session
+
+    context = Context(
+        db=db_session,
+        user=sample_user_with_location_access,
+        read_session_factory=read_session_factory,
+    )
+    request = TableExportRequest.model_validate({
+        "format": "xlsx",
+        "stream": True,
+        "columns": [{"key": "title", "label": "Titel"}],
+    })
+
+    streamed = await service.stream_table_export(context, "tasks", request)
+    assert len(opened) == 1
+    # The request session is busy or gone once the endpoint has returned.
+    async with context._db_lock:
+        content = await _collect(streamed.chunks)
+
+    assert len(opened) == 2
+    sheet = load_workbook(io.BytesIO(content)).active
+    assert sorted([sheet.cell(row=5, column=1).value, sheet.cell(row=6, column=1).value]) == [
+        "Second Task",
+        "Test Task",
+    ]
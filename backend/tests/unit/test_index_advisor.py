@@ -0,0 +1,38 @@
+import index_advisor
+import pytest
+from api.query.engine import apply_unified_query
+from sqlalchemy.dialects.postgresql import asyncpg
+
+
+def test_seq_scans_are_collected_from_nested_plans():
+    plan = {
+        "Node Type": "Hash Join",
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "tasks"},
+            {
+                "Node Type": "Hash",
+                "Plans": [{"Node Type": "Seq Scan", "Relation Name": "patients"}],
+            },
+        ],
+    }
+
+    scans = list(index_advisor._seq_scans(plan))
+
+    assert [scan["Relation Name"] for scan in scans] == ["patients"]
+
+
+@pytest.mark.asyncio
+async def test_scenarios_compile_with_literal_binds(db_session):
+    for scenario in index_advisor._scenarios({"patient": "def-1", "task": "def-2"}):
+        stmt = await apply_unified_query(
+            scenario.base(),
+            entity=scenario.entity,
+            db=db_session,
+            filters=scenario.filters,
+            sorts=scenario.sorts,
+            search=scenario.search,
+            pagination=None,
+        )
+        stmt.compile(
+            dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}
+        )
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+from api.inputs import SortDirection
+from api.query.adapters.task import apply_task_sorts
+from api.query.inputs import QuerySortClauseInput
+from api.query.keyset import (
+    apply_keyset_pagination,
+    decode_cursor,
+    encode_cursor,
+    sort_fingerprint,
+)
+from database.models.task import Task
+from graphql import GraphQLError
+from sqlalchemy import select
+
+SORTS = [
+    QuerySortClauseInput(field_key="dueDate", direction=SortDirection.DESC),
+    QuerySortClauseInput(field_key="description", direction=SortDirection.ASC),
+    QuerySortClauseInput(field_key="priority", direction=SortDirection.ASC),
+]
+
+
+async def _page(db_session, after, page_size=2):
+    stmt = apply_task_sorts(select(Task), SORTS, {}, {})
+    fingerprint = sort_fingerprint(SORTS)
+    stmt, key_count = apply_keyset_pagination(
+        stmt,
+        page_size=page_size,
+        page_index=0,
+        after=after,
+        fingerprint=fingerprint,
+    )
+    rows = (await db_session.execute(stmt)).all()
+    return [
+        (row[0].id, encode_cursor(row[1 : key_count + 1], fingerprint))
+        for row in rows
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_full_ordering(db_session, sample_patient):
+    due = [datetime(2026, 1, 2), None, datetime(2026, 1, 1), None]
+    descriptions = ["b", None, "a"]
+    priorities = ["P1", None, "P3"]
+    for i in range(9):
+        db_session.add(
+            Task(
+                id=f"task-{i}",
+                title=f"Task {i}",
+                patient_id=sample_patient.id,
+                due_date=due[i % len(due)],
+                description=descriptions[i % len(descriptions)],
+                priority=priorities[i % len(priorities)],
+            )
+        )
+    await db_session.commit()
+
+    expected = [task_id for task_id, _ in await _page(db_session, None, page_size=100)]
+
+    seen: list[str] = []
+    after = None
+    while True:
+        page = await _page(db_session, after)
+        if not page:
+            break
+        seen.extend(task_id for task_id, _ in page)
+        after = page[-1][1]
+
+    assert len(expected) == 9
+    assert seen == expected
+
+
+def test_cursor_round_trip_and_validation():
+    values = [datetime(2026, 1, 2, 8, 30), None, 3, "task-1"]
+    cursor = encode_cursor(values, "abc")
+
+    assert decode_cursor(cursor, "abc", 4) == values
+    with pytest.raises(GraphQLError):
+        decode_cursor(cursor, "other-sorts", 4)
+    with pytest.raises(GraphQLError):
+        decode_cursor("not-a-cursor", "abc", 4)
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from api.loaders import DataLoaders
+from database.models.location import LocationNode
+from database.models.task import Task
+
+
+class _CountingSession:
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_location_loader_batches_and_preserves_order(db_session, sample_location):
+    db_session.add(LocationNode(id="ward-1", title="Ward", kind="WARD", parent_id=sample_location.id))
+    await db_session.commit()
+    session = _CountingSession(db_session)
+    loaders = DataLoaders(session)
+
+    results = await asyncio.gather(
+        loaders.location_by_id.load("ward-1"),
+        loaders.location_by_id.load("missing"),
+        loaders.location_by_id.load(sample_location.id),
+    )
+
+    assert [r.id if r else None for r in results] == ["ward-1", None, sample_location.id]
+    assert session.executed == 1
+
+
+@pytest.mark.asyncio
+async def test_patient_tasks_loader_groups_by_patient(db_session, sample_patient):
+    db_session.add(Task(id="task-a", title="A", patient_id=sample_patient.id))
+    db_session.add(Task(id="task-b", title="B", patient_id=sample_patient.id, done=True))
+    await db_session.commit()
+    session = _CountingSession(db_session)
+    loaders = DataLoaders(session)
+
+    tasks, empty = await asyncio.gather(
+        loaders.patient_tasks.load(sample_patient.id),
+        loaders.patient_tasks.load("other-patient"),
+    )
+
+    assert {t.id for t in tasks} == {"task-a", "task-b"}
+    assert empty == []
+    assert session.executed == 1
@@ -0,0 +1,90 @@
+import pytest
+from api.query.patient_location_scope import (
+    build_location_descendants_cte,
+    load_location_descendant_ids,
+)
+from database.models.location import LocationNode, location_closure
+from sqlalchemy import select
+
+
+async def _closure_rows(db_session) -> set[tuple[str, str, int]]:
+    result = await db_session.execute(
+        select(
+            location_closure.c.ancestor_id,
+            location_closure.c.descendant_id,
+            location_closure.c.depth,
+        )
+    )
+    return {tuple(row) for row in result.all()}
+
+
+async def _create_tree(db_session) -> None:
+    db_session.add(LocationNode(id="clinic", title="Clinic", kind="CLINIC"))
+    await db_session.flush()
+    db_session.add(LocationNode(id="ward", title="Ward", kind="WARD", parent_id="clinic"))
+    await db_session.flush()
+    db_session.add(LocationNode(id="room", title="Room", kind="ROOM", parent_id="ward"))
+    await db_session.flush()
+    db_session.add(LocationNode(id="bed", title="Bed", kind="BED", parent_id="room"))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_insert_maintains_closure(db_session):
+    await _create_tree(db_session)
+
+    rows = await _closure_rows(db_session)
+
+    assert ("clinic", "clinic", 0) in rows
+    assert ("clinic", "bed", 3) in rows
+    assert ("ward", "bed", 2) in rows
+    assert ("room", "bed", 1) in rows
+    assert len(rows) == 10
+
+
+@pytest.mark.asyncio
+async def test_move_subtree_updates_closure(db_session):
+    await _create_tree(db_session)
+    db_session.add(LocationNode(id="ward-2", title="Ward 2", kind="WARD", parent_id="clinic"))
+    await db_session.commit()
+
+    room = await db_session.get(LocationNode, "room")
+    room.parent_id = "ward-2"
+    await db_session.commit()
+
+    assert await load_location_descendant_ids(db_session, ["ward"]) == {"ward"}
+    assert await load_location_descendant_ids(db_session, ["ward-2"]) == {
+        "ward-2",
+        "room",
+        "bed",
+    }
+    rows = await _closure_rows(db_session)
+    assert ("clinic", "bed", 3) in rows
+    assert ("ward", "bed", 2) not in rows
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_closure_rows(db_session):
+    await _create_tree(db_session)
+
+    bed = await db_session.get(LocationNode, "bed")
+    await db_session.delete(bed)
+    await db_session.commit()
+
+    rows = await _closure_rows(db_session)
+    assert all("bed" not in (ancestor, descendant) for ancestor, descendant, _ in rows)
+    assert await load_location_descendant_ids(db_session, ["clinic"]) == {
+        "clinic",
+        "ward",
+        "room",
+    }
+
+
+@pytest.mark.asyncio
+async def test_build_location_descendants_cte_expands_subtree(db_session):
+    await _create_tree(db_session)
+
+    cte = build_location_descendants_cte(["ward"])
+    result = await db_session.execute(select(cte.c.id))
+
+    assert {row[0] for row in result.all()} == {"ward", "room", "bed"}
@@ -0,0 +1,93 @@
+import pytest
+from api.inputs import SortDirection
+from api.query.engine import apply_unified_query
+from api.query.inputs import QuerySortClauseInput
+from api.query.registry import PATIENT
+from database import models
+from database.models.location import LocationNode
+from database.models.patient import Patient
+from sqlalchemy import select
+
+
+async def _lineage(db_session, location_id):
+    result = await db_session.execute(
+        select(models.location_lineage).where(
+            models.location_lineage.c.location_id == location_id
+        )
+    )
+    return result.one()
+
+
+@pytest.fixture
+async def beds(db_session, sample_location):
+    db_session.add_all(
+        [
+            LocationNode(id="ward-1", title="Ward B", kind="WARD", parent_id=sample_location.id),
+            LocationNode(id="ward-2", title="Ward A", kind="WARD", parent_id=sample_location.id),
+            LocationNode(id="room-1", title="Room 1", kind="ROOM", parent_id="ward-1"),
+            LocationNode(id="bed-1", title="Bed 1", kind="BED", parent_id="room-1"),
+        ]
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_lineage_follows_inserts_renames_and_moves(db_session, beds):
+    row = await _lineage(db_session, "bed-1")
+    assert row.depth == 3
+    assert (row.clinic_title, row.ward_title, row.room_title, row.bed_title) == (
+        "Test Clinic",
+        "Ward B",
+        "Room 1",
+        "Bed 1",
+    )
+
+    ward = await db_session.get(LocationNode, "ward-1")
+    ward.title = "Ward C"
+    await db_session.commit()
+    assert (await _lineage(db_session, "bed-1")).ward_title == "Ward C"
+
+    room = await db_session.get(LocationNode, "room-1")
+    room.parent_id = "ward-2"
+    await db_session.commit()
+    row = await _lineage(db_session, "bed-1")
+    assert (row.ward_id, row.ward_title) == ("ward-2", "Ward A")
+
+    await db_session.delete(await db_session.get(LocationNode, "bed-1"))
+    await db_session.commit()
+    result = await db_session.execute(
+        select(models.location_lineage.c.location_id).where(
+            models.location_lineage.c.location_id == "bed-1"
+        )
+    )
+    assert result.first() is None
+
+
+@pytest.mark.asyncio
+async def test_patients_sort_by_ward_title(db_session, sample_patient, beds):
+    sample_patient.position_id = "bed-1"
+    db_session.add(
+        Patient(
+            id="patient-2",
+            firstname="Jane",
+            lastname="Doe",
+            birthdate=sample_patient.birthdate,
+            sex=sample_patient.sex,
+            clinic_id=sample_patient.clinic_id,
+            position_id="ward-2",
+        )
+    )
+    await db_session.commit()
+
+    stmt = await apply_unified_query(
+        select(Patient),
+        entity=PATIENT,
+        db=db_session,
+        filters=None,
+        sorts=[QuerySortClauseInput(field_key="location-WARD", direction=SortDirection.ASC)],
+        search=None,
+        pagination=None,
+    )
+    result = await db_session.execute(stmt)
+
+    assert [p.id for p in result.scalars().all()] == ["patient-2", "patient-1"]
@@ -0,0 +1,58 @@
+import pytest
+from api.services.notifications import EntityNotification, load_notification_scope
+from api.services.subscription import (
+    patient_belongs_to_root_locations,
+    subscribe_with_location_filter,
+)
+
+
+def test_entity_notification_round_trip():
+    message = EntityNotification("task-1", "patient-1", ["ward", "clinic"]).encode()
+
+    decoded = EntityNotification.decode(message)
+
+    assert decoded == "task-1"
+    assert decoded.patient_id == "patient-1"
+    assert decoded.location_ids == {"ward", "clinic"}
+
+
+def test_entity_notification_accepts_bare_ids():
+    decoded = EntityNotification.decode("task-1")
+
+    assert decoded == "task-1"
+    assert decoded.location_ids is None
+    assert EntityNotification("task-1").encode() == "task-1"
+
+
+@pytest.mark.asyncio
+async def test_load_notification_scope(db_session, sample_task, sample_patient):
+    assert await load_notification_scope(db_session, "task", sample_task.id) == (
+        sample_patient.id,
+        [sample_patient.clinic_id],
+    )
+    assert await load_notification_scope(
+        db_session, "patient", sample_patient.id
+    ) == (sample_patient.id, [sample_patient.clinic_id])
+    assert await load_notification_scope(db_session, "location_node", "x") == (
+        None,
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_location_filter_uses_published_scope(db_session, sample_location):
+    async def messages():
+        yield EntityNotification("inside", None, [sample_location.id])
+        yield EntityNotification("outside", None, ["elsewhere"])
+
+    received = [
+        entity_id
+        async for entity_id in subscribe_with_location_filter(
+            messages(),
+            db_session,
+            [sample_location.id],
+            patient_belongs_to_root_locations,
+        )
+    ]
+
+    assert received == ["inside"]
@@ -0,0 +1,165 @@
+import pytest
+from api.services.patient_counts import PatientCountService
+from database import models
+from database.models.location import LocationNode
+from database.models.patient import Patient
+from sqlalchemy import insert, select
+
+
+@pytest.fixture
+async def wards(db_session, sample_location):
+    for ward_id in ("ward-1", "ward-2"):
+        db_session.add(
+            LocationNode(id=ward_id, title=ward_id, kind="WARD", parent_id=sample_location.id)
+        )
+    db_session.add(LocationNode(id="team-1", title="Team", kind="TEAM"))
+    await db_session.commit()
+
+
+async def _counters(db_session):
+    result = await db_session.execute(select(models.location_patient_counts))
+    return {row.location_id: tuple(row[1:]) for row in result.all()}
+
+
+def _patient(patient_id, template, **kwargs):
+    return Patient(
+        id=patient_id,
+        firstname="P",
+        lastname=patient_id,
+        birthdate=template.birthdate,
+        sex=template.sex,
+        state=kwargs.pop("state", "WAIT"),
+        clinic_id=template.clinic_id,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_incremental_changes_match_reconciliation(db_session, sample_patient, wards):
+    service = PatientCountService(db_session)
+    await service.reconcile()
+    await db_session.commit()
+    assert (await _counters(db_session))["location-1"] == (0, 1, 0, 0)
+
+    patient = _patient("patient-2", sample_patient, position_id="ward-1")
+    db_session.add(patient)
+    await service.record_change(patient, None)
+    await db_session.commit()
+
+    before = await service.snapshot(patient.id)
+    patient.state = "ADMITTED"
+    patient.position_id = "ward-2"
+    await service.record_change(patient, before)
+    await db_session.commit()
+
+    before = await service.snapshot(patient.id)
+    await db_session.execute(
+        insert(models.patient_teams),
+        [{"patient_id": patient.id, "location_id": "team-1"}],
+    )
+    await service.record_change(patient, before)
+    await db_session.commit()
+
+    before = await service.snapshot(sample_patient.id)
+    sample_patient.deleted = True
+    await service.record_change(sample_patient, before)
+    await db_session.commit()
+
+    incremental = await _counters(db_session)
+    assert incremental["location-1"] == (0, 1, 0, 0)
+    assert incremental["ward-1"] == (0, 0, 0, 0)
+    assert incremental["ward-2"] == (0, 1, 0, 0)
+    assert incremental["team-1"] == (0, 1, 0, 0)
+
+    await service.reconcile()
+    await db_session.commit()
+    assert await _counters(db_session) == incremental
+
+
+@pytest.mark.asyncio
+async def test_scoped_counts_use_outermost_root(db_session, sample_patient, wards):
+    service = PatientCountService(db_session)
+    await service.reconcile()
+    await db_session.commit()
+
+    assert await service.scoped_counts(["ward-1", "location-1"]) == {
+        "WAIT": 0,
+        "ADMITTED": 1,
+        "DISCHARGED": 0,
+        "DEAD": 0,
+    }
+    assert await service.scoped_counts(["location-1", "team-1"]) is None
+
+
+@pytest.mark.asyncio
+async def test_reconcile_updates_rows_in_place(db_session, sample_patient, wards):
+    counts = models.location_patient_counts
+    await db_session.execute(
+        counts.update().where(counts.c.location_id == "ward-1").values(waiting=5)
+    )
+    await db_session.execute(
+        counts.update().where(counts.c.location_id == "location-1").values(admitted=7)
+    )
+    await db_session.execute(counts.delete().where(counts.c.location_id == "team-1"))
+
+    service = PatientCountService(db_session)
+    await service.reconcile(["ward-1"])
+    counters = await _counters(db_session)
+    assert counters["ward-1"] == (0, 0, 0, 0)
+    assert counters["location-1"] == (0, 1, 0, 0)
+    assert "team-1" not in counters
+
+    await service.reconcile()
+    assert (await _counters(db_session))["team-1"] == (0, 0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_scoped_reconcile_after_move(db_session, sample_patient, wards):
+    service = PatientCountService(db_session)
+    await service.reconcile()
+    before = await service.snapshot(sample_patient.id)
+    sample_patient.position_id = "ward-1"
+    await service.record_change(sample_patient, before)
+    await db_session.commit()
+    assert (await _counters(db_session))["team-1"] == (0, 0, 0, 0)
+
+    ward = await db_session.get(LocationNode, "ward-1")
+    ward.parent_id = "team-1"
+    await db_session.flush()
+    await service.reconcile(["location-1", "team-1"])
+    await db_session.commit()
+
+    counters = await _counters(db_session)
+    assert counters["team-1"] == (0, 1, 0, 0)
+    assert counters["ward-1"] == (0, 1, 0, 0)
+    assert counters["location-1"] == (0, 1, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_move_locks_changed_counters_once_in_order(db_session, sample_patient, wards):
+    from sqlalchemy.dialects import postgresql
+
+    service = PatientCountService(db_session)
+    before = await service.snapshot(sample_patient.id)
+    sample_patient.position_id = "ward-2"
+
+    statements = []
+    execute = db_session.execute
+
+    async def recording_execute(statement, *args, **kwargs):
+        statements.append(statement)
+        return await execute(statement, *args, **kwargs)
+
+    db_session.execute = recording_execute
+    await service.record_change(sample_patient, before)
+
+    locks = [s for s in statements if getattr(s, "_for_update_arg", None) is not None]
+    counter_locks = [s for s in locks if "location_patient_counts" in str(s)]
+    assert len(counter_locks) == 1
+    compiled = counter_locks[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    assert "ORDER BY location_patient_counts.location_id" in str(compiled)
+    assert "FOR UPDATE" in str(compiled)
+    assert "'ward-2'" in str(compiled)
+    assert "'location-1'" not in str(compiled)
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+from database.models.patient import Patient
+from database.models.task import Task
+from sqlalchemy import select
+
+
+async def _stored_last_activity(db_session, patient_id):
+    result = await db_session.execute(
+        select(Patient.__table__.c.last_activity_at).where(
+            Patient.__table__.c.id == patient_id
+        )
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_last_activity_follows_task_writes(db_session, sample_patient):
+    assert sample_patient.last_activity_at is None
+
+    early = Task(
+        id="task-a", title="A", patient_id=sample_patient.id, update_date=datetime(2026, 1, 1)
+    )
+    late = Task(
+        id="task-b", title="B", patient_id=sample_patient.id, update_date=datetime(2026, 3, 1)
+    )
+    db_session.add_all([early, late])
+    await db_session.commit()
+    assert await _stored_last_activity(db_session, sample_patient.id) == datetime(2026, 3, 1)
+
+    early.title = "A2"
+    await db_session.flush()
+    assert sample_patient.last_activity_at == early.update_date
+    assert early.update_date > datetime(2026, 3, 1)
+
+    await db_session.delete(early)
+    await db_session.commit()
+    assert await _stored_last_activity(db_session, sample_patient.id) == datetime(2026, 3, 1)
+
+    late.patient_id = None
+    late.update_date = datetime(2026, 4, 1)
+    await db_session.commit()
+    assert await _stored_last_activity(db_session, sample_patient.id) is None
+
+
+@pytest.mark.asyncio
+async def test_task_write_keeps_patient_checksum(db_session, sample_patient):
+    from api.types.base import calculate_checksum_for_instance
+
+    updated_at = sample_patient.updated_at
+    checksum = calculate_checksum_for_instance(sample_patient)
+
+    task = Task(id="task-a", title="A", patient_id=sample_patient.id)
+    db_session.add(task)
+    await db_session.commit()
+    task.title = "A2"
+    await db_session.commit()
+    await db_session.delete(task)
+    await db_session.commit()
+
+    db_session.expunge(sample_patient)
+    reloaded = await db_session.get(Patient, sample_patient.id)
+    assert reloaded.updated_at == updated_at
+    assert calculate_checksum_for_instance(reloaded) == checksum
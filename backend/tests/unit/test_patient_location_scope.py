@@ -0,0 +1,43 @@
+import pytest
+from api.query import patient_location_scope
+from api.services.authorization import AuthorizationService
+from database import models
+from database.models.location import LocationNode
+from sqlalchemy import insert, select
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("semi_joins", [True, False])
+async def test_patient_access_filter_does_not_duplicate_patients(
+    monkeypatch, db_session, sample_user, sample_patient, sample_location, semi_joins
+):
+    monkeypatch.setattr(patient_location_scope, "QUERY_SEMI_JOINS", semi_joins)
+    for i in range(2):
+        db_session.add(
+            LocationNode(
+                id=f"ward-{i}", title=f"Ward {i}", kind="WARD", parent_id=sample_location.id
+            )
+        )
+    await db_session.commit()
+    await db_session.execute(
+        insert(models.patient_locations),
+        [{"patient_id": sample_patient.id, "location_id": f"ward-{i}"} for i in range(2)],
+    )
+    await db_session.execute(
+        insert(models.patient_teams),
+        [{"patient_id": sample_patient.id, "location_id": f"ward-{i}"} for i in range(2)],
+    )
+
+    query = AuthorizationService(db_session).filter_patients_by_access(
+        sample_user, select(models.Patient), {"ward-1"}
+    )
+    result = await db_session.execute(query)
+
+    assert [p.id for p in result.scalars().all()] == [sample_patient.id]
+
+    query = AuthorizationService(db_session).filter_patients_by_access(
+        sample_user, select(models.Patient), {"elsewhere"}
+    )
+    result = await db_session.execute(query)
+
+    assert result.scalars().all() == []
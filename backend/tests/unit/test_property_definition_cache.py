@@ -0,0 +1,117 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from api.services.property_definitions import (
+    PROPERTY_DEFINITIONS_CHANNEL,
+    PropertyDefinitionCache,
+)
+from database.models.property import PropertyDefinition
+
+
+class _CountingSessionFactory:
+    """Hands out the test session and counts the statements run on it."""
+
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        yield self
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.get(*args, **kwargs)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+@pytest.fixture
+async def definition(db_session):
+    definition = PropertyDefinition(
+        id="def-1",
+        name="Diet",
+        field_type="FIELD_TYPE_SELECT",
+        allowed_entities="PATIENT,TASK",
+    )
+    db_session.add(definition)
+    await db_session.commit()
+    return definition
+
+
+@pytest.mark.asyncio
+async def test_definitions_are_loaded_once(db_session, definition):
+    session = _CountingSessionFactory(db_session)
+    cache = PropertyDefinitionCache(_FakeRedis(), session_factory=session)
+
+    for _ in range(3):
+        definitions = await cache.all()
+
+    assert definitions["def-1"].field_type == "FIELD_TYPE_SELECT"
+    assert definitions["def-1"].allows("TASK")
+    assert session.executed == 1
+
+
+@pytest.mark.asyncio
+async def test_version_message_reloads_definitions(db_session, definition):
+    session = _CountingSessionFactory(db_session)
+    redis = _FakeRedis()
+    cache = PropertyDefinitionCache(redis, session_factory=session)
+    await cache.all()
+
+    cache.on_message(PROPERTY_DEFINITIONS_CHANNEL, "0")
+    await cache.all()
+    assert session.executed == 1
+
+    definition.name = "Nutrition"
+    await db_session.commit()
+    await redis.incr("property_definitions:version")
+    cache.on_message(PROPERTY_DEFINITIONS_CHANNEL, "1")
+
+    assert (await cache.all())["def-1"].name == "Nutrition"
+    assert session.executed == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_copy_is_kept_while_version_is_unchanged(db_session, definition):
+    session = _CountingSessionFactory(db_session)
+    cache = PropertyDefinitionCache(_FakeRedis(), ttl=0, session_factory=session)
+
+    await cache.all()
+    await cache.all()
+
+    assert session.executed == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_definition_is_looked_up_alone(db_session, definition):
+    session = _CountingSessionFactory(db_session)
+    cache = PropertyDefinitionCache(_FakeRedis(), session_factory=session)
+    await cache.all()
+
+    db_session.add(PropertyDefinition(id="def-2", name="Room", field_type="FIELD_TYPE_TEXT"))
+    await db_session.commit()
+
+    assert (await cache.get("def-2")).name == "Room"
+    assert session.executed == 2
+
+    assert (await cache.all())["def-2"].name == "Room"
+    assert await cache.get("def-missing") is None
+    assert await cache.get("def-missing") is None
+    assert session.executed == 4
+    assert len(await cache.all()) == 2
+    assert session.executed == 4
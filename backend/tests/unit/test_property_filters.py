@@ -0,0 +1,126 @@
+import pytest
+from api.inputs import PropertyValueInput, SortDirection
+from api.query import property_sql
+from api.query.engine import apply_unified_query
+from api.query.enums import QueryOperator
+from api.query.inputs import (
+    QueryFilterClauseInput,
+    QueryFilterValueInput,
+    QuerySortClauseInput,
+)
+from api.query.registry import PATIENT
+from api.services.property import PropertyService
+from database import models
+from database.models.patient import Patient
+from database.models.property import PropertyDefinition
+from sqlalchemy import select
+
+
+@pytest.fixture
+async def tagged_patients(db_session, sample_patient):
+    db_session.add(
+        PropertyDefinition(id="tags", name="Tags", field_type="FIELD_TYPE_MULTI_SELECT")
+    )
+    db_session.add(PropertyDefinition(id="score", name="Score", field_type="FIELD_TYPE_NUMBER"))
+    for i in range(2, 5):
+        db_session.add(
+            Patient(
+                id=f"patient-{i}",
+                firstname="P",
+                lastname=str(i),
+                birthdate=sample_patient.birthdate,
+                sex=sample_patient.sex,
+                state=sample_patient.state,
+                clinic_id=sample_patient.clinic_id,
+            )
+        )
+    await db_session.commit()
+    values = {
+        "patient-1": (["a", "b"], 3),
+        "patient-2": (["ab"], 1),
+        "patient-3": (["b"], None),
+    }
+    service = PropertyService(db_session)
+    for patient_id, (tags, score) in values.items():
+        patient = await db_session.get(Patient, patient_id)
+        props = [PropertyValueInput(definition_id="tags", multi_select_values=tags)]
+        if score is not None:
+            props.append(PropertyValueInput(definition_id="score", number_value=score))
+        await service.process_properties(patient, props, "patient")
+    await db_session.commit()
+
+
+async def _patient_ids(db_session, filters=None, sorts=None):
+    stmt = await apply_unified_query(
+        select(Patient),
+        entity=PATIENT,
+        db=db_session,
+        filters=filters,
+        sorts=sorts,
+        search=None,
+        pagination=None,
+    )
+    result = await db_session.execute(stmt)
+    return [p.id for p in result.scalars().all()]
+
+
+def _filter(key, operator, **value):
+    return QueryFilterClauseInput(
+        field_key=f"property_{key}",
+        operator=operator,
+        value=QueryFilterValueInput(**value) if value else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_multi_select_filters_match_whole_options(db_session, tagged_patients):
+    assert await _patient_ids(
+        db_session, [_filter("tags", QueryOperator.ANY_IN, string_values=["a"])]
+    ) == ["patient-1"]
+    assert await _patient_ids(
+        db_session, [_filter("tags", QueryOperator.ALL_IN, string_values=["a", "b"])]
+    ) == ["patient-1"]
+    assert await _patient_ids(
+        db_session, [_filter("tags", QueryOperator.NONE_IN, string_values=["b"])]
+    ) == ["patient-2"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("semi_joins", [True, False])
+async def test_property_filters_and_sorts(
+    monkeypatch, db_session, tagged_patients, semi_joins
+):
+    monkeypatch.setattr(property_sql, "QUERY_SEMI_JOINS", semi_joins)
+    sorts = [QuerySortClauseInput(field_key="property_score", direction=SortDirection.DESC)]
+
+    assert await _patient_ids(
+        db_session,
+        [
+            _filter("score", QueryOperator.GTE, float_value=1),
+            _filter("tags", QueryOperator.IS_NOT_NULL),
+        ],
+        sorts,
+    ) == ["patient-1", "patient-2"]
+    assert await _patient_ids(
+        db_session, [_filter("score", QueryOperator.IS_NULL)], sorts
+    ) == ["patient-3", "patient-4"]
+
+
+@pytest.mark.asyncio
+async def test_updating_multi_select_replaces_options(db_session, sample_patient):
+    service = PropertyService(db_session)
+    for tags in (["x", "y"], ["y", "z"]):
+        await service.process_properties(
+            sample_patient,
+            [PropertyValueInput(definition_id="tags", multi_select_values=tags)],
+            "patient",
+        )
+        await db_session.commit()
+
+    result = await db_session.execute(
+        select(models.property_value_options.c.option).order_by(
+            models.property_value_options.c.option
+        )
+    )
+
+    assert result.scalars().all() == ["y", "z"]
@@ -0,0 +1,65 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from api.query.metadata_service import load_queryable_field_set
+from api.query.registry import PATIENT, TASK, USER
+from api.services.property_definitions import (
+    PROPERTY_DEFINITIONS_CHANNEL,
+    property_definition_cache,
+)
+from database.models.property import PropertyDefinition
+
+
+class _CountingSessionFactory:
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        yield self
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_field_sets_are_reused_until_definitions_change(db_session, monkeypatch):
+    session = _CountingSessionFactory(db_session)
+    monkeypatch.setattr(property_definition_cache, "session_factory", session)
+    db_session.add(
+        PropertyDefinition(
+            id="def-1", name="Diet", field_type="FIELD_TYPE_TEXT", allowed_entities="TASK"
+        )
+    )
+    await db_session.commit()
+
+    first = await load_queryable_field_set(TASK)
+    again = await load_queryable_field_set(TASK)
+    assert again is first
+    assert first.fields[-1].property_definition_id == "def-1"
+    assert not any(
+        f.property_definition_id for f in (await load_queryable_field_set(PATIENT)).fields
+    )
+    await load_queryable_field_set(USER)
+    assert session.executed == 1
+
+    db_session.add(
+        PropertyDefinition(
+            id="def-2", name="Room", field_type="FIELD_TYPE_TEXT", allowed_entities="TASK"
+        )
+    )
+    await db_session.commit()
+    property_definition_cache.on_message(PROPERTY_DEFINITIONS_CHANNEL, "changed")
+
+    changed = await load_queryable_field_set(TASK)
+    assert changed.version != first.version
+    assert [f.property_definition_id for f in changed.fields[-2:]] == ["def-1", "def-2"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_entity_has_no_fields(db_session):
+    field_set = await load_queryable_field_set("Nope")
+
+    assert field_set.fields == []
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+import strawberry
+from api.context import Context, read_only_resolver
+from api.extensions import ReadSessionExtension
+from database.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+@read_only_resolver
+async def _load_user(info):
+    result = await info.context.db.execute(select(User).where(User.id == "user-1"))
+    return result.scalar_one()
+
+
+class _CountingFactory:
+    def __init__(self, db_session):
+        self._factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+        self.open = 0
+        self.max_open = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        self.open += 1
+        self.max_open = max(self.max_open, self.open)
+        try:
+            async with self._factory() as session:
+                yield session
+        finally:
+            self.open -= 1
+
+
+def _info(db_session, read_replica=False, factory=None):
+    context = Context(
+        db=db_session,
+        read_session_factory=factory
+        or async_sessionmaker(db_session.bind, expire_on_commit=False),
+        read_replica=read_replica,
+    )
+    return SimpleNamespace(context=context)
+
+
+@pytest.mark.asyncio
+async def test_read_only_resolver_does_not_wait_for_request_session(db_session, sample_user):
+    info = _info(db_session)
+
+    async with info.context._db_lock:
+        user = await asyncio.wait_for(_load_user(info), timeout=1)
+
+    assert user.id == sample_user.id
+    assert user is not sample_user
+
+
+@pytest.mark.asyncio
+async def test_pending_changes_keep_reads_on_request_session(db_session, sample_user):
+    info = _info(db_session)
+    sample_user.firstname = "Changed"
+
+    user = await _load_user(info)
+
+    assert user is sample_user
+    assert user.firstname == "Changed"
+
+
+@pytest.mark.asyncio
+async def test_without_factory_reads_use_request_session(db_session, sample_user):
+    info = SimpleNamespace(context=Context(db=db_session))
+
+    assert await _load_user(info) is sample_user
+
+
+@pytest.mark.asyncio
+async def test_query_operations_read_through_shared_session(db_session, sample_user):
+    async def loads_request_copy(info: strawberry.Info) -> bool:
+        result = await info.context.db.execute(select(User).where(User.id == "user-1"))
+        return result.scalar_one() is sample_user
+
+    @strawberry.type
+    class Query:
+        request_copy: bool = strawberry.field(resolver=loads_request_copy)
+
+    @strawberry.type
+    class Mutation:
+        request_copy: bool = strawberry.field(resolver=loads_request_copy)
+
+    schema = strawberry.Schema(
+        query=Query, mutation=Mutation, extensions=[ReadSessionExtension]
+    )
+    context = _info(db_session, read_replica=True).context
+
+    query = await schema.execute("{ requestCopy }", context_value=context)
+    mutation = await schema.execute("mutation { requestCopy }", context_value=context)
+
+    assert query.data == {"requestCopy": False}
+    assert mutation.data == {"requestCopy": True}
+
+    primary_only = _info(db_session).context
+    query = await schema.execute("{ requestCopy }", context_value=primary_only)
+    assert query.data == {"requestCopy": True}
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_share_one_bound(db_session, sample_user, monkeypatch):
+    monkeypatch.setattr("api.context.READ_SESSION_POOL_SIZE", 2)
+    factory = _CountingFactory(db_session)
+    context = Context(db=db_session, read_session_factory=factory, read_replica=True)
+    info = SimpleNamespace(context=context)
+
+    async with context.read_session(shared=True):
+        users = await asyncio.gather(*[_load_user(info) for _ in range(5)])
+
+    assert {user.id for user in users} == {sample_user.id}
+    assert factory.max_open == 2
+
+
+@pytest.mark.asyncio
+async def test_read_session_releases_request_connection(db_session, sample_user):
+    info = _info(db_session)
+    await db_session.execute(select(User))
+    assert db_session.in_transaction()
+
+    async with info.context.read_session():
+        assert not db_session.in_transaction()
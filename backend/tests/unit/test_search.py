@@ -0,0 +1,49 @@
+import pytest
+from api.query.adapters.task import apply_task_search, apply_task_sorts
+from api.query.inputs import QuerySearchInput
+from database import models
+from database.models.property import PropertyDefinition, PropertyValue
+from database.models.task import Task
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql
+
+
+async def _search(db_session, text, include_properties=False):
+    ctx = {}
+    query = apply_task_search(
+        select(Task),
+        QuerySearchInput(search_text=text, include_properties=include_properties),
+        ctx,
+    )
+    query = apply_task_sorts(query, None, ctx, {})
+    result = await db_session.execute(query)
+    return [task.id for task in result.scalars().all()]
+
+
+@pytest.mark.asyncio
+async def test_task_search_matches_documents(db_session, sample_task, sample_user):
+    db_session.add(Task(id="task-2", title="Lab work"))
+    db_session.add(PropertyDefinition(id="def-1", name="Note", field_type="FIELD_TYPE_TEXT"))
+    await db_session.commit()
+    db_session.add(PropertyValue(definition_id="def-1", task_id="task-2", text_value="fasting"))
+    await db_session.execute(
+        insert(models.task_assignees),
+        [{"task_id": sample_task.id, "user_id": sample_user.id}],
+    )
+    await db_session.commit()
+
+    assert await _search(db_session, "test desc") == [sample_task.id]
+    assert await _search(db_session, "john doe") == [sample_task.id]
+    assert await _search(db_session, "testuser") == [sample_task.id]
+    assert await _search(db_session, "fasting") == []
+    assert await _search(db_session, "fasting", include_properties=True) == ["task-2"]
+
+
+def test_search_is_ranked_by_trigram_similarity():
+    ctx = {}
+    query = apply_task_search(select(Task), QuerySearchInput(search_text="doe"), ctx)
+    query = apply_task_sorts(query, None, ctx, {})
+
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "ORDER BY similarity(tasks.search_text" in sql
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from api.services.subscription_hub import ChannelSubscriber, SubscriptionHub
+
+
+class _FakePubSub:
+    def __init__(self, close_gate: asyncio.Event | None = None):
+        self.channels: set[str] = set()
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.closing = asyncio.Event()
+        self._close_gate = close_gate
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self.channels)
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        try:
+            return await asyncio.wait_for(self.messages.get(), 0.05)
+        except TimeoutError:
+            return None
+
+    async def close(self):
+        self.closing.set()
+        if self._close_gate is not None:
+            await self._close_gate.wait()
+
+
+class _FakeRedis:
+    def __init__(self, close_gate: asyncio.Event | None = None):
+        self.pubsubs: list[_FakePubSub] = []
+        self._close_gate = close_gate
+
+    def pubsub(self):
+        pubsub = _FakePubSub(self._close_gate)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+
+def _publish(pubsub: _FakePubSub, channel: str, data: str) -> None:
+    pubsub.messages.put_nowait({"type": "message", "channel": channel, "data": data})
+
+
+@pytest.mark.asyncio
+async def test_hub_shares_one_connection_and_fans_out():
+    client = _FakeRedis()
+    hub = SubscriptionHub(client, queue_maxsize=8)
+
+    async with hub.subscribe("task_updated") as first, hub.subscribe(
+        "task_updated"
+    ) as second, hub.subscribe("task_created") as third:
+        await asyncio.sleep(0)
+        assert len(client.pubsubs) == 1
+        pubsub = client.pubsubs[0]
+        assert pubsub.channels == {"task_updated", "task_created"}
+
+        _publish(pubsub, "task_updated", "task-1")
+        _publish(pubsub, "task_created", "task-2")
+
+        assert await asyncio.wait_for(first.get(), 1) == "task-1"
+        assert await asyncio.wait_for(second.get(), 1) == "task-1"
+        assert await asyncio.wait_for(third.get(), 1) == "task-2"
+
+    assert hub.channels == []
+    assert pubsub.channels == set()
+
+
+@pytest.mark.asyncio
+async def test_subscriber_coalesces_and_drops_oldest():
+    subscriber = ChannelSubscriber("task_updated", maxsize=2)
+
+    subscriber.offer("a")
+    subscriber.offer("a")
+    subscriber.offer("b")
+    subscriber.offer("c")
+
+    assert subscriber.dropped == 1
+    assert await subscriber.get() == "b"
+    assert await subscriber.get() == "c"
+
+
+@pytest.mark.asyncio
+async def test_subscriber_arriving_during_teardown_gets_a_reader():
+    close_gate = asyncio.Event()
+    client = _FakeRedis(close_gate)
+    hub = SubscriptionHub(client, queue_maxsize=8)
+
+    async with hub.subscribe("task_updated"):
+        await asyncio.sleep(0.01)
+    first = client.pubsubs[0]
+    await asyncio.wait_for(first.closing.wait(), 1)
+
+    async def subscribe_and_receive():
+        async with hub.subscribe("task_updated") as subscriber:
+            return await asyncio.wait_for(subscriber.get(), 1)
+
+    receiving = asyncio.create_task(subscribe_and_receive())
+    await asyncio.sleep(0.01)
+    close_gate.set()
+    for _ in range(100):
+        if len(client.pubsubs) == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert len(client.pubsubs) == 2
+
+    _publish(client.pubsubs[-1], "task_updated", "task-1")
+    assert await asyncio.wait_for(receiving, 1) == "task-1"
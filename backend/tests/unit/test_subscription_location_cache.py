@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from api.services.subscription import SubscriptionLocationCache
+from database.models.location import LocationNode
+
+
+class _CountingSession:
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query(db_session, sample_patient):
+    session = _CountingSession(db_session)
+    cache = SubscriptionLocationCache()
+
+    results = await asyncio.gather(
+        *(cache.patient_locations(session, sample_patient.id) for _ in range(5))
+    )
+
+    assert all(result == {sample_patient.clinic_id} for result in results)
+    assert session.executed == 1
+
+    cache.on_message("patient_updated", sample_patient.id)
+    await cache.patient_locations(session, sample_patient.id)
+    assert session.executed == 2
+
+
+@pytest.mark.asyncio
+async def test_task_locations_follow_patient_and_evict_with_it(
+    db_session, sample_task, sample_patient
+):
+    session = _CountingSession(db_session)
+    cache = SubscriptionLocationCache()
+
+    assert await cache.task_locations(session, sample_task.id) == {
+        sample_patient.clinic_id
+    }
+    executed = session.executed
+    await cache.task_locations(session, sample_task.id)
+    assert session.executed == executed
+
+    cache.on_message("patient_updated", sample_patient.id)
+    await cache.task_locations(session, sample_task.id)
+    assert session.executed > executed
+
+
+@pytest.mark.asyncio
+async def test_root_descendants_invalidate_on_location_events(
+    db_session, sample_location
+):
+    cache = SubscriptionLocationCache()
+    assert await cache.root_descendants(db_session, [sample_location.id]) == {
+        sample_location.id
+    }
+
+    db_session.add(
+        LocationNode(id="ward-x", title="Ward", kind="WARD", parent_id=sample_location.id)
+    )
+    await db_session.commit()
+    assert await cache.root_descendants(db_session, [sample_location.id]) == {
+        sample_location.id
+    }
+
+    cache.on_message("location_node_created", "ward-x")
+    assert await cache.root_descendants(db_session, [sample_location.id]) == {
+        sample_location.id,
+        "ward-x",
+    }
@@ -2,11 +2,16 @@ from dataclasses import dataclass
 
 import pytest
 from graphql import GraphQLError
+from sqlalchemy import select
 
+from api.services import notifications
 from api.services.task_graph import (
+    apply_task_graph_to_patient,
     graph_dict_from_preset_inputs,
+    insert_task_dependencies,
     validate_task_graph_dict,
 )
+from database import models
 
 
 def test_validate_empty_nodes_raises() -> None:
@@ -144,3 +149,88 @@ def test_graph_dict_from_preset_inputs_result_passes_validation() -> None:
     nodes = [_PresetNode("a", "A"), _PresetNode("b", "B")]
     edges = [_PresetEdge("a", "b")]
     validate_task_graph_dict(graph_dict_from_preset_inputs(nodes, edges))
+
+
+class _CountingSession:
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+@pytest.mark.asyncio
+async def test_apply_task_graph_uses_set_based_statements(
+    db_session, sample_patient, sample_user, monkeypatch
+) -> None:
+    published: list[list[tuple[str, str]]] = []
+
+    async def capture(messages):
+        published.append(messages)
+
+    monkeypatch.setattr(notifications, "publish_many_to_redis", capture)
+    nodes = [{"id": f"n{i}", "title": f"Step {i}"} for i in range(40)]
+    edges = [{"from": f"n{i}", "to": f"n{i + 1}"} for i in range(39)]
+    session = _CountingSession(db_session)
+
+    tasks = await apply_task_graph_to_patient(
+        session, sample_patient.id, {"nodes": nodes, "edges": edges}, sample_user.id
+    )
+
+    assert [t.title for t in tasks] == [f"Step {i}" for i in range(40)]
+    assert session.executed <= 8
+    assignees = await db_session.execute(select(models.task_assignees))
+    assert len(assignees.all()) == 40
+    deps = await db_session.execute(select(models.task_dependencies))
+    assert len(deps.all()) == 39
+    await db_session.refresh(sample_patient)
+    assert sample_patient.last_activity_at == tasks[0].update_date
+    assert len(published) == 1
+    assert [channel for channel, _ in published[0]] == ["task_created"] * 40 + [
+        "patient_updated"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_apply_task_graph_keeps_patient_updated_at(
+    db_session, sample_patient, sample_user, monkeypatch
+) -> None:
+    async def discard(messages):
+        pass
+
+    monkeypatch.setattr(notifications, "publish_many_to_redis", discard)
+    updated_at = sample_patient.updated_at
+
+    graph = {"nodes": [{"id": "n0", "title": "Step"}], "edges": []}
+    await apply_task_graph_to_patient(db_session, sample_patient.id, graph, None)
+
+    await db_session.refresh(sample_patient)
+    assert sample_patient.last_activity_at is not None
+    assert sample_patient.updated_at == updated_at
+
+
+@pytest.mark.asyncio
+async def test_insert_task_dependencies_validates_in_one_query(
+    db_session, sample_patient, sample_task
+) -> None:
+    other = models.Task(id="task-other", title="Other", patient_id=None)
+    db_session.add(other)
+    await db_session.commit()
+
+    with pytest.raises(GraphQLError, match="same patient"):
+        await insert_task_dependencies(
+            db_session, "task-next", [sample_task.id, other.id], sample_patient.id
+        )
+    with pytest.raises(GraphQLError, match="not found"):
+        await insert_task_dependencies(
+            db_session, "task-next", [sample_task.id, "missing"], sample_patient.id
+        )
+    with pytest.raises(GraphQLError, match="itself"):
+        await insert_task_dependencies(
+            db_session, "task-next", ["task-next"], sample_patient.id
+        )
@@ -0,0 +1,75 @@
+import pytest
+from api.inputs import CountMode, PaginationInput
+from api.query import execute as execute_module
+from api.resolvers.user import UserQuery
+from database.models.user import User
+
+
+class _CountingSession:
+    def __init__(self, session):
+        self._session = session
+        self.executed = 0
+
+    async def execute(self, *args, **kwargs):
+        self.executed += 1
+        return await self._session.execute(*args, **kwargs)
+
+
+class _FakeContext:
+    def __init__(self, db):
+        self.db = db
+
+
+class _FakeInfo:
+    def __init__(self, db):
+        self.context = _FakeContext(db)
+
+
+async def _fetch(session, count_mode, **pagination):
+    return await UserQuery.users.fetch_page(
+        UserQuery(),
+        _FakeInfo(session),
+        pagination=PaginationInput(page_size=2, **pagination),
+        count_mode=count_mode,
+    )
+
+
+@pytest.fixture
+async def users(db_session):
+    for i in range(5):
+        db_session.add(User(id=f"user-{i}", username=f"user{i}"))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_page_and_total_share_one_query(db_session, users):
+    session = _CountingSession(db_session)
+
+    first = await _fetch(session, CountMode.EXACT)
+    after = await _fetch(
+        session, CountMode.EXACT, after=first.items[-1].page_cursor
+    )
+
+    assert [u.id for u in first.items] == ["user-0", "user-1"]
+    assert [u.id for u in after.items] == ["user-2", "user-3"]
+    assert first.total_count == after.total_count == 5
+    assert session.executed == 2
+
+
+@pytest.mark.asyncio
+async def test_total_is_loaded_for_pages_past_the_end(db_session, users):
+    page = await _fetch(db_session, CountMode.EXACT, page_index=10)
+
+    assert page.items == []
+    assert page.total_count == 5
+
+
+@pytest.mark.asyncio
+async def test_capped_count(monkeypatch, db_session, users):
+    monkeypatch.setattr(execute_module, "LIST_COUNT_CAP", 3)
+
+    page = await _fetch(db_session, CountMode.CAPPED)
+
+    assert len(page.items) == 2
+    assert page.total_count == 3
+    assert page.total_is_exact is False